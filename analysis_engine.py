@@ -1,90 +1,190 @@
+import numpy as np
 import pandas as pd
 # Import plotting libraries
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import plotly.io as pio
-import os
+
+from ensemble_plots import PLOT_DEFAULTS, ensemble_band_figure, scatter_trace
+from maturity_index import MaturityIndex
+from report_builder import ReportBuilder
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Indicators plotted as quantile bands by create_ensemble_visualizations by default
+ENSEMBLE_KEY_INDICATORS = ['infra_infra_metric', 'economy_econ_metric', 'innovation_startup_count', 'integration_it_exports']
 
 class DigitalAnalysisEngine:
     """Analyze and visualize digital transformation simulation results for Bangladesh."""
-    def __init__(self, results_history, scenario_name="Scenario"):
+    def __init__(self, results_history, scenario_name="Scenario", maturity_index=None, plot_options=None):
         """Initialize the analysis engine with simulation results.
 
         Args:
-            results_history (list): A list of dictionaries, where each dict holds the state/metrics for one year.
+            results_history (list or pd.DataFrame): A list of dictionaries, where each dict holds the state/metrics
+                                                    for one year, or a DataFrame indexed by year (used without copying).
             scenario_name (str): The name of the scenario for labeling outputs.
+            maturity_index (MaturityIndex, optional): Metrics, weights and normalisation of the
+                                                      composite index. Defaults to equal-weight
+                                                      min-max over KEY_MATURITY_METRICS.
+            plot_options (dict, optional): Overrides of ensemble_plots.PLOT_DEFAULTS (quantiles,
+                                           decimation, WebGL threshold, ...).
         """
-        print("Initializing DigitalAnalysisEngine...")
+        logger.debug("Initializing DigitalAnalysisEngine...")
         self.scenario_name = scenario_name
-        self.results = pd.DataFrame(results_history)
+        if isinstance(results_history, pd.DataFrame):
+            self.results = results_history
+        else:
+            self.results = pd.DataFrame(results_history)
         self.figures = {} # To store generated figures
+        self.maturity_index = maturity_index if maturity_index is not None else MaturityIndex()
+        self.plot_options = {**PLOT_DEFAULTS, **(plot_options or {})}
+        self._buffer_view = None # self.results as last built by append_results over its buffer
         # Set year as index if present
-        if 'year' in self.results.columns:
+        if self.results.index.name == 'year':
+            pass
+        elif 'year' in self.results.columns:
             self.results.set_index('year', inplace=True)
         else:
             # Add a year index if missing, assuming consecutive years from 0
             self.results.index = pd.Index(range(len(self.results)), name='year_simulated')
             
-        print(f"DigitalAnalysisEngine Initialized for '{self.scenario_name}' with {len(self.results)} years of data.")
+        logger.info("DigitalAnalysisEngine Initialized for '%s' with %s years of data.", self.scenario_name, len(self.results))
 
     def generate_digital_maturity_metrics(self):
-        """Calculate composite digital transformation indicators for Bangladesh based on results."""
-        print("Generating Digital Maturity Metrics...")
-        # Placeholder: Define and calculate composite indices based on available metrics
-        # Example: A simple index averaging key metrics (requires normalization in practice)
-        key_metrics = [
-            'policy_policy_effectiveness', 'infra_infra_metric', 'skills_skills_metric',
-            'inclusion_overall_literacy', 'cyber_protection_level', 'society_adoption_rate',
-            'innovation_startup_count', 'emerging_ai_adoption', 'economy_econ_metric',
-            'sectoral_fin_digital_index', 'gov_gov_metric', 'integration_it_exports'
-        ]
-        # Normalize (example using min-max scaling between 0 and 1 for demonstration)
-        # In a real scenario, normalization should be carefully chosen and applied.
-        composite_index_cols = []
-        for col in key_metrics:
-            if col in self.results.columns:
-                min_val = self.results[col].min()
-                max_val = self.results[col].max()
-                # Avoid division by zero if the metric is constant
-                if max_val > min_val:
-                     self.results[f'{col}_norm'] = (self.results[col] - min_val) / (max_val - min_val)
-                     composite_index_cols.append(f'{col}_norm')
-                else:
-                    # Handle constant columns - assign a default normalized value (e.g., 0.5)
-                    self.results[f'{col}_norm'] = 0.5
-                    composite_index_cols.append(f'{col}_norm')
-            else:
-                 print(f"Warning: Metric {col} not found in results for composite index calculation.")
-
-        if composite_index_cols: # Ensure there are columns to average
-             self.results['composite_digital_maturity'] = self.results[composite_index_cols].mean(axis=1)
-             print("Calculated 'composite_digital_maturity' index (simple average of normalized key metrics).")
-        else:
-            print("Warning: Could not calculate composite index due to missing key metrics.")
-            self.results['composite_digital_maturity'] = 0.0 # Assign default if calculation fails
+        """Calculate composite digital transformation indicators for Bangladesh based on results.
+
+        Normalises the key metrics of self.maturity_index as one block, writes them as
+        '<metric>_norm' columns and their weighted mean as 'composite_digital_maturity'.
+        """
+        logger.info("Generating Digital Maturity Metrics...")
+        self.maturity_index.fit(self.results)
+        self._write_maturity_columns()
+        return self.results
+
+    def append_results(self, new_results):
+        """Append newly simulated years and update the maturity metrics incrementally.
+
+        Results are kept in a preallocated column-major buffer that grows geometrically, and
+        self.results is a DataFrame view of its filled rows, so appending a year costs time
+        proportional to the new rows rather than the history. Only the new rows are scanned;
+        '<metric>_norm' and composite values are rewritten only for the rows the maturity
+        index changed, which is every year when a min-max or z-score statistic moves. Live
+        dashboards appending a year at a time should therefore use a MaturityIndex with
+        'reference_year' normalisation, whose statistics stay fixed.
+
+        Args:
+            new_results (list or pd.DataFrame): New years, in the results_history format or
+                                                as a DataFrame indexed by year.
+
+        Returns:
+            pd.DataFrame: The updated results.
+        """
+        new_results = pd.DataFrame(new_results)
+        if new_results.index.name != 'year' and 'year' in new_results.columns:
+            new_results = new_results.set_index('year')
+        index = self.maturity_index
+        derived = [f"{m}_norm" for m in index.metrics] + ['composite_digital_maturity']
+        new_results = new_results.drop(columns=derived, errors='ignore')
+        refit = index.n_rows != len(self.results)
+        if refit: # The index does not cover the current results (e.g. no generate_digital_maturity_metrics yet)
+            index.fit(self.results.drop(columns=derived, errors='ignore'))
+        index.append(new_results)
+
+        if not self._sync_buffer(new_results, derived):
+            # Non-numeric results cannot live in the float buffer: fall back to concatenating
+            self.results = pd.concat([self.results.drop(columns=derived, errors='ignore'), new_results])
+            self._write_maturity_columns()
+            return self.results
+
+        start, stop = self._n_rows, self._n_rows + len(new_results)
+        self._reserve_rows(stop)
+        self._years[start:stop] = new_results.index.to_numpy()
+        self._block[start:stop] = new_results.reindex(columns=self._columns).to_numpy(dtype=float)
+        self._n_rows = stop
 
-        print("Placeholder: More sophisticated composite metric calculation needed.")
+        changed = 0 if refit else index.changed_from
+        normalised = index.normalised(changed)
+        self._block[changed:stop, [self._column_index[c] for c in normalised.columns]] = normalised.to_numpy()
+        composite = self._column_index['composite_digital_maturity']
+        self._block[changed:stop, composite] = index.composite(changed).to_numpy() if index.present.any() else 0.0
+        self.results = pd.DataFrame(self._block[:stop], index=pd.Index(self._years[:stop], name=self._index_name),
+                                    columns=self._columns, copy=False)
+        self._buffer_view = self.results
         return self.results
 
+    def _sync_buffer(self, new_results, derived):
+        """Make sure the results buffer mirrors self.results and has a column for every new
+        metric. Returns False if the results are not all numeric."""
+        columns_known = self._buffer_view is self.results \
+            and len(self.results.columns) == len(self._columns) \
+            and all(c in self._column_index for c in new_results.columns)
+        if columns_known:
+            return True
+        # First append, or self.results was replaced or given new columns since: rebuild once
+        base = self.results
+        missing = [c for c in list(new_results.columns) + derived if c not in base.columns]
+        try:
+            values = base.to_numpy(dtype=float)
+        except (TypeError, ValueError):
+            self._buffer_view = None
+            return False
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in new_results.dtypes):
+            self._buffer_view = None
+            return False
+        self._columns = list(base.columns) + missing
+        self._column_index = {c: i for i, c in enumerate(self._columns)}
+        self._index_name = base.index.name
+        self._n_rows = len(base)
+        capacity = max(2 * self._n_rows, self._n_rows + len(new_results), 16)
+        self._block = np.full((capacity, len(self._columns)), np.nan, order='F')
+        self._block[:self._n_rows, :len(base.columns)] = values
+        self._years = np.empty(capacity, dtype=base.index.dtype if base.index.dtype.kind in 'iu' else np.int64)
+        self._years[:self._n_rows] = base.index.to_numpy()
+        self._buffer_view = base
+        return True
+
+    def _reserve_rows(self, n_rows):
+        capacity = len(self._years)
+        if n_rows <= capacity:
+            return
+        capacity = max(n_rows, 2 * capacity)
+        block = np.full((capacity, len(self._columns)), np.nan, order='F')
+        block[:self._n_rows] = self._block[:self._n_rows]
+        years = np.empty(capacity, dtype=self._years.dtype)
+        years[:self._n_rows] = self._years[:self._n_rows]
+        self._block, self._years = block, years
+
+    def _write_maturity_columns(self):
+        index = self.maturity_index
+        normalised = index.normalised().set_axis(self.results.index)
+        self.results[list(normalised.columns)] = normalised
+        if index.present.any():
+            self.results['composite_digital_maturity'] = index.composite().to_numpy()
+            logger.info("Calculated 'composite_digital_maturity' index (%s-normalised weighted mean of key metrics).",
+                        index.normalisation)
+        else:
+            logger.warning("Could not calculate composite index due to missing key metrics.")
+            self.results['composite_digital_maturity'] = 0.0 # Assign default if calculation fails
+
     def analyze_digital_evolution(self):
         """Assess digital transformation under different scenarios and generate insights."""
-        print(f"Analyzing Digital Evolution for {self.scenario_name}...")
+        logger.info("Analyzing Digital Evolution for %s...", self.scenario_name)
         if not self.results.empty:
-            print("\n--- Final Year State (Year {}) --- Scenario: {} ---".format(self.results.index[-1], self.scenario_name))
+            logger.info("\n--- Final Year State (Year %s) --- Scenario: %s ---", self.results.index[-1], self.scenario_name)
             # Display relevant columns neatly
             final_state = self.results.iloc[-1]
-            print(final_state.to_string())
-            print("---------------------------------")
+            logger.info("%s", final_state.to_string())
+            logger.info("---------------------------------")
         else:
-            print("No results data to analyze.")
+            logger.warning("No results data to analyze.")
 
-        print("Placeholder: Detailed evolution analysis (trends, correlations) needed.")
+        logger.debug("Placeholder: Detailed evolution analysis (trends, correlations) needed.")
 
     def create_visualizations(self):
         """Generate plots based on the simulation results using Plotly."""
-        print(f"Creating Visualizations for {self.scenario_name}...")
+        logger.info("Creating Visualizations for %s...", self.scenario_name)
         if self.results.empty:
-            print("No results to visualize.")
+            logger.warning("No results to visualize.")
             return
         
         # Apply a template for consistent styling
@@ -93,9 +193,10 @@ class DigitalAnalysisEngine:
         # Example 1: Plotting the composite maturity index - Enhanced Styling
         if 'composite_digital_maturity' in self.results.columns:
             fig1 = go.Figure()
-            fig1.add_trace(go.Scatter(
-                x=self.results.index, 
-                y=self.results['composite_digital_maturity'],
+            fig1.add_trace(scatter_trace(
+                self.results.index, 
+                self.results['composite_digital_maturity'],
+                **self._trace_options(),
                 mode='lines+markers', 
                 name='Composite Maturity', 
                 line=dict(color='#1a5276', width=3), # Dark blue line
@@ -114,7 +215,7 @@ class DigitalAnalysisEngine:
                 margin=dict(t=50, b=50, l=50, r=20) # Further reduced margins
             )
             self.figures['composite_maturity'] = fig1
-            print("Generated composite maturity plot with enhanced styling.")
+            logger.debug("Generated composite maturity plot with enhanced styling.")
 
         # Example 2: Plotting selected key indicators (NORMALIZED)
         normalized_indicators_to_plot = [
@@ -136,8 +237,8 @@ class DigitalAnalysisEngine:
              plot_added = False
              for i, indicator in enumerate(normalized_indicators_to_plot):
                  if indicator in self.results.columns:
-                     fig2.add_trace(go.Scatter(x=self.results.index, y=self.results[indicator], 
-                                                mode='lines', name=subplot_titles[i]), 
+                     fig2.add_trace(scatter_trace(self.results.index, self.results[indicator],
+                                                  mode='lines', name=subplot_titles[i], **self._trace_options()),
                                     row=current_row, col=current_col)
                      plot_added = True
                      # Update column/row counters
@@ -146,7 +247,7 @@ class DigitalAnalysisEngine:
                          current_col = 1
                          current_row += 1
                  else:
-                      print(f"Warning: Indicator {indicator} not found for plotting.")
+                      logger.warning("Indicator %s not found for plotting.", indicator)
 
              if plot_added:
                 fig2.update_layout(
@@ -158,172 +259,53 @@ class DigitalAnalysisEngine:
                 )
                 fig2.update_yaxes(title_text="Normalized Value (0-1)", row=1, col=1) # Add Y-axis label example
                 self.figures['key_normalized_indicators'] = fig2
-                print("Generated key normalized indicators subplot.")
+                logger.debug("Generated key normalized indicators subplot.")
              else:
-                 print("No key normalized indicators found to plot.")
+                 logger.warning("No key normalized indicators found to plot.")
 
         # --- Add more visualizations based on the detailed dashboard list in the prompt ---
         # Requires selecting appropriate columns and chart types (lines, bars, heatmaps etc.)
 
-        print("Placeholder: More detailed visualization generation needed.")
+        logger.debug("Placeholder: More detailed visualization generation needed.")
 
-    def generate_html_report(self, filename=None):
-        """Generate an HTML report containing analysis summary and visualizations."""
-        if filename is None:
-            filename = f"simulation_report_{self.scenario_name}.html"
-        
-        print(f"Generating HTML report: {filename}...")
-
-        # Ensure output directory exists
-        output_dir = "reports"
-        os.makedirs(output_dir, exist_ok=True)
-        filepath = os.path.join(output_dir, filename)
-
-        # Clearer & Nicer CSS - Updated Styling
-        css = """
-<style>
-  @import url('https://fonts.googleapis.com/css2?family=Lato:wght@300;400;700&display=swap');
-
-  body {
-    font-family: 'Lato', sans-serif;
-    line-height: 1.75;
-    margin: 0;
-    padding: 0;
-    background-color: #f8f9fa; /* Lighter background */
-    color: #495057; /* Softer black */
-    font-weight: 300;
-  }
-  .container {
-    max-width: 1200px;
-    margin: 40px auto;
-    background: #ffffff;
-    padding: 30px 50px;
-    box-shadow: 0 6px 18px rgba(0,0,0,0.07);
-    border-radius: 8px;
-  }
-  h1, h2, h3 {
-    color: #1a5276; /* Darker shade of blue */
-    border-bottom: 2px solid #aed6f1; /* Lighter blue */
-    padding-bottom: 10px;
-    margin-top: 45px;
-    margin-bottom: 25px;
-    font-weight: 400;
-  }
-  h1 { font-size: 2.4em; font-weight: 700; border-bottom-width: 3px; }
-  h2 { font-size: 1.8em; }
-  h3 { font-size: 1.4em; border-bottom: none; color: #2e86c1; margin-top: 30px; margin-bottom: 15px;}
-  
-  /* Definition List for Summary */
-  dl.summary-list {
-      background-color: #fff;
-      padding: 20px;
-      border-radius: 5px;
-      border: 1px solid #e9ecef;
-      margin-bottom: 30px;
-      display: grid;
-      grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); /* Responsive grid */
-      gap: 15px 30px; /* Row and column gap */
-  }
-  dl.summary-list > div { /* Wrap dt/dd pairs for grid layout */
-      border-bottom: 1px dashed #e9ecef;
-      padding-bottom: 10px;
-  }
-  dl.summary-list dt {
-      font-weight: 700; /* Bolder terms */
-      color: #1a5276;
-      margin-bottom: 5px;
-      font-size: 0.95em;
-  }
-  dl.summary-list dd {
-      margin-left: 0; /* Reset default margin */
-      font-size: 1.1em;
-      color: #566573;
-  }
-
-  /* Plotly Div Styling */
-  .plotly-graph-div {
-    /* Removed specific styles, rely on wrapper */
-    max-width: 100%; /* Ensure plot div respects container */
-    height: auto; /* Allow height to adjust */
-    box-sizing: border-box; /* Include padding/border in width/height */
-  }
-  /* New Wrapper for Plots */
-  .plot-container {
-      margin: 25px auto 50px auto; /* Center and provide vertical spacing */
-      padding: 10px;
-      background-color: #fdfdfe;
-      border: 1px solid #e9ecef;
-      border-radius: 6px;
-      box-shadow: 0 3px 6px rgba(0,0,0,0.05);
-      max-width: 98%; /* Slightly less than 100% to avoid edge issues */
-      overflow: hidden; /* Prevent plot spilling out */
-  }
-
-  p {
-      margin-bottom: 20px;
-      color: #566573;
-      font-size: 1.05em;
-  }
-  a { color: #2e86c1; text-decoration: none; font-weight: 400;}
-  a:hover { text-decoration: underline; }
-</style>
-"""
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("<!DOCTYPE html><html><head>")
-            f.write(f'<meta charset="UTF-8"><title>Simulation Report: {self.scenario_name}</title>')
-            f.write(css)
-            f.write("</head><body>")
-            f.write('<div class="container">')
-            f.write(f"<h1>Digital Transformation Simulation Report</h1>")
-            f.write(f"<h2>Scenario: {self.scenario_name}</h2>")
-            f.write(f"<p>Simulation Period: <strong>{self.results.index.min()} - {self.results.index.max()}</strong></p>")
-            
-            # Add Analysis Summary using Definition List
-            f.write("<h2>Final Year State Summary ({})</h2>".format(self.results.index[-1]))
-            if not self.results.empty:
-                final_state = self.results.iloc[-1]
-                cols_to_show = [col for col in final_state.index if not col.endswith('_norm')]
-                
-                f.write("<dl class=\"summary-list\">")
-                for col in cols_to_show[:30]: # Limit items shown
-                    metric_name = col.replace('_', ' ').title()
-                    value = final_state[col]
-                    # Basic formatting for numbers
-                    try:
-                        value_str = f"{float(value):,.3f}" if isinstance(value, (int, float)) else str(value)
-                    except (ValueError, TypeError):
-                        value_str = str(value)
-                        
-                    f.write("<div>") # Wrapper div for grid layout
-                    f.write(f"<dt>{metric_name}</dt>")
-                    f.write(f"<dd>{value_str}</dd>")
-                    f.write("</div>")
-                f.write("</dl>")
-            else:
-                f.write("<p>No results data available.</p>")
-
-            # Embed Figures
-            f.write("<h2>Visualizations</h2>")
-            if not self.figures:
-                 f.write("<p>No figures were generated.</p>")
-            else:
-                 for name, fig in self.figures.items():
-                     f.write(f"<h3>{name.replace('_', ' ').title()}</h3>")
-                     
-                     # Add responsive config to Plotly HTML generation
-                     html_fig = pio.to_html(
-                         fig, 
-                         full_html=False, 
-                         include_plotlyjs='cdn',
-                         config={'responsive': True} # Make Plotly chart responsive
-                     )
-                     # Wrap the plot html in our styled container
-                     f.write(f'<div class="plot-container">{html_fig}</div>') 
-
-            f.write("</div>") # Close container div
-            f.write("</body></html>")
-        print(f"HTML report saved to {filepath}")
+    def _trace_options(self):
+        return {k: self.plot_options[k] for k in ('webgl_threshold', 'max_points', 'decimation')}
+
+    def create_ensemble_visualizations(self, ensemble, metrics=None):
+        """Add quantile-band figures for ensemble results to self.figures.
+
+        Replicas are aggregated into bands (plus a few sampled paths), so report size and
+        rendering cost do not grow with the number of replicas.
+
+        Args:
+            ensemble (ScenarioCube or EnsembleSimulation): Ensemble results to plot.
+            metrics (list, optional): Metrics to plot. Defaults to the key indicators shown
+                                      by create_visualizations that the ensemble contains.
+        """
+        available = ensemble.metrics if hasattr(ensemble, 'metrics') else list(ensemble.ensemble_results)
+        if metrics is None:
+            metrics = [m for m in ENSEMBLE_KEY_INDICATORS if m in available]
+        for metric in metrics:
+            self.figures[f'ensemble_{metric}'] = ensemble_band_figure(
+                ensemble, metric, title=f'{metric} Ensemble ({self.scenario_name})', **self.plot_options)
+        logger.debug("Generated %s ensemble band plots.", len(metrics))
+
+    def generate_html_report(self, filename=None, builder=None):
+        """Generate an HTML report containing analysis summary and visualizations.
+
+        Args:
+            filename (str, optional): Report file name inside the builder's output directory.
+                                      Defaults to "simulation_report_<scenario_name>.html".
+            builder (ReportBuilder, optional): Report builder to use. Defaults to one writing to
+                                               "reports/" with a shared local plotly.js bundle,
+                                               so reports open offline.
+
+        Returns:
+            str: Path of the written report.
+        """
+        builder = builder if builder is not None else ReportBuilder()
+        logger.info("Generating HTML report: %s...", filename or f"simulation_report_{self.scenario_name}.html")
+        return builder.write_report(self, filename)
 
     def run_full_analysis(self):
         """Runs the full sequence of analysis and visualization generation."""
@@ -331,4 +313,4 @@ class DigitalAnalysisEngine:
         self.analyze_digital_evolution()
         self.create_visualizations()
         self.generate_html_report() # Generate the report at the end
-        print("Full analysis run complete.") 
+        logger.info("Full analysis run complete.") 
@@ -0,0 +1,384 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from data_handler import DigitalDataHandler
+from ensemble import EnsembleSimulation
+from initial_conditions import indicator_observations
+from scenario_runner import merge_config
+from sensitivity import parameter_overrides
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Simulated metric -> (source, indicator) of the historical series it is fitted to
+CALIBRATION_TARGETS = {
+    'society_adoption_rate': ('btrc_stats', 'internet_penetration'),
+    'inclusion_overall_literacy': ('bbs_ict_survey', 'digital_literacy_rate'),
+    'inclusion_rural_access': ('btrc_stats', 'rural_broadband_penetration'),
+    'sectoral_fin_digital_index': ('bangladesh_bank_mfs', 'digital_banking_users_pct'),
+}
+
+# Calibrated parameters and their bounds. "<key>.<name>" paths are model coefficients
+# (MODEL_PARAMETERS); "model_attribute.state_dict.key" paths are initial state values.
+CALIBRATION_PARAMETERS = {
+    'digital_society.adoption_patterns.internet_penetration_rate': (0.05, 0.9),
+    'society.adoption_rate': (0.0, 0.3),
+    'digital_inclusion.capability_development.basic_digital_literacy_rate': (0.05, 0.9),
+    'inclusion.literacy_gain': (0.0, 0.2),
+    'digital_inclusion.access_equity.rural_broadband_penetration': (0.0, 0.6),
+    'inclusion.rural_broadband_gain': (0.0, 0.2),
+    'sectoral_transformation.finance.digital_banking_users_pct': (0.01, 0.8),
+    'sectoral.fin_growth': (0.9, 1.3),
+    'sectoral.fin_sensitivity': (0.0, 0.3),
+}
+
+class CalibrationObjective:
+    """Vectorised calibration loss: a batch of candidate parameter sets is one ensemble run.
+
+    The loss of a candidate is the weighted sum over targets of the mean squared residual
+    between simulated and observed values, each target scaled by the mean absolute size of
+    its observations so series of different units contribute comparably.
+    """
+    def __init__(self, config, scenario_name, parameters, bounds, observed, weights, start_year, end_year):
+        """Build the objective.
+
+        Args:
+            config (dict): Base simulation configuration.
+            scenario_name (str): Policy scenario to run.
+            parameters (list): Parameter paths.
+            bounds (np.ndarray): (n_parameters, 2) lower and upper bounds.
+            observed (dict): Metric -> (years, values) observations within [start_year, end_year].
+            weights (dict): Metric -> weight.
+            start_year (int): First simulated year.
+            end_year (int): Last simulated year.
+        """
+        self.config = merge_config(config, {'start_year': start_year, 'end_year': end_year})
+        self.scenario_name = scenario_name
+        self.parameters = list(parameters)
+        self.bounds = bounds
+        self.targets = []
+        for metric, (years, values) in observed.items():
+            scale = np.mean(np.abs(values)) or 1.0
+            self.targets.append((metric, years - start_year, values[:, np.newaxis], scale, weights.get(metric, 1.0)))
+
+    def scale(self, unit_candidates):
+        """Map candidates from the unit hypercube to parameter values."""
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return low + np.asarray(unit_candidates) * (high - low)
+
+    def __call__(self, unit_candidates):
+        """Return the loss of each candidate, shape (n,). Candidates are unit-hypercube rows."""
+        values = self.scale(unit_candidates)
+        config = merge_config(self.config, parameter_overrides(self.parameters, values.T))
+        sim = EnsembleSimulation(config, scenario_name=self.scenario_name, replicas=len(values))
+        results = sim.run_simulation()
+        loss = np.zeros(len(values))
+        for metric, rows, observed, scale, weight in self.targets:
+            residuals = (results[metric][rows] - observed) / scale
+            loss += weight * np.mean(residuals ** 2, axis=0)
+        loss[~np.isfinite(loss)] = np.inf
+        return loss
+
+def cma_es(objective, mean, sigma, popsize=None, max_evaluations=2000, seed=None, tol_x=1e-8, tol_fun=1e-12):
+    """Minimise a vectorised objective over the unit hypercube with CMA-ES.
+
+    Each generation's population is passed to the objective as one (popsize, n) array.
+    Candidates outside [0, 1] are evaluated at the nearest point inside, plus a quadratic
+    penalty on the distance, so the search distribution is pulled back into the bounds.
+
+    Args:
+        objective (callable): Maps an (m, n) array to m losses.
+        mean (np.ndarray): Initial mean in the unit hypercube.
+        sigma (float): Initial step size (in unit-hypercube coordinates).
+        popsize (int, optional): Candidates per generation. Defaults to 4 + 3 ln(n).
+        max_evaluations (int): Evaluation budget.
+        seed (int, optional): Random seed.
+        tol_x (float): Stop once every coordinate's step size falls below this.
+        tol_fun (float): Stop once the best loss has varied less than this over recent generations.
+
+    Returns:
+        tuple: (best unit-hypercube point, best loss, evaluations used).
+    """
+    rng = np.random.default_rng(seed)
+    mean = np.array(mean, dtype=float)
+    n = len(mean)
+    lam = popsize or 4 + int(3 * np.log(n))
+    mu = lam // 2
+    weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    weights /= weights.sum()
+    mueff = 1 / np.sum(weights ** 2)
+
+    cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+    cs = (mueff + 2) / (n + mueff + 5)
+    c1 = 2 / ((n + 1.3) ** 2 + mueff)
+    cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+    damps = 1 + 2 * max(0.0, np.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+    chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+    pc, ps = np.zeros(n), np.zeros(n)
+    basis, scales = np.eye(n), np.ones(n)
+    cov = np.eye(n)
+    best_x, best_f = np.clip(mean, 0, 1), np.inf
+    history = []
+    evaluations, generation = 0, 0
+    while evaluations + lam <= max_evaluations:
+        generation += 1
+        steps = rng.standard_normal((lam, n)) * scales @ basis.T
+        candidates = mean + sigma * steps
+        inside = np.clip(candidates, 0, 1)
+        losses = objective(inside) + 1e3 * np.sum((candidates - inside) ** 2, axis=1)
+        evaluations += lam
+
+        order = np.argsort(losses)
+        if losses[order[0]] < best_f:
+            best_f, best_x = float(losses[order[0]]), inside[order[0]].copy()
+        history.append(losses[order[0]])
+
+        old_mean = mean
+        selected = steps[order[:mu]]
+        mean = old_mean + sigma * (weights @ selected)
+        step = weights @ selected
+        inv_sqrt_cov = basis @ np.diag(1 / scales) @ basis.T
+        ps = (1 - cs) * ps + np.sqrt(cs * (2 - cs) * mueff) * (inv_sqrt_cov @ step)
+        hsig = np.linalg.norm(ps) / np.sqrt(1 - (1 - cs) ** (2 * generation)) / chi_n < 1.4 + 2 / (n + 1)
+        pc = (1 - cc) * pc + hsig * np.sqrt(cc * (2 - cc) * mueff) * step
+        cov = ((1 - c1 - cmu) * cov
+               + c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2 - cc) * cov)
+               + cmu * (selected.T * weights) @ selected)
+        sigma *= np.exp((cs / damps) * (np.linalg.norm(ps) / chi_n - 1))
+
+        cov = (cov + cov.T) / 2
+        eigenvalues, basis = np.linalg.eigh(cov)
+        scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+        window = 10 + int(np.ceil(30 * n / lam))
+        if sigma * scales.max() < tol_x:
+            break
+        if len(history) >= window and np.ptp(history[-window:]) < tol_fun:
+            break
+    return best_x, best_f, evaluations
+
+def _run_restart(job):
+    """Run one CMA-ES restart. Executed in worker processes."""
+    objective, mean, sigma, popsize, max_evaluations, seed = job
+    return cma_es(objective, mean, sigma, popsize, max_evaluations, seed)
+
+class CalibrationCache:
+    """JSON store of calibration optima, one file per calibration problem.
+
+    The problem key hashes everything that defines the fit except the data (parameters,
+    bounds, targets, weights, scenario, window and base config). Each entry records a hash
+    of the observed series it was fitted to, so an unchanged problem on unchanged data is
+    answered from the cache and a data refresh warm-starts from the stored optimum.
+    """
+    def __init__(self, cache_dir=".cache/calibration"):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, key):
+        """Return the stored entry for a problem key, or None."""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key, entry):
+        """Write the entry for a problem key, replacing any earlier one."""
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, self._path(key))
+
+class Calibrator:
+    """Fit model coefficients and initial values to historical panels.
+
+    Candidate parameter sets are scored in vectorised batches (one EnsembleSimulation per
+    CMA-ES generation) and several IPOP-CMA-ES restarts with growing populations run in
+    parallel on a process pool. Optima are cached per problem; re-calibrating after the
+    data changes first runs a single restart from the previous optimum with a small step
+    size, and only falls back to the full set of restarts if it misses the cached loss.
+    """
+    def __init__(self, config, data_handler=None, targets=None, parameters=None, weights=None,
+                 scenario_name="baseline", start_year=None, end_year=None,
+                 cache_dir=".cache/calibration", max_workers=None):
+        """Set up the calibration problem.
+
+        Args:
+            config (dict): Base simulation configuration.
+            data_handler (DigitalDataHandler, optional): Handler with loaded historical data.
+                Defaults to one built from config['data_sources'].
+            targets (dict, optional): Metric -> (source, indicator). Defaults to CALIBRATION_TARGETS.
+            parameters (dict, optional): Parameter path -> (low, high). Defaults to CALIBRATION_PARAMETERS.
+            weights (dict, optional): Metric -> loss weight (default 1).
+            scenario_name (str): Policy scenario the history is fitted under.
+            start_year (int, optional): First simulated year. Defaults to the first observed year.
+            end_year (int, optional): Last simulated year. Defaults to the last observed year.
+            cache_dir (str, optional): Directory of the result cache; None disables caching.
+            max_workers (int, optional): Worker processes for restarts. Defaults to os.cpu_count().
+        """
+        if data_handler is None:
+            data_handler = DigitalDataHandler(config.get('data_sources', {}))
+            data_handler.load_historical_data()
+        self.data_handler = data_handler
+        self.targets = dict(CALIBRATION_TARGETS if targets is None else targets)
+        parameters = CALIBRATION_PARAMETERS if parameters is None else parameters
+        self.parameters = list(parameters)
+        self.bounds = np.array([parameters[path] for path in self.parameters], dtype=float)
+        if (self.bounds[:, 1] <= self.bounds[:, 0]).any():
+            raise ValueError("Every calibrated parameter needs bounds with low < high")
+        self.weights = weights or {}
+        self.scenario_name = scenario_name
+        self.cache = CalibrationCache(cache_dir) if cache_dir else None
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        series = {}
+        for metric, (source, indicator) in self.targets.items():
+            observations = indicator_observations(data_handler.historical_data, source, indicator)
+            if observations is None:
+                logger.warning("No historical data for calibration target %s (%s/%s)", metric, source, indicator)
+                continue
+            series[metric] = observations
+        if not series:
+            raise ValueError("None of the calibration targets has historical observations")
+        self.start_year = min(int(years[0]) for years, _ in series.values()) if start_year is None else start_year
+        self.end_year = max(int(years[-1]) for years, _ in series.values()) if end_year is None else end_year
+        self.observed = {}
+        for metric, (years, values) in series.items():
+            window = (years >= self.start_year) & (years <= self.end_year)
+            if window.any():
+                self.observed[metric] = (years[window], values[window])
+
+        self.config = config
+        if config.get('initial_conditions') is None and config.get('data_sources'):
+            # Extract initial conditions once instead of reloading the data in every evaluation
+            self.config = {**config, 'initial_conditions': data_handler.get_initial_conditions(self.start_year)}
+
+    def objective(self):
+        """Return the vectorised CalibrationObjective of this problem."""
+        return CalibrationObjective(self.config, self.scenario_name, self.parameters, self.bounds,
+                                    self.observed, self.weights, self.start_year, self.end_year)
+
+    def problem_key(self):
+        """Hash of the problem definition, excluding the observed data."""
+        config = {k: v for k, v in self.config.items() if k not in ('initial_conditions', 'step_cache', 'instrumentation')}
+        problem = {
+            'parameters': self.parameters, 'bounds': self.bounds.tolist(), 'targets': self.targets,
+            'weights': self.weights, 'scenario': self.scenario_name,
+            'window': [self.start_year, self.end_year], 'config': config,
+        }
+        return hashlib.blake2b(json.dumps(problem, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+    def data_hash(self):
+        """Hash of the observed series the problem is fitted to."""
+        h = hashlib.blake2b(digest_size=16)
+        for metric in sorted(self.observed):
+            years, values = self.observed[metric]
+            h.update(metric.encode())
+            h.update(np.ascontiguousarray(years, dtype=np.int64).tobytes())
+            h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        return h.hexdigest()
+
+    def calibrate(self, restarts=4, popsize=None, max_evaluations=3000, sigma=0.3, warm_sigma=0.05,
+                  warm_tolerance=0.1, seed=None, force=False):
+        """Run the calibration.
+
+        Args:
+            restarts (int): Independent CMA-ES runs of a cold fit; run k uses popsize * 2**k
+                            candidates per generation (IPOP) and starts from a random point,
+                            except the first.
+            popsize (int, optional): Population of the first run. Defaults to 4 + 3 ln(n).
+            max_evaluations (int): Evaluation budget per run.
+            sigma (float): Initial step size in unit-hypercube coordinates.
+            warm_sigma (float): Initial step size of the warm-start run.
+            warm_tolerance (float): Relative slack on the cached loss the warm-start run has to
+                                    reach; above it the cold restarts run as well. The loss is
+                                    a mean over observations, so it stays comparable when a
+                                    data refresh adds years.
+            seed (int, optional): Random seed.
+            force (bool): Re-run even if the cache holds a result for unchanged data.
+
+        Returns:
+            dict: 'parameters' (path -> value), 'loss', 'evaluations', 'overrides' (config overrides
+                  applying the fit, see calibrated_config), 'cached' and 'warm_start' flags.
+        """
+        key, data_hash = self.problem_key(), self.data_hash()
+        previous = self.cache.load(key) if self.cache else None
+        if previous is not None and previous['data_hash'] == data_hash and not force:
+            logger.info("Calibration unchanged since the last run; using the cached optimum (loss %.6g)", previous['loss'])
+            return self._result(previous['parameters'], previous['loss'], 0, cached=True, warm_start=False)
+
+        n = len(self.parameters)
+        popsize = popsize or 4 + int(3 * np.log(n))
+        seeds = np.random.SeedSequence(seed).generate_state(restarts)
+        rng = np.random.default_rng(seed)
+        objective = self.objective()
+        warm_start = previous is not None
+        cold_jobs = [
+            (objective, np.full(n, 0.5) if k == 0 else rng.random(n), sigma, popsize * 2 ** k,
+             max_evaluations, int(seeds[k]))
+            for k in range(restarts)
+        ]
+
+        started = time.perf_counter()
+        runs = []
+        if warm_start:
+            # A data refresh rarely moves the optimum far: one small-step run from it usually suffices
+            logger.info("Calibrating %s parameters against %s series (%s-%s): warm start from the cached optimum",
+                        n, len(self.observed), self.start_year, self.end_year)
+            first = self._unit(np.array([previous['parameters'][p] for p in self.parameters]))
+            runs = self._run_restarts([(objective, first, warm_sigma, popsize, max_evaluations, int(seeds[0]))])
+            if runs[0][1] > previous['loss'] * (1 + warm_tolerance):
+                logger.info("Warm start reached loss %.6g against %.6g cached; running the cold restarts",
+                            runs[0][1], previous['loss'])
+            else:
+                cold_jobs = []
+        if cold_jobs:
+            logger.info("Calibrating %s parameters against %s series (%s-%s): %s restart(s) on %s worker(s)",
+                        n, len(self.observed), self.start_year, self.end_year, restarts,
+                        min(self.max_workers, restarts))
+            runs += self._run_restarts(cold_jobs)
+        best_x, best_f, _ = min(runs, key=lambda run: run[1])
+        evaluations = sum(run[2] for run in runs)
+        values = objective.scale(best_x)
+        logger.info("Calibration finished in %.2fs: loss %.6g after %s evaluations",
+                    time.perf_counter() - started, best_f, evaluations)
+
+        parameters = {path: float(value) for path, value in zip(self.parameters, values)}
+        if self.cache is not None:
+            self.cache.store(key, {'data_hash': data_hash, 'parameters': parameters, 'loss': best_f,
+                                   'evaluations': evaluations})
+        return self._result(parameters, best_f, evaluations, cached=False, warm_start=warm_start)
+
+    def _run_restarts(self, jobs):
+        workers = min(self.max_workers, len(jobs))
+        if workers <= 1:
+            return [_run_restart(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_run_restart, jobs))
+
+    def _unit(self, values):
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return np.clip((values - low) / (high - low), 0, 1)
+
+    def _result(self, parameters, loss, evaluations, cached, warm_start):
+        return {
+            'parameters': parameters,
+            'loss': loss,
+            'evaluations': evaluations,
+            'overrides': parameter_overrides(list(parameters), list(parameters.values())),
+            'cached': cached,
+            'warm_start': warm_start,
+        }
+
+    def calibrated_config(self, result):
+        """Return the base config with a calibration result applied (model_params and initial_state)."""
+        return merge_config(self.config, {**result['overrides'], 'start_year': self.start_year})
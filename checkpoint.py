@@ -0,0 +1,53 @@
+# Compact binary checkpoints of a simulation's full state.
+#
+# A checkpoint is a short header followed by a zlib-compressed pickle of the payload
+# assembled by BangladeshDigitalTransformationSimulation.snapshot(). Like any pickle,
+# checkpoints must only be loaded from trusted sources.
+import os
+import pickle
+import zlib
+
+CHECKPOINT_MAGIC = b"BDTSCKPT"
+CHECKPOINT_VERSION = 1
+
+
+def encode_checkpoint(payload, compression_level=6):
+    """Serialise a checkpoint payload to bytes.
+
+    Args:
+        payload (dict): The simulation state to store.
+        compression_level (int): zlib compression level (0-9).
+    """
+    body = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), compression_level)
+    return CHECKPOINT_MAGIC + bytes([CHECKPOINT_VERSION]) + body
+
+
+def decode_checkpoint(data):
+    """Deserialise checkpoint bytes produced by encode_checkpoint.
+
+    Args:
+        data (bytes): The checkpoint.
+    """
+    header_size = len(CHECKPOINT_MAGIC) + 1
+    if data[:len(CHECKPOINT_MAGIC)] != CHECKPOINT_MAGIC:
+        raise ValueError("Not a simulation checkpoint")
+    version = data[len(CHECKPOINT_MAGIC)]
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version} (expected {CHECKPOINT_VERSION})")
+    return pickle.loads(zlib.decompress(data[header_size:]))
+
+
+def read_checkpoint(source):
+    """Return checkpoint bytes from bytes or a file path."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def write_checkpoint(path, data):
+    """Write checkpoint bytes to a file atomically (write to a temp file, then rename)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
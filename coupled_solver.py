@@ -0,0 +1,202 @@
+import numpy as np
+import networkx as nx
+import pandas as pd
+
+from model_state import capture_state, restore_state
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+class CoupledYearSolver:
+    """Solve circular intra-year model dependencies by fixed-point iteration.
+
+    The models are grouped into strongly connected components of the full dependency graph
+    (including feedback inputs such as skills <- economy). Acyclic models are stepped once.
+    Each cyclic group is swept repeatedly from its start-of-year state. Every sweep runs the
+    group's models in schedule order, feeding back the previous sweep's outputs, until the
+    outputs stop changing. Anderson or Aitken acceleration extrapolates the feedback outputs
+    between sweeps.
+    """
+    def __init__(self, schedule, feedback_inputs, tolerance=1e-8, max_iterations=50,
+                 acceleration="anderson", anderson_depth=5):
+        """Initialize the solver.
+
+        Args:
+            schedule (list): (prefix, model attribute, upstream inputs) entries, as in
+                             simulation.MODEL_SCHEDULE.
+            feedback_inputs (dict): Mapping of prefix to its full upstream inputs, replacing the
+                                    None placeholders of the schedule (simulation.MODEL_FEEDBACK_INPUTS).
+            tolerance (float): Convergence threshold on max |G(x) - x| / (|G(x)| + 1).
+            max_iterations (int): Maximum number of sweeps per cyclic group and year.
+            acceleration (str or None): "anderson", "aitken" or None for plain fixed-point iteration.
+            anderson_depth (int): Number of previous iterates used by Anderson acceleration.
+        """
+        if acceleration not in (None, "anderson", "aitken"):
+            raise ValueError(f"Unknown acceleration '{acceleration}'; expected 'anderson', 'aitken' or None")
+        self.schedule = schedule
+        self.model_attrs = {prefix: model_attr for prefix, model_attr, _ in schedule}
+        self.inputs = {prefix: tuple(feedback_inputs.get(prefix, inputs)) for prefix, _, inputs in schedule}
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.acceleration = acceleration
+        self.anderson_depth = anderson_depth
+        self.convergence_log = [] # One record per (year, cyclic group)
+
+        order = {prefix: i for i, (prefix, _, _) in enumerate(schedule)}
+        graph = nx.DiGraph()
+        graph.add_nodes_from(order)
+        for prefix, inputs in self.inputs.items():
+            graph.add_edges_from((name, prefix) for name in inputs if name is not None)
+        condensed = nx.condensation(graph)
+        self.components = [
+            sorted(condensed.nodes[c]['members'], key=order.get)
+            for c in nx.lexicographical_topological_sort(
+                condensed, key=lambda c: min(order[m] for m in condensed.nodes[c]['members']))
+        ]
+        self.cyclic_components = [
+            members for members in self.components
+            if len(members) > 1 or graph.has_edge(members[0], members[0])
+        ]
+        logger.debug("Coupled solver groups: %s", self.cyclic_components)
+
+    @classmethod
+    def from_config(cls, schedule, feedback_inputs, solver_config):
+        """Build a solver from the simulation config's 'coupled_solver' entry.
+
+        Args:
+            schedule (list): The model schedule.
+            feedback_inputs (dict): The full upstream inputs of feedback models.
+            solver_config (bool or dict): True for defaults, or keyword arguments for the
+                                          constructor. Falsy keeps the one-pass schedule.
+
+        Returns:
+            CoupledYearSolver or None.
+        """
+        if not solver_config:
+            return None
+        if solver_config is True:
+            return cls(schedule, feedback_inputs)
+        return cls(schedule, feedback_inputs, **solver_config)
+
+    def run_year(self, sim, year, dt=1.0):
+        """Step every model of `sim` for one year (or a `dt`-year step of it), iterating cyclic
+        groups to a fixed point.
+
+        Returns:
+            dict: Mapping of result prefix to model state, in schedule order.
+        """
+        states = {}
+        for members in self.components:
+            if members in self.cyclic_components:
+                self._solve_component(sim, year, members, states, dt)
+            else:
+                prefix = members[0]
+                states[prefix] = sim.step_model(prefix, year, self._upstream(prefix, states, {}), dt)
+        return {prefix: states[prefix] for prefix, _, _ in self.schedule}
+
+    def _upstream(self, prefix, states, guesses):
+        upstream = []
+        for name in self.inputs[prefix]:
+            if name is None:
+                upstream.append({})
+            elif name in states:
+                upstream.append(states[name])
+            else:
+                upstream.append(guesses.get(name, {}))
+        return upstream
+
+    def _sweep(self, sim, year, members, states, snapshots, guesses, dt):
+        for prefix in members:
+            restore_state(getattr(sim, self.model_attrs[prefix]), snapshots[prefix])
+        sweep_states = dict(states)
+        for prefix in members:
+            sweep_states[prefix] = sim.step_model(prefix, year, self._upstream(prefix, sweep_states, guesses), dt)
+        return {prefix: sweep_states[prefix] for prefix in members}
+
+    def _solve_component(self, sim, year, members, states, dt):
+        snapshots = {prefix: capture_state(getattr(sim, self.model_attrs[prefix])) for prefix in members}
+
+        # The first sweep sees no feedback (empty dicts), exactly like the one-pass schedule
+        outputs = self._sweep(sim, year, members, states, snapshots, {}, dt)
+        layout = [(prefix, key, np.shape(value)) for prefix in members for key, value in outputs[prefix].items()]
+        x = _flatten(outputs, layout)
+        accelerator = _Accelerator(self.acceleration, self.anderson_depth)
+
+        iterations, residual = 1, np.inf
+        while iterations < self.max_iterations:
+            outputs = self._sweep(sim, year, members, states, snapshots, _unflatten(x, layout), dt)
+            g = _flatten(outputs, layout)
+            iterations += 1
+            residual = float(np.max(np.abs(g - x) / (np.abs(g) + 1.0), initial=0.0))
+            if residual <= self.tolerance:
+                break
+            x = accelerator.next_iterate(x, g)
+
+        converged = residual <= self.tolerance
+        if not converged:
+            logger.warning("Coupled group %s did not converge in year %s (residual %.3g after %s sweeps).",
+                           members, year, residual, iterations)
+        # Model state and `outputs` both come from the last sweep, so they stay consistent
+        states.update(outputs)
+        self.convergence_log.append({
+            'year': year, 'component': "+".join(members), 'iterations': iterations,
+            'residual': residual, 'converged': converged,
+        })
+
+    def convergence_dataframe(self):
+        """Return per-year iteration counts and final residuals, indexed by (year, component)."""
+        df = pd.DataFrame(self.convergence_log, columns=['year', 'component', 'iterations', 'residual', 'converged'])
+        return df.set_index(['year', 'component'])
+
+def _flatten(outputs, layout):
+    return np.concatenate([np.ravel(np.asarray(outputs[prefix][key], dtype=float)) for prefix, key, _ in layout])
+
+def _unflatten(x, layout):
+    guesses, offset = {}, 0
+    for prefix, key, shape in layout:
+        size = int(np.prod(shape))
+        value = x[offset:offset + size]
+        guesses.setdefault(prefix, {})[key] = float(value[0]) if shape == () else value.reshape(shape)
+        offset += size
+    return guesses
+
+class _Accelerator:
+    """Produce the next fixed-point iterate from x and G(x)."""
+    def __init__(self, method, depth):
+        self.method = method
+        self.depth = depth
+        self._residuals = [] # Anderson: previous f = G(x) - x
+        self._images = [] # Anderson: previous G(x)
+        self._omega = 1.0 # Aitken relaxation factor
+        self._previous_residual = None
+
+    def next_iterate(self, x, g):
+        f = g - x
+        if self.method == "anderson":
+            return self._anderson(f, g)
+        if self.method == "aitken":
+            return self._aitken(x, f)
+        return g
+
+    def _anderson(self, f, g):
+        self._residuals.append(f)
+        self._images.append(g)
+        if len(self._residuals) > self.depth + 1:
+            self._residuals.pop(0)
+            self._images.pop(0)
+        if len(self._residuals) == 1:
+            return g
+        delta_f = np.diff(np.stack(self._residuals, axis=1), axis=1)
+        delta_g = np.diff(np.stack(self._images, axis=1), axis=1)
+        gamma = np.linalg.lstsq(delta_f, f, rcond=None)[0]
+        return g - delta_g @ gamma
+
+    def _aitken(self, x, f):
+        # Irons-Tuck dynamic relaxation: x_{k+1} = x_k + omega_k * f_k
+        if self._previous_residual is not None:
+            delta = f - self._previous_residual
+            denominator = float(delta @ delta)
+            if denominator > 0.0:
+                self._omega = -self._omega * float(self._previous_residual @ delta) / denominator
+        self._previous_residual = f
+        return x + self._omega * f
@@ -1,9 +1,24 @@
+import numpy as np
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named coefficients of the yearly dynamics. Override them through config['model_params']['cyber'];
+# in an EnsembleSimulation a value may also be an array with one entry per replica.
+DEFAULT_PARAMS = {
+    'phishing_growth': 1.03,         # Yearly growth factor of the phishing rate
+    'soc_policy_gain': 0.03,         # SOC coverage gained per unit of policy effectiveness
+    'signature_adoption_gain': 0.04, # Digital signature adoption gained per unit of society adoption
+}
+
 class CybersecurityModel:
     """Model security frameworks, threat response and trust systems in Bangladesh."""
     def __init__(self, config):
         """Initialize cybersecurity parameters using Bangladesh digital security data."""
-        print("Initializing CybersecurityModel...")
+        logger.debug("Initializing CybersecurityModel...")
         self.config = config
+        self.params = {name: config.get(name, default) for name, default in DEFAULT_PARAMS.items()}
         # Placeholder attributes based on prompt - Initialized with illustrative synthetic data for 2025
         self.threat_landscape = {"phishing_rate": 0.15, "malware_incidents_per_1000": 5, "critical_infra_attacks": 2} # Example metrics
         self.protection_systems = {"national_cert_maturity": 0.4, "soc_coverage": 0.3, "encryption_adoption": 0.25} # Scale 0-1
@@ -11,9 +26,9 @@ class CybersecurityModel:
         self.digital_trust_mechanisms = {"digital_signature_adoption": 0.2, "pki_infra_readiness": 0.5} # Scale 0-1
         self.security_capacity = {"awareness_level": 0.3, "professional_pool_size": 5000} # Scale 0-1 and count
 
-        print("CybersecurityModel Initialized.")
+        logger.debug("CybersecurityModel Initialized.")
 
-    def simulate_security_dynamics(self, year, infrastructure_state, policy_state, society_state):
+    def simulate_security_dynamics(self, year, infrastructure_state, policy_state, society_state, dt=1.0):
         """Simulate one year of cybersecurity dynamics.
 
         Args:
@@ -21,14 +36,16 @@ class CybersecurityModel:
             infrastructure_state (dict): Current state from DigitalInfrastructureModel.
             policy_state (dict): Current state from DigitalPolicyModel.
             society_state (dict): Current state from DigitalSocietyModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Cybersecurity for year {year}...")
+        logger.debug("Simulating Cybersecurity for year %s...", year)
+        params = self.params
         # Placeholder logic: Example - Increase threats slightly, improve protection based on policy/infra
-        self.threat_landscape["phishing_rate"] *= 1.03
-        self.protection_systems["soc_coverage"] = min(1.0, self.protection_systems["soc_coverage"] + 0.03 * policy_state.get("policy_effectiveness", 0.5))
-        self.digital_trust_mechanisms["digital_signature_adoption"] = min(1.0, self.digital_trust_mechanisms["digital_signature_adoption"] + 0.04 * society_state.get("adoption_rate", 0.5))
+        self.threat_landscape["phishing_rate"] *= params["phishing_growth"] ** dt
+        self.protection_systems["soc_coverage"] = np.minimum(1.0, self.protection_systems["soc_coverage"] + params["soc_policy_gain"] * policy_state.get("policy_effectiveness", 0.5) * dt)
+        self.digital_trust_mechanisms["digital_signature_adoption"] = np.minimum(1.0, self.digital_trust_mechanisms["digital_signature_adoption"] + params["signature_adoption_gain"] * society_state.get("adoption_rate", 0.5) * dt)
 
-        print(f"Finished Simulating Cybersecurity for year {year}.")
+        logger.debug("Finished Simulating Cybersecurity for year %s.", year)
         # Return current state
         return {
             "threat_level": self.threat_landscape["phishing_rate"], # Example output metric
@@ -37,5 +54,5 @@ class CybersecurityModel:
         }
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, infrastructure_state, policy_state, society_state):
-        return self.simulate_security_dynamics(year, infrastructure_state, policy_state, society_state) 
\ No newline at end of file
+    def simulate_step(self, year, infrastructure_state, policy_state, society_state, dt=1.0):
+        return self.simulate_security_dynamics(year, infrastructure_state, policy_state, society_state, dt) 
\ No newline at end of file
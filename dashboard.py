@@ -0,0 +1,146 @@
+import argparse
+from functools import lru_cache
+
+import numpy as np
+from dash import Dash, Input, Output, dcc, html
+
+from ensemble_plots import PLOT_DEFAULTS, SCENARIO_COLOURS, _hex_to_rgba, decimate
+from results_archive import ResultsArchive
+from sim_logging import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+# Scenario groups with at most this many runs also show their individual runs
+MAX_RUN_TRACES = 50
+
+# Shown instead of the figure and summary when the archive has no years in the selected range
+NO_DATA_MESSAGE = "No data in the selected year range."
+
+class ResultsDashboard:
+    """Dash app for browsing a precomputed ResultsArchive.
+
+    Callbacks only slice the memory-mapped archive (quantile bands are precomputed when the
+    archive is written) and build plain figure dicts, skipping plotly's figure validation.
+    Responses are memoised per (scenarios, metric, year range) in a bounded LRU cache
+    shared by every analyst connected to the server process.
+    """
+    def __init__(self, archive, cache_size=512, max_run_traces=MAX_RUN_TRACES):
+        """Build the app.
+
+        Args:
+            archive (ResultsArchive or str): The archive, or its directory.
+            cache_size (int): Maximum number of memoised figure responses.
+            max_run_traces (int): Groups with at most this many runs also show every run.
+        """
+        self.archive = archive if isinstance(archive, ResultsArchive) else ResultsArchive(archive)
+        self.max_run_traces = max_run_traces
+        self.figure = lru_cache(maxsize=cache_size)(self._figure)
+        self.summary = lru_cache(maxsize=cache_size)(self._summary)
+        self.app = self._build_app()
+
+    def _build_app(self):
+        archive = self.archive
+        years = archive.years
+        app = Dash(__name__, title="Bangladesh Digital Transformation Results")
+        app.layout = html.Div([
+            html.H2("Digital Transformation Simulation Results"),
+            html.Div([
+                dcc.Dropdown(id='scenarios', options=archive.groups, value=archive.groups[:3], multi=True),
+                dcc.Dropdown(id='metric', options=archive.metrics, value=archive.metrics[0], clearable=False),
+            ], style={'display': 'grid', 'gridTemplateColumns': '2fr 1fr', 'gap': '12px'}),
+            dcc.RangeSlider(id='years', min=int(years[0]), max=int(years[-1]), step=1,
+                            value=[int(years[0]), int(years[-1])],
+                            marks={int(y): str(int(y)) for y in years[::max(1, len(years) // 12)]}),
+            dcc.Graph(id='trajectory'),
+            html.Div(id='summary'),
+        ], style={'maxWidth': '1200px', 'margin': '20px auto', 'fontFamily': 'sans-serif'})
+
+        @app.callback(Output('trajectory', 'figure'), Output('summary', 'children'),
+                      Input('scenarios', 'value'), Input('metric', 'value'), Input('years', 'value'))
+        def update(scenarios, metric, year_range):
+            key = (tuple(scenarios or ()), metric, int(year_range[0]), int(year_range[1]))
+            return self.figure(*key), self.summary(*key)
+
+        return app
+
+    def _figure(self, scenarios, metric, first, last):
+        archive = self.archive
+        years = archive.years[archive.year_slice(first, last)]
+        quantiles = archive.quantiles
+        layout = {
+            'template': 'plotly_white',
+            'title': {'text': metric},
+            'xaxis': {'title': {'text': 'Simulation Year'}},
+            'yaxis': {'title': {'text': metric}},
+            'hovermode': 'x unified',
+            'margin': {'t': 50, 'b': 50, 'l': 60, 'r': 20},
+        }
+        if not len(years):
+            layout['annotations'] = [{'text': NO_DATA_MESSAGE, 'xref': 'paper', 'yref': 'paper', 'x': 0.5, 'y': 0.5,
+                                      'showarrow': False, 'font': {'size': 16}}]
+            return {'data': [], 'layout': layout}
+        data = []
+        if scenarios:
+            bands = archive.group_bands(metric, scenarios, first, last) # (groups, years, quantiles)
+        for i, scenario in enumerate(scenarios):
+            colour = SCENARIO_COLOURS[i % len(SCENARIO_COLOURS)]
+            group_size = int(archive.group_sizes[archive.groups.index(scenario)])
+            if group_size <= self.max_run_traces:
+                positions = np.flatnonzero(archive.runs['group'].to_numpy() == scenario)
+                for run_values in archive.run_values(metric, positions, first, last):
+                    data.append(self._trace(years, run_values, mode='lines', showlegend=False, hoverinfo='skip',
+                                            line={'color': _hex_to_rgba(colour, 0.35), 'width': 1}, legendgroup=scenario))
+            if group_size > 1:
+                for b in range(len(quantiles) // 2):
+                    data.append(self._trace(years, bands[i, :, -1 - b], mode='lines', line={'width': 0},
+                                            showlegend=False, hoverinfo='skip', legendgroup=scenario))
+                    data.append(self._trace(years, bands[i, :, b], mode='lines', line={'width': 0}, fill='tonexty',
+                                            fillcolor=_hex_to_rgba(colour, 0.15 + 0.15 * b), legendgroup=scenario,
+                                            name=f"{scenario} {quantiles[b]:.0%}-{quantiles[-1 - b]:.0%}"))
+            data.append(self._trace(years, bands[i, :, len(quantiles) // 2], mode='lines', line={'color': colour, 'width': 2.5},
+                                    name=f"{scenario} median" if group_size > 1 else scenario, legendgroup=scenario))
+        return {'data': data, 'layout': layout}
+
+    @staticmethod
+    def _trace(years, values, **kwargs):
+        # WebGL is chosen from the full series length, as in ensemble_plots.scatter_trace
+        trace_type = 'scattergl' if len(years) > PLOT_DEFAULTS['webgl_threshold'] else 'scatter'
+        x, y = decimate(years, values)
+        return {'type': trace_type, 'x': x.tolist(), 'y': y.tolist(), **kwargs}
+
+    def _summary(self, scenarios, metric, first, last):
+        if not scenarios:
+            return html.P("Select at least one scenario.")
+        archive = self.archive
+        years = archive.years[archive.year_slice(first, last)]
+        if not len(years):
+            return html.P(NO_DATA_MESSAGE)
+        bands = archive.group_bands(metric, scenarios, first, last)
+        median = len(archive.quantiles) // 2
+        final_year = int(years[-1]) # The last archived year in range, not necessarily `last`
+        header = html.Tr([html.Th("Scenario"), html.Th("Runs"), html.Th(f"Median {final_year}"),
+                          html.Th(f"{archive.quantiles[0]:.0%}-{archive.quantiles[-1]:.0%} {final_year}")])
+        rows = [
+            html.Tr([
+                html.Td(scenario),
+                html.Td(int(archive.group_sizes[archive.groups.index(scenario)])),
+                html.Td(f"{bands[i, -1, median]:,.3f}"),
+                html.Td(f"{bands[i, -1, 0]:,.3f} - {bands[i, -1, -1]:,.3f}"),
+            ])
+            for i, scenario in enumerate(scenarios)
+        ]
+        return html.Table([header, *rows])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the results dashboard over a precomputed results archive.")
+    parser.add_argument("archive", help="Directory written by ResultsArchive.write / write_cube.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--cache-size", type=int, default=512, help="Memoised responses kept per server process.")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+    configure_logging(level=args.log_level.upper())
+
+    dashboard = ResultsDashboard(args.archive, cache_size=args.cache_size)
+    logger.info("Serving %s runs from %s", len(dashboard.archive.runs), args.archive)
+    dashboard.app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from sim_logging import get_logger
+
+try:
+    import pyarrow # noqa: F401 -- enables the Feather (Arrow IPC) cache format
+    CACHE_FORMAT = "feather"
+except ImportError:
+    CACHE_FORMAT = "pickle"
+
+logger = get_logger(__name__)
+
+class ParsedFrameCache:
+    """On-disk cache of parsed historical data frames.
+
+    Each source has a small JSON manifest recording the source file's mtime, size and
+    content hash, plus a hash of the parse options used. A warm start whose file stat
+    matches the manifest loads the cached Feather file without touching the CSV. If only
+    the mtime changed (e.g. the file was copied), the content hash is recomputed, which
+    is much cheaper than parsing, and the cache is reused when the content is unchanged.
+    """
+    def __init__(self, cache_dir):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding manifests and cached frames.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _manifest_path(self, source_key):
+        return os.path.join(self.cache_dir, f"{source_key}.json")
+
+    def load(self, source_key, path, options_hash):
+        """Return the cached frame for a source, or None if the cache is missing or stale.
+
+        Args:
+            source_key (str): Name of the data source (e.g. "btrc_stats").
+            path (str): Path of the source file.
+            options_hash (str): Hash of the parse options (dtypes, columns, validation schema).
+        """
+        try:
+            with open(self._manifest_path(source_key), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('options_hash') != options_hash or manifest.get('format') != CACHE_FORMAT:
+            return None
+
+        stat = os.stat(path)
+        if (manifest.get('mtime_ns'), manifest.get('size')) != (stat.st_mtime_ns, stat.st_size):
+            if manifest.get('size') != stat.st_size or manifest.get('content_hash') != file_hash(path):
+                return None
+            # Same content under a new mtime: refresh the manifest and keep the cached frame
+            manifest['mtime_ns'] = stat.st_mtime_ns
+            self._write_json(self._manifest_path(source_key), manifest)
+
+        cached_path = os.path.join(self.cache_dir, manifest['cache_file'])
+        try:
+            return _read_frame(cached_path)
+        except (OSError, ValueError, pickle.UnpicklingError) as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", cached_path, e)
+            return None
+
+    def store(self, source_key, path, options_hash, frame, content_hash=None, metadata=None):
+        """Cache a parsed frame for a source.
+
+        Args:
+            source_key (str): Name of the data source.
+            path (str): Path of the source file the frame was parsed from.
+            options_hash (str): Hash of the parse options.
+            frame (pd.DataFrame): The parsed frame.
+            content_hash (str, optional): Precomputed content hash of the source file.
+            metadata (dict, optional): JSON-serialisable data kept with the entry (e.g. the
+                                       validation summary), returned by metadata().
+        """
+        stat = os.stat(path)
+        cache_file = f"{source_key}-{options_hash[:16]}.{CACHE_FORMAT}"
+        cached_path = os.path.join(self.cache_dir, cache_file)
+        tmp_path = f"{cached_path}.tmp"
+        _write_frame(frame, tmp_path)
+        os.replace(tmp_path, cached_path)
+        self._write_json(self._manifest_path(source_key), {
+            'source_path': os.path.abspath(path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'content_hash': content_hash or file_hash(path),
+            'options_hash': options_hash,
+            'format': CACHE_FORMAT,
+            'cache_file': cache_file,
+            'metadata': metadata or {},
+        })
+
+    def metadata(self, source_key):
+        """Return the metadata stored with a source's cache entry ({} if none)."""
+        try:
+            with open(self._manifest_path(source_key), 'r', encoding='utf-8') as f:
+                return json.load(f).get('metadata', {})
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_json(path, payload):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+def file_hash(path, chunk_size=1 << 20):
+    """Return the blake2b hash of a file's content."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def hash_options(options):
+    """Return a stable hash of JSON-serialisable parse options."""
+    encoded = json.dumps(options, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+def _write_frame(frame, path):
+    if CACHE_FORMAT == "feather":
+        frame.reset_index(drop=True).to_feather(path)
+    else:
+        frame.to_pickle(path)
+
+def _read_frame(path):
+    if CACHE_FORMAT == "feather":
+        return pd.read_feather(path)
+    return pd.read_pickle(path)
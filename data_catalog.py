@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from data_cache import hash_options
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Historical data sources relevant to each model, used by get_config_for_model
+MODEL_DATA_SOURCES = {
+    'DigitalInfrastructureModel': ['btrc_stats', 'bdix_traffic', 'ispab_isp', 'bnda_architecture'],
+    'DigitalGovernmentModel': ['a2i_services', 'bcc_reports', 'open_data_portal', 'bnda_architecture'],
+    'DigitalEconomyModel': ['bangladesh_bank_mfs', 'dcab_commerce', 'basis_industry', 'bcs_market'],
+    'DigitalSkillsModel': ['bbs_ict_survey', 'bitac_training', 'dept_ict'],
+    'CybersecurityModel': ['cert_incidents'],
+    'DigitalInclusionModel': ['bbs_ict_survey', 'btrc_stats', 'a2i_services'],
+    'EmergingTechnologyModel': ['ict_division', 'hitech_park', 'basis_industry'],
+    'InnovationEcosystemModel': ['startup_bangladesh', 'hitech_park', 'ict_division'],
+    'SectoralTransformationModel': ['bangladesh_bank_mfs', 'a2i_services', 'bbs_ict_survey'],
+    'DigitalPolicyModel': ['ict_division', 'btrc_stats'],
+    'DigitalSocietyModel': ['bbs_ict_survey', 'btrc_stats'],
+    'InternationalIntegrationModel': ['basis_industry', 'bdix_traffic', 'bangladesh_bank_mfs'],
+}
+
+class LazyDataCatalog(Mapping):
+    """Read-only mapping of source key to DataFrame that opens sources on first access.
+
+    Numeric columns of each source are stored once as column-major .npy blocks (one per
+    dtype) and reopened with np.load(mmap_mode='r'). The returned DataFrames wrap those
+    memory maps without copying, so forked or pooled worker processes reading the same
+    store share one physical copy through the OS page cache. Non-numeric columns are kept
+    in a small pickle sidecar and loaded into memory.
+
+    Like the eager loader, a source that fails to load is logged and skipped: it raises
+    KeyError and drops out of the mapping, so `in` and get() treat it as absent.
+    """
+    def __init__(self, specs, loader, store_dir):
+        """Initialize the catalog.
+
+        Args:
+            specs (dict): Source key -> spec dict with at least 'path' (see
+                          DigitalDataHandler.historical_source_specs).
+            loader (callable): loader(key, spec) returning the parsed DataFrame for a source;
+                               only called when the memory-mapped store is missing or stale.
+            store_dir (str): Directory holding the memory-mapped panels.
+        """
+        self.specs = specs
+        self.loader = loader
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self._frames = {}
+        self._failed = set() # Sources whose load raised; skipped from then on
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        frame = self._frames.get(key)
+        if frame is not None:
+            return frame
+        if key not in self.specs or key in self._failed:
+            raise KeyError(key)
+        with self._lock:
+            if key not in self._frames and key not in self._failed:
+                try:
+                    self._frames[key] = self._open(key)
+                except Exception as e:
+                    logger.error("Error loading data from %s: %s", self.specs[key]['path'], e)
+                    self._failed.add(key)
+        if key not in self._frames:
+            raise KeyError(key)
+        return self._frames[key]
+
+    def __contains__(self, key):
+        # Answered from the specs, without opening the source as Mapping.__contains__ would
+        return key in self._frames or (key in self.specs and key not in self._failed)
+
+    def __iter__(self):
+        yield from (key for key in self.specs if key in self._frames or key not in self._failed)
+        yield from (key for key in list(self._frames) if key not in self.specs)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def replace(self, key, frame):
+        """Serve `frame` for a source in place of its memory-mapped panel (e.g. after real-time
+        updates). The on-disk store is left untouched."""
+        with self._lock:
+            self._frames[key] = frame
+
+    def is_loaded(self, key):
+        """Return True if the source has already been opened."""
+        return key in self._frames
+
+    def _manifest_path(self, key):
+        return os.path.join(self.store_dir, f"{key}.json")
+
+    def _source_signature(self, key):
+        spec = self.specs[key]
+        stat = os.stat(spec['path'])
+        return {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'options_hash': hash_options({k: v for k, v in spec.items() if k != 'path'}),
+        }
+
+    def _open(self, key):
+        signature = self._source_signature(key)
+        try:
+            with open(self._manifest_path(key), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = None
+        if manifest is None or manifest.get('signature') != signature:
+            manifest = self._build(key, signature)
+        else:
+            logger.debug("Opening memory-mapped panel for %s", key)
+        return self._read(manifest)
+
+    def _build(self, key, signature):
+        frame = self.loader(key, self.specs[key])
+        logger.debug("Writing memory-mapped panel for %s", key)
+        numeric_by_dtype = {}
+        for column, dtype in frame.dtypes.items():
+            if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+                numeric_by_dtype.setdefault(dtype, []).append(column)
+
+        blocks, numeric_columns = [], set()
+        for dtype, columns in numeric_by_dtype.items():
+            filename = f"{key}.{dtype.name}.npy"
+            np.save(os.path.join(self.store_dir, filename), np.asfortranarray(frame[columns].to_numpy(dtype=dtype)))
+            blocks.append({'file': filename, 'columns': columns})
+            numeric_columns.update(columns)
+
+        others = [c for c in frame.columns if c not in numeric_columns]
+        sidecar = None
+        if others:
+            sidecar = f"{key}.other.pkl"
+            frame[others].reset_index(drop=True).to_pickle(os.path.join(self.store_dir, sidecar))
+
+        manifest = {'signature': signature, 'columns': list(frame.columns), 'blocks': blocks, 'sidecar': sidecar}
+        tmp_path = f"{self._manifest_path(key)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path(key))
+        return manifest
+
+    def _read(self, manifest):
+        parts = [
+            pd.DataFrame(np.load(os.path.join(self.store_dir, block['file']), mmap_mode='r'),
+                         columns=block['columns'], copy=False)
+            for block in manifest['blocks']
+        ]
+        if manifest['sidecar']:
+            parts.append(pd.read_pickle(os.path.join(self.store_dir, manifest['sidecar'])))
+        frame = parts[0] if len(parts) == 1 else pd.concat(parts, axis=1)
+        return frame[manifest['columns']]
@@ -1,79 +1,298 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+from data_cache import ParsedFrameCache, file_hash, hash_options
+from data_catalog import LazyDataCatalog, MODEL_DATA_SOURCES
+from data_schema import SourceSchema
+from initial_conditions import InitialConditionIndex
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Historical data sources for Bangladesh's digital transformation. Each can be configured in
+# data_sources_config as a CSV path or as a spec dict:
+#   {'path': 'data/btrc.csv', 'dtype': {'year': 'int16', ...}, 'usecols': [...], 'read_options': {...},
+#    'schema': {...}}
+# Explicit dtypes skip pandas' type inference and usecols skips parsing unused columns. An
+# optional 'schema' (see data_schema.SourceSchema) is validated once when the CSV is parsed.
+HISTORICAL_DATA_SOURCES = {
+    'btrc_stats': "BTRC connectivity and subscription statistics",
+    'bbs_ict_survey': "BBS ICT use and access survey",
+    'a2i_services': "a2i e-service delivery records",
+    'ict_division': "ICT Division programme indicators",
+    'bcc_reports': "Bangladesh Computer Council reports",
+    'basis_industry': "BASIS software and ITES industry data",
+    'bangladesh_bank_mfs': "Bangladesh Bank MFS and digital payment statistics",
+    'cert_incidents': "BGD e-GOV CIRT incident statistics",
+    'startup_bangladesh': "Startup Bangladesh portfolio data",
+    'dcab_commerce': "Digital commerce association data",
+    'bdix_traffic': "BDIX internet exchange traffic",
+    'bnda_architecture': "Bangladesh National Digital Architecture records",
+    'dept_ict': "Department of ICT training and infrastructure data",
+    'hitech_park': "Bangladesh Hi-Tech Park Authority data",
+    'open_data_portal': "Bangladesh Open Data Portal datasets",
+    'bitac_training': "BITAC technical training data",
+    'bcs_market': "Bangladesh Computer Samity market data",
+    'ispab_isp': "ISPAB internet service provider statistics",
+}
+
 class DigitalDataHandler:
     """Handle digital transformation data loading and preprocessing for Bangladesh simulation."""
-    def __init__(self, data_sources_config):
+    def __init__(self, data_sources_config, cache_dir=".cache/historical_data", max_workers=None, mmap_dir=None):
         """Initialize the data handler.
 
         Args:
             data_sources_config (dict): Configuration mapping data keys to file paths or API endpoints.
                                          Example: {'btrc_stats': 'data/btrc_connectivity.csv', ...}
+            cache_dir (str, optional): Directory caching parsed frames between runs. None disables caching.
+            max_workers (int, optional): Threads used to read sources concurrently. Defaults to one per
+                                         source (at most 32).
+            mmap_dir (str, optional): If set, historical data is exposed as a LazyDataCatalog of
+                                      memory-mapped panels stored here instead of eager DataFrames.
         """
-        print("Initializing DigitalDataHandler...")
+        logger.debug("Initializing DigitalDataHandler...")
         self.config = data_sources_config
+        self.cache = ParsedFrameCache(cache_dir) if cache_dir else None
+        self.max_workers = max_workers
+        self.mmap_dir = mmap_dir
         self.historical_data = {}
+        self.validation_reports = {} # source key -> ValidationReport summary dict
         self.realtime_data_connections = {}
-        print("DigitalDataHandler Initialized.")
+        self._initial_condition_index = None # Built on first get_initial_conditions call
+        logger.debug("DigitalDataHandler Initialized.")
 
     def load_historical_data(self):
-        """Load and preprocess historical digital data from configured Bangladesh sources."""
-        print("Loading historical data...")
-        # Placeholder: Loop through config, load files (e.g., CSVs using pandas)
-        # Perform necessary cleaning, validation, and structuring
-        # Example for one source:
-        # if 'btrc_stats' in self.config:
-        #     try:
-        #         path = self.config['btrc_stats']
-        #         df = pd.read_csv(path)
-        #         # Preprocessing steps...
-        #         self.historical_data['btrc'] = df
-        #         print(f"Loaded historical data from {path}")
-        #     except Exception as e:
-        #         print(f"Error loading data from {self.config['btrc_stats']}: {e}")
-
-        # --- Load data for all sources mentioned in the prompt ---
-        # BTRC, BBS, a2i, ICT Division, BCC, BASIS, Bangladesh Bank, CERT, Startup BD,
-        # DCAB, BDIX, BNDA, Dept ICT, Hi-Tech Park, Open Data Portal, BITAC, BCS, ISPAB...
-        print("Placeholder: Load routines for all data sources need implementation.")
-
-        # Store loaded data in self.historical_data dictionary
-        # Example: self.historical_data['bbs_ict_survey'] = loaded_bbs_data
-        print("Historical data loading process placeholder complete.")
+        """Load and preprocess historical digital data from configured Bangladesh sources.
+
+        All configured CSV sources are read concurrently on a thread pool, so a cold start
+        is bounded by the slowest file. Parsed frames are cached on disk, and a warm start
+        whose source files are unchanged skips CSV parsing entirely. Sources that fail to
+        load are logged and skipped.
+
+        With mmap_dir set, nothing is read here: historical_data becomes a LazyDataCatalog
+        that opens each source's memory-mapped panel on first access.
+
+        Returns:
+            dict or LazyDataCatalog: Mapping of source key to its DataFrame.
+        """
+        logger.info("Loading historical data...")
+        self._initial_condition_index = None
+        specs = self.historical_source_specs()
+        if not specs:
+            logger.warning("No historical data sources configured.")
+            return self.historical_data
+
+        if self.mmap_dir:
+            self.historical_data = LazyDataCatalog(specs, self._load_source, self.mmap_dir)
+            logger.info("Opened lazy catalog over %s historical data sources.", len(specs))
+            return self.historical_data
+
+        unknown = sorted(set(specs) - set(HISTORICAL_DATA_SOURCES))
+        if unknown:
+            logger.debug("Loading sources outside the known Bangladesh source list: %s", unknown)
+
+        max_workers = self.max_workers or min(32, len(specs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {key: executor.submit(self._load_source, key, spec) for key, spec in specs.items()}
+            for key, future in futures.items():
+                try:
+                    self.historical_data[key] = future.result()
+                except Exception as e:
+                    logger.error("Error loading data from %s: %s", specs[key]['path'], e)
+
+        logger.info("Loaded %s of %s historical data sources.", len(self.historical_data), len(specs))
         return self.historical_data
 
-    def integrate_realtime_data(self):
-        """Set up connections to real-time data sources in Bangladesh (if available)."""
-        print("Setting up real-time data connections...")
-        # Placeholder: Establish connections to APIs if specified in config
-        # Example:
-        # if 'live_traffic_api' in self.config:
-        #     # Code to connect to the API
-        #     self.realtime_data_connections['traffic'] = api_connection_object
-        #     print("Connected to real-time traffic API.")
-        print("Real-time data integration placeholder complete.")
+    def historical_source_specs(self):
+        """Return normalised spec dicts for every configured file-based source.
+
+        Entries whose value is an API endpoint (http/https URL or a spec with 'url') are
+        real-time sources and are skipped here.
+        """
+        specs = {}
+        for key, value in self.config.items():
+            spec = {'path': value} if isinstance(value, str) else dict(value)
+            path = spec.get('path')
+            if not path or path.startswith(('http://', 'https://')):
+                continue
+            spec.setdefault('dtype', None)
+            spec.setdefault('usecols', None)
+            spec.setdefault('read_options', {})
+            spec.setdefault('schema', None)
+            specs[key] = spec
+        return specs
+
+    def _load_source(self, key, spec):
+        """Read one source, going through the parsed-frame cache when enabled.
+
+        Sources with a schema are validated and typed right after parsing. The cached frame
+        is the validated one and the schema is part of the cache key, so warm starts skip
+        validation and a schema change invalidates the cache.
+        """
+        path = spec['path']
+        parse_hash = hash_options({k: spec[k] for k in ('dtype', 'usecols', 'read_options', 'schema')})
+        if self.cache is not None:
+            cached = self.cache.load(key, path, parse_hash)
+            if cached is not None:
+                logger.debug("Loaded %s from cache", key)
+                report = self.cache.metadata(key).get('validation')
+                if report is not None:
+                    self.validation_reports[key] = report
+                return cached
+
+        content_hash = file_hash(path) if self.cache is not None else None
+        df = pd.read_csv(path, dtype=spec['dtype'], usecols=spec['usecols'], **spec['read_options'])
+        logger.info("Loaded historical data from %s", path)
+        metadata = None
+        if spec['schema']:
+            df, report = SourceSchema(spec['schema']).validate(df, key)
+            self.validation_reports[key] = metadata = report.to_dict()
+        if self.cache is not None:
+            self.cache.store(key, path, parse_hash, df, content_hash=content_hash,
+                             metadata={'validation': metadata} if metadata is not None else None)
+        return df
+
+    def realtime_source_specs(self):
+        """Return normalised spec dicts for every configured real-time endpoint.
+
+        An endpoint is configured as an http(s) URL or as a spec dict:
+            {'url': 'https://...', 'source': 'btrc_stats', 'interval': 60, 'mode': 'poll',
+             'params': {...}, 'headers': {...}}
+        'source' is the historical source the records update (defaults to the config key).
+        'mode' is 'poll' (GET every `interval` seconds, a JSON list of records or
+        {'records': [...]}) or 'stream' (one long-lived GET yielding newline-delimited JSON
+        records).
+        """
+        specs = {}
+        for key, value in self.config.items():
+            spec = {'url': value} if isinstance(value, str) else dict(value)
+            url = spec.get('url') or spec.get('path')
+            if not url or not url.startswith(('http://', 'https://')):
+                continue
+            spec['url'] = url
+            spec.pop('path', None)
+            spec.setdefault('source', key)
+            spec.setdefault('interval', 60.0)
+            spec.setdefault('mode', 'poll')
+            spec.setdefault('params', None)
+            spec.setdefault('headers', None)
+            specs[key] = spec
+        return specs
+
+    def integrate_realtime_data(self, on_update=None, **feed_options):
+        """Set up connections to real-time data sources in Bangladesh (if available).
+
+        Builds a RealtimeFeed over the configured endpoints. Each batch of records it
+        receives is merged into historical_data (see apply_realtime_updates) and the
+        earliest affected year is passed to on_update, e.g. IncrementalResimulator.update.
+        Start the feed with `asyncio.run(feed.run())` or `await feed.poll_once()`.
+
+        Args:
+            on_update (callable, optional): Called with the earliest year touched by each batch.
+            **feed_options: Passed to RealtimeFeed (batch_size, batch_window, max_connections, ...).
+
+        Returns:
+            RealtimeFeed: The feed, also stored in realtime_data_connections['feed'].
+        """
+        from realtime_feed import RealtimeFeed
+
+        logger.info("Setting up real-time data connections...")
+        endpoints = self.realtime_source_specs()
+        if not endpoints:
+            logger.warning("No real-time data endpoints configured.")
+
+        def on_batch(batch):
+            earliest_year = self.apply_realtime_updates(batch)
+            if on_update is not None and earliest_year is not None:
+                on_update(earliest_year)
+
+        feed = RealtimeFeed(endpoints, on_batch, **feed_options)
+        self.realtime_data_connections['feed'] = feed
+        logger.info("Configured %s real-time endpoints.", len(endpoints))
+        return feed
+
+    def apply_realtime_updates(self, batch):
+        """Merge a batch of real-time records into the historical data store.
+
+        Records are upserted on 'year' (and 'indicator' for long panels): values present in
+        an update replace stored ones, other columns keep their stored values. Records that
+        match the stored data are ignored, so re-sent records do not trigger re-simulation.
+
+        Args:
+            batch (dict): Source key -> list of record dicts, each with a 'year'.
+
+        Returns:
+            int or None: The earliest year whose data changed, or None if nothing changed.
+        """
+        earliest_year = None
+        for source, records in batch.items():
+            updates = pd.DataFrame.from_records(records)
+            if 'year' not in updates.columns:
+                logger.warning("Dropping %s real-time records for %s without a 'year'", len(updates), source)
+                continue
+            existing = self.historical_data.get(source)
+            if existing is None:
+                merged = updates.sort_values('year', kind='stable').reset_index(drop=True)
+            else:
+                keys = [c for c in ('year', 'indicator') if c in existing.columns and c in updates.columns]
+                updates = updates.drop_duplicates(keys, keep='last').set_index(keys)
+                stored = existing.set_index(keys).reindex(index=updates.index, columns=updates.columns)
+                changed = (updates.notna() & (stored.astype(object) != updates.astype(object))).any(axis=1)
+                if not changed.any():
+                    logger.debug("Real-time records for %s match stored data", source)
+                    continue
+                updates = updates[changed.to_numpy()]
+                merged = (
+                    updates.combine_first(existing.set_index(keys))
+                    .reset_index()
+                    .sort_values('year', kind='stable')
+                    .reset_index(drop=True)
+                )
+                updates = updates.reset_index()
+                merged = merged[list(dict.fromkeys([*existing.columns, *updates.columns]))]
+
+            if isinstance(self.historical_data, LazyDataCatalog):
+                self.historical_data.replace(source, merged)
+            else:
+                self.historical_data[source] = merged
+            first = int(updates['year'].min())
+            earliest_year = first if earliest_year is None else min(earliest_year, first)
+            logger.debug("Applied %s real-time records to %s (from %s)", len(updates), source, first)
+
+        if earliest_year is not None:
+            self._initial_condition_index = None
+        return earliest_year
 
     def get_initial_conditions(self, year=2025):
-        """Extract initial conditions for the simulation start year from historical data."""
-        print(f"Extracting initial conditions for {year}...")
-        initial_conditions = {}
-        # Placeholder: Extract relevant data points for the start year
-        # from self.historical_data and structure them per model requirements.
-        # Example:
-        # if 'btrc' in self.historical_data:
-        #     latest_btrc = self.historical_data['btrc'][self.historical_data['btrc']['year'] <= year].iloc[-1]
-        #     initial_conditions['infrastructure'] = {
-        #         'initial_broadband_penetration': latest_btrc['broadband_penetration'],
-        #         # ... other infrastructure params
-        #     }
-        print("Initial condition extraction placeholder complete.")
-        # This would return a structured dict to initialize the main simulation config
-        return initial_conditions
+        """Extract initial conditions for the simulation start year from historical data.
+
+        Uses the latest observation at or before year for each indicator mapped in
+        INITIAL_CONDITION_FIELDS. The as-of index is built once per load, so repeated calls
+        for different start years (e.g. across calibration runs) are cheap.
+
+        Args:
+            year (int): Simulation start year.
+
+        Returns:
+            dict: model_params key -> {parameter: value}, ready to merge into the
+                  simulation's 'model_params' config.
+        """
+        if self._initial_condition_index is None:
+            self._initial_condition_index = InitialConditionIndex(self.historical_data)
+        return self._initial_condition_index.lookup(year)
 
     def get_config_for_model(self, model_name):
-        """Provide relevant historical data or configuration for a specific model."""
-        # Placeholder: Return data subset relevant to the requesting model
-        print(f"Providing data config for {model_name}...")
-        # Example:
-        # if model_name == 'DigitalInfrastructureModel' and 'btrc' in self.historical_data:
-        #    return self.historical_data['btrc']
-        return {} 
\ No newline at end of file
+        """Provide relevant historical data for a specific model.
+
+        Args:
+            model_name (str): Model class name, e.g. 'DigitalInfrastructureModel'.
+
+        Returns:
+            dict: Mapping of source key to DataFrame for the loaded sources listed in
+                  MODEL_DATA_SOURCES. The frames are shared, not copied: with a lazy
+                  catalog they are zero-copy views of the memory-mapped panels.
+        """
+        logger.debug("Providing data config for %s...", model_name)
+        frames = {key: self.historical_data.get(key) for key in MODEL_DATA_SOURCES.get(model_name, [])}
+        return {key: frame for key, frame in frames.items() if frame is not None}
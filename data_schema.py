@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# What to do with rows that break the schema: drop them, keep them (logging the report),
+# or raise a SchemaValidationError carrying the full report
+ON_ERROR_ACTIONS = ("drop", "warn", "raise")
+
+class SchemaValidationError(ValueError):
+    """Raised when a source fails validation with on_error='raise'. Holds the full report."""
+    def __init__(self, report):
+        super().__init__(report.summary())
+        self.report = report
+
+class ValidationReport:
+    """Every schema violation found in one source, collected in a single pass.
+
+    Row-level issues are kept as a DataFrame with one line per (row, column, rule) and
+    structural issues (missing columns, missing years) as a list of messages.
+    """
+    def __init__(self, source_key, n_rows, issues, structural, dropped_rows=0):
+        self.source_key = source_key
+        self.n_rows = n_rows
+        self.issues = issues # DataFrame: row, column, rule, value
+        self.structural = structural
+        self.dropped_rows = dropped_rows
+
+    def __bool__(self):
+        """True when the source passed validation without issues."""
+        return self.issues.empty and not self.structural
+
+    @property
+    def bad_rows(self):
+        """Sorted positions (in the parsed frame) of rows with at least one issue."""
+        return np.unique(self.issues['row'].to_numpy())
+
+    def counts(self):
+        """Number of issues per (column, rule)."""
+        if self.issues.empty:
+            return {}
+        return {f"{column}:{rule}": int(n) for (column, rule), n in self.issues.groupby(['column', 'rule']).size().items()}
+
+    def summary(self):
+        """One-line description of the report, suitable for logs and exceptions."""
+        if self:
+            return f"{self.source_key}: {self.n_rows} rows valid"
+        parts = [f"{self.source_key}: {len(self.bad_rows)} of {self.n_rows} rows invalid"]
+        if self.dropped_rows:
+            parts.append(f"{self.dropped_rows} dropped")
+        parts.extend(f"{name} x{n}" for name, n in self.counts().items())
+        parts.extend(self.structural)
+        return "; ".join(parts)
+
+    def to_dict(self):
+        """JSON-serialisable summary persisted alongside the cached frame."""
+        return {
+            'n_rows': self.n_rows,
+            'bad_rows': len(self.bad_rows),
+            'dropped_rows': self.dropped_rows,
+            'counts': self.counts(),
+            'structural': list(self.structural),
+        }
+
+class SourceSchema:
+    """Declarative schema for one historical data source, compiled once into vectorised checks.
+
+    A schema is declared as a plain dict so it can live in data_sources_config:
+        {
+            'columns': {
+                'year': {'dtype': 'int16', 'nullable': False},
+                'broadband_penetration': {'dtype': 'float64', 'min': 0, 'max': 100},
+                'indicator': {'dtype': 'category', 'allowed': ['a', 'b']},
+            },
+            'years': [2010, 2024],          # optional year coverage: every year in range present
+            'unique': ['year', 'indicator'], # optional key columns
+            'on_error': 'drop',              # see ON_ERROR_ACTIONS
+        }
+    Each rule is evaluated as one boolean mask over the whole column, so validation cost
+    is a handful of NumPy operations per column regardless of how many rows are bad.
+    """
+    def __init__(self, spec):
+        """Compile a schema declaration.
+
+        Args:
+            spec (dict): Schema declaration as described in the class docstring.
+        """
+        self.spec = spec
+        self.columns = spec.get('columns', {})
+        self.years = spec.get('years')
+        self.unique = list(spec.get('unique', []))
+        self.on_error = spec.get('on_error', 'drop')
+        if self.on_error not in ON_ERROR_ACTIONS:
+            raise ValueError(f"Unknown on_error '{self.on_error}'; expected one of {ON_ERROR_ACTIONS}")
+
+    def validate(self, frame, source_key):
+        """Check a parsed frame, coerce it to the declared dtypes and apply on_error.
+
+        Args:
+            frame (pd.DataFrame): The parsed source.
+            source_key (str): Name of the source, used in the report.
+
+        Returns:
+            tuple: (typed frame, ValidationReport).
+
+        Raises:
+            SchemaValidationError: If issues were found and on_error is 'raise'.
+        """
+        frame = frame.reset_index(drop=True)
+        issues, structural = [], []
+        missing = [name for name in self.columns if name not in frame.columns]
+        if missing:
+            structural.append(f"missing columns {missing}")
+
+        typed = {}
+        for name, rules in self.columns.items():
+            if name in missing:
+                continue
+            column, bad_type = self._coerce(frame[name], rules.get('dtype'))
+            typed[name] = column
+            self._collect(issues, name, 'dtype', bad_type, frame[name])
+            if not rules.get('nullable', True):
+                self._collect(issues, name, 'null', column.isna().to_numpy() & ~bad_type, frame[name])
+            if 'min' in rules:
+                self._collect(issues, name, 'min', (column < rules['min']).to_numpy(dtype=bool, na_value=False), frame[name])
+            if 'max' in rules:
+                self._collect(issues, name, 'max', (column > rules['max']).to_numpy(dtype=bool, na_value=False), frame[name])
+            if 'allowed' in rules:
+                outside = ~column.isin(rules['allowed']).to_numpy() & column.notna().to_numpy()
+                self._collect(issues, name, 'allowed', outside, frame[name])
+        if typed:
+            frame = frame.assign(**typed)
+
+        if self.unique and all(name in frame.columns for name in self.unique):
+            duplicated = frame.duplicated(self.unique, keep='first').to_numpy()
+            self._collect(issues, ",".join(self.unique), 'duplicate', duplicated, None)
+
+        if self.years is not None and 'year' in frame.columns:
+            first, last = self.years
+            years = frame['year'].to_numpy(dtype=float, na_value=np.nan)
+            outside = (years < first) | (years > last)
+            self._collect(issues, 'year', 'coverage', outside, frame['year'])
+            absent = np.setdiff1d(np.arange(first, last + 1), years[~np.isnan(years)])
+            if len(absent):
+                structural.append(f"missing years {absent.tolist()}")
+
+        issues = pd.concat(issues, ignore_index=True) if issues else pd.DataFrame(
+            {'row': pd.Series(dtype=np.int64), 'column': [], 'rule': [], 'value': []})
+        report = ValidationReport(source_key, len(frame), issues, structural)
+        if report:
+            return frame, report
+
+        if self.on_error == 'raise':
+            raise SchemaValidationError(report)
+        if self.on_error == 'drop':
+            keep = np.ones(len(frame), dtype=bool)
+            keep[report.bad_rows] = False
+            frame = frame[keep].reset_index(drop=True)
+            report.dropped_rows = int((~keep).sum())
+            frame = self._tidy_dtypes(frame)
+        logger.warning("Validation issues in %s", report.summary())
+        return frame, report
+
+    def _tidy_dtypes(self, frame):
+        """After dropping bad rows, cast nullable integer columns without gaps back to their
+        declared NumPy dtype and drop categories that only the bad rows used."""
+        tidied = {}
+        for name, rules in self.columns.items():
+            dtype = rules.get('dtype')
+            if dtype is None or name not in frame.columns:
+                continue
+            column = frame[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                tidied[name] = column.cat.remove_unused_categories()
+            elif (str(column.dtype) != str(dtype) and pd.api.types.pandas_dtype(dtype).kind in "iu"
+                    and not column.isna().any()):
+                tidied[name] = column.astype(dtype)
+        return frame.assign(**tidied) if tidied else frame
+
+    @staticmethod
+    def _coerce(column, dtype):
+        """Cast a column to dtype; returns (typed column, mask of values that could not be cast)."""
+        if dtype is None or str(column.dtype) == str(dtype):
+            return column, np.zeros(len(column), dtype=bool)
+        target = pd.api.types.pandas_dtype(dtype)
+        if target.kind in "iuf":
+            numeric = pd.to_numeric(column, errors='coerce')
+            bad = numeric.isna() & column.notna()
+            if target.kind in "iu":
+                bad = bad | (numeric.notna() & (numeric % 1 != 0))
+            bad = bad.to_numpy()
+            if target.kind in "iu" and (numeric.isna().any() or bad.any()):
+                # Integer columns with gaps use pandas' nullable integer dtype
+                return numeric.where(~bad).astype(str(target).capitalize()), bad
+            return numeric.astype(target), bad
+        return column.astype(target), np.zeros(len(column), dtype=bool)
+
+    @staticmethod
+    def _collect(issues, name, rule, mask, values):
+        rows = np.flatnonzero(mask)
+        if len(rows):
+            issues.append(pd.DataFrame({
+                'row': rows,
+                'column': name,
+                'rule': rule,
+                'value': values.to_numpy()[rows] if values is not None else None,
+            }))
@@ -1,17 +1,21 @@
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
 class DigitalEconomyModel:
     """Model digital business evolution and economic digitalization in Bangladesh."""
     def __init__(self, config):
         """Initialize digital economy parameters using Bangladesh commercial data."""
-        print("Initializing DigitalEconomyModel...")
+        logger.debug("Initializing DigitalEconomyModel...")
         self.config = config
         # Placeholder attributes based on prompt
         self.e_commerce = None # Marketplace, payments, logistics, trust, rural, cross-border, social, diversification
         self.financial_technology = None # MFS, digital banking, agent banking, gateways, credit, insurtech, blockchain, sandbox
         self.digital_entrepreneurship = None # Startups, funding, incubation, angels, VC, exits, talent, industry collaboration
         self.business_digitalization = None # SME adoption, corporate transformation, Industry 4.0, models, e-procurement, CRM, marketing, remote work
-        print("DigitalEconomyModel Initialized.")
+        logger.debug("DigitalEconomyModel Initialized.")
 
-    def simulate_economy_dynamics(self, year, infrastructure_state, skills_state, policy_state):
+    def simulate_economy_dynamics(self, year, infrastructure_state, skills_state, policy_state, dt=1.0):
         """Simulate one year of digital economy dynamics.
 
         Args:
@@ -19,16 +23,17 @@ class DigitalEconomyModel:
             infrastructure_state (dict): Current state from DigitalInfrastructureModel.
             skills_state (dict): Current state from DigitalSkillsModel.
             policy_state (dict): Current state from DigitalPolicyModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Digital Economy for year {year}...")
+        logger.debug("Simulating Digital Economy for year %s...", year)
         # Placeholder logic
         # - Model e-commerce growth based on infrastructure (logistics, payments) and trust (cybersecurity)
         # - Simulate fintech adoption influenced by policy (sandbox) and skills
         # - Project startup formation based on funding (innovation ecosystem) and talent (skills)
         # - Factor in infrastructure access for SME digitalization
-        print(f"Finished Simulating Digital Economy for year {year}.")
+        logger.debug("Finished Simulating Digital Economy for year %s.", year)
         return {"econ_metric": year * 10} # Example metric
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, infrastructure_state, skills_state, policy_state):
-        return self.simulate_economy_dynamics(year, infrastructure_state, skills_state, policy_state) 
\ No newline at end of file
+    def simulate_step(self, year, infrastructure_state, skills_state, policy_state, dt=1.0):
+        return self.simulate_economy_dynamics(year, infrastructure_state, skills_state, policy_state, dt) 
\ No newline at end of file
@@ -1,33 +1,38 @@
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
 class DigitalGovernmentModel:
     """Model e-governance implementation and digital public service delivery in Bangladesh."""
     def __init__(self, config):
         """Initialize digital government parameters using Bangladesh e-government data."""
-        print("Initializing DigitalGovernmentModel...")
+        logger.debug("Initializing DigitalGovernmentModel...")
         self.config = config
         # Placeholder attributes based on prompt
         self.service_digitization = None # e-Service portfolio, portal integration, redesign, paperless, channels, auth, analytics, inter-ministerial
         self.data_governance = None # Open data, sharing framework, master data, standardization, big data, privacy, real-time, archiving
         self.digital_public_infrastructure = None # Digital ID, payments, interoperability, API ecosystem, cloud-first, enterprise arch, cybersecurity framework, mobile-first
         self.citizen_engagement = None # Participation portal, social media, grievance, consultation, monitoring, co-creation, transparency, accessibility
-        print("DigitalGovernmentModel Initialized.")
+        logger.debug("DigitalGovernmentModel Initialized.")
 
-    def simulate_governance_dynamics(self, year, infrastructure_state, policy_state):
+    def simulate_governance_dynamics(self, year, infrastructure_state, policy_state, dt=1.0):
         """Simulate one year of digital governance dynamics.
 
         Args:
             year (int): The current simulation year.
             infrastructure_state (dict): Current state from DigitalInfrastructureModel.
             policy_state (dict): Current state from DigitalPolicyModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Digital Government for year {year}...")
+        logger.debug("Simulating Digital Government for year %s...", year)
         # Placeholder logic
         # - Model growth of e-services based on policy and infrastructure
         # - Simulate adoption of digital ID based on infrastructure_state['digital_public_infrastructure']
         # - Factor in policy impacts (e.g., data privacy laws)
         # - Update citizen engagement metrics based on service quality
-        print(f"Finished Simulating Digital Government for year {year}.")
+        logger.debug("Finished Simulating Digital Government for year %s.", year)
         return {"gov_metric": year + 5} # Example metric
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, infrastructure_state, policy_state):
-         return self.simulate_governance_dynamics(year, infrastructure_state, policy_state) 
\ No newline at end of file
+    def simulate_step(self, year, infrastructure_state, policy_state, dt=1.0):
+         return self.simulate_governance_dynamics(year, infrastructure_state, policy_state, dt) 
\ No newline at end of file
@@ -1,9 +1,24 @@
+import numpy as np
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named coefficients of the yearly dynamics. Override them through config['model_params']['inclusion'];
+# in an EnsembleSimulation a value may also be an array with one entry per replica.
+DEFAULT_PARAMS = {
+    'literacy_gain': 0.03,        # Literacy gained per unit of policy effectiveness x rural coverage
+    'female_usage_gain': 0.025,   # Female internet usage gained per unit of policy effectiveness
+    'rural_broadband_gain': 0.04, # Rural broadband penetration gained per unit of rural coverage
+}
+
 class DigitalInclusionModel:
     """Model equitable access and utilization of digital technologies in Bangladesh."""
     def __init__(self, config):
         """Initialize digital inclusion parameters using Bangladesh digital divide data."""
-        print("Initializing DigitalInclusionModel...")
+        logger.debug("Initializing DigitalInclusionModel...")
         self.config = config
+        self.params = {name: config.get(name, default) for name, default in DEFAULT_PARAMS.items()}
         # Placeholder attributes - Initialized with illustrative synthetic data for 2025
         self.access_equity = {"rural_broadband_penetration": 0.20, "urban_rural_infra_disparity_ratio": 2.5}
         self.affordability_measures = {"broadband_affordability_index": 0.08, "entry_smartphone_price_usd": 70} # Price relative to income, Avg Price
@@ -12,9 +27,9 @@ class DigitalInclusionModel:
         self.disability_access = {"assistive_tech_availability_score": 0.3} # Scale 0-1
         self.age_access = {"elderly_digital_literacy": 0.25} # Scale 0-1
 
-        print("DigitalInclusionModel Initialized.")
+        logger.debug("DigitalInclusionModel Initialized.")
 
-    def simulate_inclusion_dynamics(self, year, infrastructure_state, skills_state, policy_state):
+    def simulate_inclusion_dynamics(self, year, infrastructure_state, skills_state, policy_state, dt=1.0):
         """Simulate one year of digital inclusion dynamics.
 
         Args:
@@ -22,17 +37,19 @@ class DigitalInclusionModel:
             infrastructure_state (dict): Current state from DigitalInfrastructureModel.
             skills_state (dict): Current state from DigitalSkillsModel.
             policy_state (dict): Current state from DigitalPolicyModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Digital Inclusion for year {year}...")
+        logger.debug("Simulating Digital Inclusion for year %s...", year)
+        params = self.params
         # Placeholder logic: Improve literacy/access based on infra/skills/policy efforts
         infra_access_factor = infrastructure_state.get("rural_coverage", 0.2) # Example dependency
         policy_effectiveness = policy_state.get("inclusion_policy_score", 0.5) # Example dependency
 
-        self.capability_development["basic_digital_literacy_rate"] = min(1.0, self.capability_development["basic_digital_literacy_rate"] + 0.03 * policy_effectiveness * infra_access_factor)
-        self.capability_development["female_internet_usage_rate"] = min(1.0, self.capability_development["female_internet_usage_rate"] + 0.025 * policy_effectiveness)
-        self.access_equity["rural_broadband_penetration"] = min(1.0, self.access_equity["rural_broadband_penetration"] + 0.04 * infra_access_factor)
+        self.capability_development["basic_digital_literacy_rate"] = np.minimum(1.0, self.capability_development["basic_digital_literacy_rate"] + params["literacy_gain"] * policy_effectiveness * infra_access_factor * dt)
+        self.capability_development["female_internet_usage_rate"] = np.minimum(1.0, self.capability_development["female_internet_usage_rate"] + params["female_usage_gain"] * policy_effectiveness * dt)
+        self.access_equity["rural_broadband_penetration"] = np.minimum(1.0, self.access_equity["rural_broadband_penetration"] + params["rural_broadband_gain"] * infra_access_factor * dt)
 
-        print(f"Finished Simulating Digital Inclusion for year {year}.")
+        logger.debug("Finished Simulating Digital Inclusion for year %s.", year)
         return {
             "overall_literacy": self.capability_development["basic_digital_literacy_rate"],
             "gender_gap_index": self.capability_development["basic_digital_literacy_rate"] - self.capability_development["female_internet_usage_rate"],
@@ -40,5 +57,5 @@ class DigitalInclusionModel:
         }
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, infrastructure_state, skills_state, policy_state):
-        return self.simulate_inclusion_dynamics(year, infrastructure_state, skills_state, policy_state) 
\ No newline at end of file
+    def simulate_step(self, year, infrastructure_state, skills_state, policy_state, dt=1.0):
+        return self.simulate_inclusion_dynamics(year, infrastructure_state, skills_state, policy_state, dt) 
\ No newline at end of file
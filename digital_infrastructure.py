@@ -1,8 +1,12 @@
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
 class DigitalInfrastructureModel:
     """Model digital connectivity and physical infrastructure development in Bangladesh."""
     def __init__(self, config):
         """Initialize digital infrastructure parameters using Bangladesh connectivity data."""
-        print("Initializing DigitalInfrastructureModel...")
+        logger.debug("Initializing DigitalInfrastructureModel...")
         # Placeholder: Load relevant config for infrastructure
         self.config = config
         # Placeholder attributes based on the prompt
@@ -14,11 +18,11 @@ class DigitalInfrastructureModel:
         self.last_mile_solutions = None
         self.international_connectivity = None
         self.digital_public_infrastructure = None # Could overlap with Gov model, needs clarification
-        print("DigitalInfrastructureModel Initialized.")
+        logger.debug("DigitalInfrastructureModel Initialized.")
 
-    def simulate_step(self, year):
-        """Simulate one year of digital infrastructure development."""
-        print(f"Simulating Digital Infrastructure for year {year}...")
+    def simulate_step(self, year, dt=1.0):
+        """Simulate one year (or a `dt`-year part of it) of digital infrastructure development."""
+        logger.debug("Simulating Digital Infrastructure for year %s...", year)
         # Placeholder logic for simulating development across all sub-components
         # - Update broadband penetration based on investment scenarios
         # - Model 5G rollout progress
@@ -26,6 +30,6 @@ class DigitalInfrastructureModel:
         # - Project device penetration increases
         # - Factor in policy impacts from DigitalPolicyModel
         # - Consider dependencies (e.g., power availability affects data centers)
-        print(f"Finished Simulating Digital Infrastructure for year {year}.")
+        logger.debug("Finished Simulating Digital Infrastructure for year %s.", year)
         # Return state or metrics for this year
         return {"infra_metric": year * 1.1} # Example metric 
\ No newline at end of file
@@ -1,9 +1,26 @@
+import numpy as np
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named coefficients of the yearly dynamics. Override them through config['model_params']['policy'];
+# in an EnsembleSimulation a value may also be an array with one entry per replica.
+DEFAULT_PARAMS = {
+    'dpa_growth': 1.03,               # Yearly growth factor of data protection authority effectiveness
+    'dpa_incentive_weight': 0.02,     # DPA effectiveness gained per unit of investment incentive lever
+    'alignment_base_gain': 0.02,      # Yearly gain in regional data flow alignment
+    'alignment_sandbox_weight': 0.03, # Extra alignment gain per unit of regulatory sandbox lever
+    'startup_incentive_weight': 2,    # Weight of the investment incentive lever in the startup policy score
+}
+
 class DigitalPolicyModel:
     """Model policy frameworks and regulatory systems for Bangladesh digital economy."""
     def __init__(self, config):
         """Initialize digital policy parameters using Bangladesh digital governance data."""
-        print("Initializing DigitalPolicyModel...")
+        logger.debug("Initializing DigitalPolicyModel...")
         self.config = config
+        self.params = {name: config.get(name, default) for name, default in DEFAULT_PARAMS.items()}
         # Placeholder attributes - Initialized with illustrative synthetic data for 2025
         # Scores generally 0-1 indicating maturity/effectiveness
         self.legal_frameworks = {"data_protection_law_status": 0.6, "cybercrime_law_effectiveness": 0.5, "e_transaction_law_maturity": 0.8}
@@ -19,31 +36,47 @@ class DigitalPolicyModel:
         }
         self.current_scenario = "baseline" # Default
 
-        print("DigitalPolicyModel Initialized.")
+        logger.debug("DigitalPolicyModel Initialized.")
 
     def set_scenario(self, scenario_name):
         if scenario_name in self.scenario_policy_levers:
             self.current_scenario = scenario_name
-            print(f"DigitalPolicyModel scenario set to: {scenario_name}")
+            logger.debug("DigitalPolicyModel scenario set to: %s", scenario_name)
         else:
-            print(f"Warning: Scenario '{scenario_name}' not found in policy levers.")
+            logger.warning("Scenario '%s' not found in policy levers.", scenario_name)
+
+    def set_policy_levers(self, scenario_name, levers):
+        """Register custom policy levers as a scenario and make it the current one.
+
+        Args:
+            scenario_name (str): Name for the new scenario.
+            levers (dict): Lever values; levers not given keep the current scenario's values.
+        """
+        merged = dict(self.scenario_policy_levers[self.current_scenario])
+        merged.update(levers)
+        # Rebind instead of mutating: the lever table may be shared with forked branches
+        self.scenario_policy_levers = {**self.scenario_policy_levers, scenario_name: merged}
+        self.current_scenario = scenario_name
+        logger.debug("DigitalPolicyModel scenario set to custom levers: %s", scenario_name)
 
-    def simulate_policy_dynamics(self, year):
+    def simulate_policy_dynamics(self, year, dt=1.0):
         """Simulate one year of policy evolution and impact dynamics.
 
         Args:
             year (int): The current simulation year.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Digital Policy for year {year} (Scenario: {self.current_scenario})...")
+        logger.debug("Simulating Digital Policy for year %s (Scenario: %s)...", year, self.current_scenario)
+        params = self.params
         # Placeholder logic: Policy effectiveness might change slowly, or based on specific events/scenario levers
         levers = self.scenario_policy_levers[self.current_scenario]
 
         # Example: Data protection effectiveness slowly increases
-        self.regulatory_institutions["dpa_effectiveness"] = min(1.0, self.regulatory_institutions["dpa_effectiveness"] * 1.03 + levers["investment_incentive"] * 0.02)
+        self.regulatory_institutions["dpa_effectiveness"] = np.minimum(1.0, self.regulatory_institutions["dpa_effectiveness"] * params["dpa_growth"] ** dt + levers["investment_incentive"] * params["dpa_incentive_weight"] * dt)
         # Example: International alignment improves based on effort (represented by lever)
-        self.international_harmonization["regional_data_flow_alignment"] = min(1.0, self.international_harmonization["regional_data_flow_alignment"] + 0.02 + levers["regulatory_sandbox_scope"]*0.03)
+        self.international_harmonization["regional_data_flow_alignment"] = np.minimum(1.0, self.international_harmonization["regional_data_flow_alignment"] + (params["alignment_base_gain"] + levers["regulatory_sandbox_scope"] * params["alignment_sandbox_weight"]) * dt)
 
-        print(f"Finished Simulating Digital Policy for year {year}.")
+        logger.debug("Finished Simulating Digital Policy for year %s.", year)
 
         # Return policy state potentially influencing other models
         return {
@@ -51,9 +84,9 @@ class DigitalPolicyModel:
             "data_protection_score": self.legal_frameworks["data_protection_law_status"],
             "investment_incentive": levers["investment_incentive"],
             "sandbox_scope": levers["regulatory_sandbox_scope"],
-            "startup_policy_score": levers.get("investment_incentive", 0.1) * 2 + levers.get("regulatory_sandbox_scope", 0.5) # Composite score example
+            "startup_policy_score": levers.get("investment_incentive", 0.1) * params["startup_incentive_weight"] + levers.get("regulatory_sandbox_scope", 0.5) # Composite score example
         }
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year):
-        return self.simulate_policy_dynamics(year) 
\ No newline at end of file
+    def simulate_step(self, year, dt=1.0):
+        return self.simulate_policy_dynamics(year, dt) 
\ No newline at end of file
@@ -1,17 +1,21 @@
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
 class DigitalSkillsModel:
     """Model digital literacy, capability development and tech talent in Bangladesh."""
     def __init__(self, config):
         """Initialize digital skills parameters using Bangladesh digital skills data."""
-        print("Initializing DigitalSkillsModel...")
+        logger.debug("Initializing DigitalSkillsModel...")
         self.config = config
         # Placeholder attributes based on prompt
         self.digital_literacy = None # Basic skills, education integration, learning infra, training channels, adult literacy, certification, gender divide, rural literacy
         self.ict_professional_dev = None # Software talent, specialization, graduate quality, certification, training quality, industry-academia, train-the-trainer, subspecialty
         self.digital_leadership = None # Transformation mgmt, CDO function, strategy skill, governance competency, innovation mgmt, ethics, cybersecurity leadership, collaboration
         self.workforce_transition = None # Automation mitigation, reskilling, emerging roles, gig economy, remote competency, entrepreneurship training, Industry 4.0 prep, inclusion
-        print("DigitalSkillsModel Initialized.")
+        logger.debug("DigitalSkillsModel Initialized.")
 
-    def simulate_skills_dynamics(self, year, economy_state, inclusion_state, society_state):
+    def simulate_skills_dynamics(self, year, economy_state, inclusion_state, society_state, dt=1.0):
         """Simulate one year of digital skills and human capital dynamics.
 
         Args:
@@ -19,16 +23,17 @@ class DigitalSkillsModel:
             economy_state (dict): Current state from DigitalEconomyModel (demand for skills).
             inclusion_state (dict): Current state from DigitalInclusionModel (access to training).
             society_state (dict): Current state from DigitalSocietyModel (adoption behavior).
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Digital Skills for year {year}...")
+        logger.debug("Simulating Digital Skills for year %s...", year)
         # Placeholder logic
         # - Model literacy levels based on education policy (policy model) and inclusion efforts
         # - Project ICT professional pool growth based on demand (economy model) and training capacity
         # - Simulate workforce transition needs based on automation trends (economy/sectoral models)
         # - Factor in societal attitudes towards digital learning (society model)
-        print(f"Finished Simulating Digital Skills for year {year}.")
+        logger.debug("Finished Simulating Digital Skills for year %s.", year)
         return {"skills_metric": year / 2} # Example metric
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, economy_state, inclusion_state, society_state):
-        return self.simulate_skills_dynamics(year, economy_state, inclusion_state, society_state) 
\ No newline at end of file
+    def simulate_step(self, year, economy_state, inclusion_state, society_state, dt=1.0):
+        return self.simulate_skills_dynamics(year, economy_state, inclusion_state, society_state, dt) 
\ No newline at end of file
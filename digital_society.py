@@ -1,9 +1,25 @@
+import numpy as np
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named coefficients of the yearly dynamics. Override them through config['model_params']['society'];
+# in an EnsembleSimulation a value may also be an array with one entry per replica.
+DEFAULT_PARAMS = {
+    'adoption_rate': 0.05,                 # Logistic growth rate of internet penetration
+    'trust_growth': 1.01,                  # Base yearly growth factor of digital service trust
+    'trust_sensitivity': 0.05,             # Extra trust growth per unit of cybersecurity trust level
+    'cyberbullying_trust_reduction': 0.02, # Yearly reduction in reported cyberbullying per unit of trust
+}
+
 class DigitalSocietyModel:
     """Model social adoption, cultural adaptation and behavioral change in digital Bangladesh."""
     def __init__(self, config):
         """Initialize digital society parameters using Bangladesh digital society data."""
-        print("Initializing DigitalSocietyModel...")
+        logger.debug("Initializing DigitalSocietyModel...")
         self.config = config
+        self.params = {name: config.get(name, default) for name, default in DEFAULT_PARAMS.items()}
         # Placeholder attributes - Initialized with illustrative synthetic data for 2025
         self.adoption_patterns = {"internet_penetration_rate": 0.60, "smartphone_adoption_rate": 0.55, "social_media_usage_rate": 0.50}
         self.behavioral_adaptation = {"avg_daily_screen_time_hrs": 3.5, "digital_service_trust_score": 0.5} # Scale 0-1
@@ -11,9 +27,9 @@ class DigitalSocietyModel:
         self.social_impact = {"digital_political_participation_rate": 0.15, "reported_cyberbullying_cases_per_100k": 10}
         self.digital_ethics = {"privacy_awareness_score": 0.4, "misinformation_belief_rate": 0.35} # Scale 0-1
 
-        print("DigitalSocietyModel Initialized.")
+        logger.debug("DigitalSocietyModel Initialized.")
 
-    def simulate_society_dynamics(self, year, infrastructure_state, inclusion_state, cybersecurity_state):
+    def simulate_society_dynamics(self, year, infrastructure_state, inclusion_state, cybersecurity_state, dt=1.0):
         """Simulate one year of sociocultural transformation dynamics.
 
         Args:
@@ -21,8 +37,10 @@ class DigitalSocietyModel:
             infrastructure_state (dict): Current state from DigitalInfrastructureModel.
             inclusion_state (dict): Current state from DigitalInclusionModel.
             cybersecurity_state (dict): Current state from CybersecurityModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Digital Society for year {year}...")
+        logger.debug("Simulating Digital Society for year %s...", year)
+        params = self.params
         # Placeholder logic: Adoption increases with infrastructure/inclusion, trust influenced by cybersecurity
         infra_access = infrastructure_state.get("overall_penetration", 0.6)
         inclusion_factor = inclusion_state.get("overall_literacy", 0.45)
@@ -30,13 +48,13 @@ class DigitalSocietyModel:
 
         # Simulate adoption growth (using a simple logistic growth factor approximation)
         growth_potential = (1 - self.adoption_patterns["internet_penetration_rate"]) # Room to grow
-        self.adoption_patterns["internet_penetration_rate"] += 0.05 * growth_potential * infra_access * inclusion_factor
-        self.adoption_patterns["internet_penetration_rate"] = min(1.0, self.adoption_patterns["internet_penetration_rate"])
+        self.adoption_patterns["internet_penetration_rate"] += params["adoption_rate"] * growth_potential * infra_access * inclusion_factor * dt
+        self.adoption_patterns["internet_penetration_rate"] = np.minimum(1.0, self.adoption_patterns["internet_penetration_rate"])
 
-        self.behavioral_adaptation["digital_service_trust_score"] = min(1.0, self.behavioral_adaptation["digital_service_trust_score"] * (1.01 + 0.05 * trust_factor))
-        self.social_impact["reported_cyberbullying_cases_per_100k"] *= (1.0 - 0.02 * trust_factor) # Higher trust slightly reduces reporting?
+        self.behavioral_adaptation["digital_service_trust_score"] = np.minimum(1.0, self.behavioral_adaptation["digital_service_trust_score"] * (params["trust_growth"] + params["trust_sensitivity"] * trust_factor) ** dt)
+        self.social_impact["reported_cyberbullying_cases_per_100k"] *= (1.0 - params["cyberbullying_trust_reduction"] * trust_factor) ** dt # Higher trust slightly reduces reporting?
 
-        print(f"Finished Simulating Digital Society for year {year}.")
+        logger.debug("Finished Simulating Digital Society for year %s.", year)
         return {
             "adoption_rate": self.adoption_patterns["internet_penetration_rate"],
             "trust_score": self.behavioral_adaptation["digital_service_trust_score"],
@@ -44,5 +62,5 @@ class DigitalSocietyModel:
         }
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, infrastructure_state, inclusion_state, cybersecurity_state):
-        return self.simulate_society_dynamics(year, infrastructure_state, inclusion_state, cybersecurity_state) 
\ No newline at end of file
+    def simulate_step(self, year, infrastructure_state, inclusion_state, cybersecurity_state, dt=1.0):
+        return self.simulate_society_dynamics(year, infrastructure_state, inclusion_state, cybersecurity_state, dt) 
\ No newline at end of file
@@ -1,18 +1,36 @@
+import numpy as np
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named coefficients of the yearly dynamics. Override them through config['model_params']['emerging'];
+# in an EnsembleSimulation a value may also be an array with one entry per replica.
+DEFAULT_PARAMS = {
+    'ai_adoption_growth': 1.1,         # Base yearly growth factor of business AI adoption
+    'ai_skills_sensitivity': 0.2,      # Extra AI adoption growth per unit of (AI talent / 10,000)
+    'iot_growth': 1.2,                 # Base yearly growth factor of IoT devices
+    'iot_innovation_sensitivity': 0.1, # Extra IoT growth per unit of R&D investment
+    'blockchain_base_pilots': 2,       # New blockchain pilots per year
+    'blockchain_innovation_pilots': 5, # Extra new pilots per unit of R&D investment
+}
+
 class EmergingTechnologyModel:
     """Model cutting-edge technology integration and innovation in Bangladesh."""
     def __init__(self, config):
         """Initialize emerging technology parameters using Bangladesh innovation data."""
-        print("Initializing EmergingTechnologyModel...")
+        logger.debug("Initializing EmergingTechnologyModel...")
         self.config = config
+        self.params = {name: config.get(name, default) for name, default in DEFAULT_PARAMS.items()}
         # Placeholder attributes - Initialized with illustrative synthetic data for 2025
         self.artificial_intelligence = {"ai_adoption_rate_business": 0.05, "bengali_nlp_maturity": 0.2, "ai_talent_pool": 1000}
         self.blockchain = {"blockchain_pilots_count": 15, "supply_chain_traceability_adoption": 0.02}
         self.iot_applications = {"iot_devices_millions": 5, "smart_city_projects": 3, "agri_iot_adoption": 0.03}
         self.advanced_computing = {"cloud_adoption_sme": 0.15, "hpc_access_score": 0.2} # Scale 0-1
 
-        print("EmergingTechnologyModel Initialized.")
+        logger.debug("EmergingTechnologyModel Initialized.")
 
-    def simulate_technology_dynamics(self, year, infrastructure_state, skills_state, innovation_state):
+    def simulate_technology_dynamics(self, year, infrastructure_state, skills_state, innovation_state, dt=1.0):
         """Simulate one year of emerging technology adoption dynamics.
 
         Args:
@@ -20,17 +38,19 @@ class EmergingTechnologyModel:
             infrastructure_state (dict): Current state from DigitalInfrastructureModel.
             skills_state (dict): Current state from DigitalSkillsModel.
             innovation_state (dict): Current state from InnovationEcosystemModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Emerging Technology for year {year}...")
+        logger.debug("Simulating Emerging Technology for year %s...", year)
+        params = self.params
         # Placeholder logic: Increase adoption based on skills, infra, and innovation support
         skills_factor = skills_state.get("ai_talent", 1000) / 10000 # Example dependency scale
         innovation_factor = innovation_state.get("rd_investment_norm", 0.1) # Example dependency
 
-        self.artificial_intelligence["ai_adoption_rate_business"] = min(1.0, self.artificial_intelligence["ai_adoption_rate_business"] * (1.1 + 0.2 * skills_factor))
-        self.iot_applications["iot_devices_millions"] *= (1.2 + 0.1 * innovation_factor)
-        self.blockchain["blockchain_pilots_count"] += int(2 + 5 * innovation_factor) # Add 2-7 new pilots a year
+        self.artificial_intelligence["ai_adoption_rate_business"] = np.minimum(1.0, self.artificial_intelligence["ai_adoption_rate_business"] * (params["ai_adoption_growth"] + params["ai_skills_sensitivity"] * skills_factor) ** dt)
+        self.iot_applications["iot_devices_millions"] *= (params["iot_growth"] + params["iot_innovation_sensitivity"] * innovation_factor) ** dt
+        self.blockchain["blockchain_pilots_count"] += np.floor(params["blockchain_base_pilots"] + params["blockchain_innovation_pilots"] * innovation_factor) * dt # 2-7 new pilots a year by default
 
-        print(f"Finished Simulating Emerging Technology for year {year}.")
+        logger.debug("Finished Simulating Emerging Technology for year %s.", year)
         return {
             "ai_adoption": self.artificial_intelligence["ai_adoption_rate_business"],
             "iot_density": self.iot_applications["iot_devices_millions"],
@@ -38,5 +58,5 @@ class EmergingTechnologyModel:
         }
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, infrastructure_state, skills_state, innovation_state):
-        return self.simulate_technology_dynamics(year, infrastructure_state, skills_state, innovation_state) 
\ No newline at end of file
+    def simulate_step(self, year, infrastructure_state, skills_state, innovation_state, dt=1.0):
+        return self.simulate_technology_dynamics(year, infrastructure_state, skills_state, innovation_state, dt) 
\ No newline at end of file
@@ -0,0 +1,246 @@
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from sensitivity import evaluate_parameter_sets, parameter_defaults
+from simulation import BangladeshDigitalTransformationSimulation
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# What-if inputs of the default emulator and the ranges it is trained on. Paths follow
+# sensitivity.parameter_overrides: "levers.<lever>", "<key>.<name>" or initial state paths.
+EMULATOR_INPUTS = {
+    'levers.investment_incentive': (0.0, 0.5),
+    'levers.regulatory_sandbox_scope': (0.0, 1.0),
+    'society.adoption_rate': (0.02, 0.1),
+    'innovation.startup_growth': (1.0, 1.1),
+    'emerging.ai_adoption_growth': (1.0, 1.2),
+    'integration.it_exports_growth': (1.0, 1.15),
+}
+
+EMULATOR_OUTPUTS = [
+    'composite_digital_maturity', 'integration_it_exports', 'innovation_startup_count',
+    'society_adoption_rate', 'emerging_ai_adoption',
+]
+
+SURROGATE_METHODS = ("gp", "gbt")
+
+def latin_hypercube(n, d, seed=None):
+    """Latin hypercube sample of n points in [0, 1]^d: every axis has one point per 1/n stratum."""
+    rng = np.random.default_rng(seed)
+    strata = rng.permuted(np.tile(np.arange(n), (d, 1)), axis=1).T
+    return (strata + rng.random((n, d))) / n
+
+class ScenarioEmulator:
+    """Fast surrogate of the final-year outputs of a simulation run.
+
+    The emulator is trained on simulation runs at Latin-hypercube samples of its inputs
+    (evaluated as batched ensembles) and validated on a held-out share of them. With the
+    Gaussian-process method, each output has its own scikit-learn GP with an anisotropic
+    RBF kernel, and predictions are served by a NumPy fast path (the kernel vector against
+    the training inputs times the fitted weights) that takes microseconds. Queries outside
+    the training envelope (the input box) fall back to running the full simulation.
+    """
+    def __init__(self, config, inputs=None, outputs=None, scenario_name="baseline", year=None, method="gp",
+                 batch_size=20000, max_workers=None):
+        """Set up the emulator.
+
+        Args:
+            config (dict): Base simulation configuration.
+            inputs (dict, optional): Input path -> (low, high) training range. Defaults to EMULATOR_INPUTS.
+            outputs (list, optional): Emulated metrics. Defaults to EMULATOR_OUTPUTS.
+            scenario_name (str): Policy scenario whose levers unspecified inputs keep.
+            year (int, optional): Year whose outputs are emulated. Defaults to config end_year.
+            method (str): "gp" (Gaussian process, NumPy fast path) or "gbt" (gradient-boosted trees).
+            batch_size (int): Maximum runs per ensemble batch when simulating.
+            max_workers (int, optional): Worker processes for training runs.
+        """
+        if method not in SURROGATE_METHODS:
+            raise ValueError(f"Unknown surrogate method '{method}'; expected one of {SURROGATE_METHODS}")
+        inputs = EMULATOR_INPUTS if inputs is None else inputs
+        self.config = config
+        self.inputs = list(inputs)
+        self.bounds = np.array([inputs[path] for path in self.inputs], dtype=float)
+        if (self.bounds[:, 1] <= self.bounds[:, 0]).any():
+            raise ValueError("Every emulator input needs a range with low < high")
+        self.outputs = list(EMULATOR_OUTPUTS if outputs is None else outputs)
+        self.scenario_name = scenario_name
+        start_year = config.get('start_year', 2025)
+        self.year = config.get('end_year', 2035) if year is None else year
+        self.years = self.year - start_year + 1
+        self.method = method
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.defaults = self._input_defaults()
+        self.models = None
+        self.validation = None
+        self.fallbacks = 0
+
+    def _input_defaults(self):
+        """Values the simulation uses for each input when it is not set."""
+        sim = BangladeshDigitalTransformationSimulation(self.config, self.scenario_name)
+        model_params = self.config.get('model_params', {})
+        defaults = {}
+        for path in self.inputs:
+            if path.startswith("levers."):
+                levers = sim.digital_policy.scenario_policy_levers[sim.digital_policy.current_scenario]
+                defaults[path] = levers[path.split(".", 1)[1]]
+            elif path.count(".") == 2:
+                model_attr, dict_name, key = path.split(".")
+                defaults[path] = getattr(getattr(sim, model_attr), dict_name)[key]
+            else:
+                key, name = path.split(".", 1)
+                defaults[path] = model_params.get(key, {}).get(name, parameter_defaults([path])[path])
+        return defaults
+
+    def simulate(self, values):
+        """Run the full simulation for input rows of shape (n, n_inputs); returns (n, n_outputs)."""
+        return evaluate_parameter_sets(self.config, self.scenario_name, self.inputs, np.atleast_2d(values),
+                                       self.outputs, self.years, self.batch_size, self.max_workers)
+
+    def fit(self, n_samples=1000, validation_fraction=0.2, seed=None):
+        """Sample the inputs, simulate, train one surrogate per output and validate it.
+
+        Args:
+            n_samples (int): Total simulation runs (training plus validation).
+            validation_fraction (float): Share of runs held out for validation.
+            seed (int, optional): Seed for sampling and model fitting.
+
+        Returns:
+            ScenarioEmulator: self. Validation errors are in self.validation.
+        """
+        unit = latin_hypercube(n_samples, len(self.inputs), seed)
+        y = self.simulate(self._scale(unit))
+        finite = np.isfinite(y).all(axis=1)
+        if not finite.all():
+            logger.warning("Dropping %s of %s training runs with non-finite outputs", (~finite).sum(), n_samples)
+            unit, y = unit[finite], y[finite]
+
+        n_validation = int(round(len(unit) * validation_fraction))
+        order = np.random.default_rng(seed).permutation(len(unit))
+        train, test = order[n_validation:], order[:n_validation]
+        self._train(unit[train], y[train], seed)
+        if n_validation:
+            self.validation = self._validate(unit[test], y[test])
+            logger.info("Emulator validation on %s held-out runs:\n%s", n_validation, self.validation.to_string())
+        return self
+
+    def _train(self, unit, y, seed):
+        if self.method == "gbt":
+            from sklearn.ensemble import HistGradientBoostingRegressor
+
+            self.models = [HistGradientBoostingRegressor(max_iter=500, random_state=seed).fit(unit, y[:, k])
+                           for k in range(len(self.outputs))]
+            return
+
+        from sklearn.exceptions import ConvergenceWarning
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import RBF, ConstantKernel, WhiteKernel
+
+        d = unit.shape[1]
+        self.models = []
+        amplitudes, inverse_scales, alphas, means, stds = [], [], [], [], []
+        for k in range(len(self.outputs)):
+            # Wide bounds: inputs an output ignores drive their length scales to the upper end
+            kernel = (ConstantKernel(1.0, (1e-4, 1e4)) * RBF(np.full(d, 0.5), (1e-2, 1e5))
+                      + WhiteKernel(1e-6, (1e-14, 1e-1)))
+            gp = GaussianProcessRegressor(kernel, normalize_y=True, random_state=seed)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", ConvergenceWarning)
+                gp.fit(unit, y[:, k])
+            self.models.append(gp)
+            amplitudes.append(gp.kernel_.k1.k1.constant_value)
+            inverse_scales.append(1.0 / np.asarray(gp.kernel_.k1.k2.length_scale, dtype=float) ** 2)
+            alphas.append(gp.alpha_.ravel())
+            means.append(np.ravel(gp._y_train_mean)[0])
+            stds.append(np.ravel(gp._y_train_std)[0])
+        # Fast-path arrays: every output shares the training inputs
+        self._x_train = np.ascontiguousarray(unit)
+        self._inverse_scales = np.array(inverse_scales).T # (d, outputs)
+        self._weighted_alpha = np.array(alphas).T * np.array(amplitudes) * np.array(stds) # (n, outputs)
+        self._means = np.array(means)
+
+    def _validate(self, unit, y):
+        predicted = self._predict_unit(unit)
+        errors = predicted - y
+        total = ((y - y.mean(axis=0)) ** 2).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r2 = 1 - (errors ** 2).sum(axis=0) / total
+            relative = np.sqrt((errors ** 2).mean(axis=0)) / np.abs(y).mean(axis=0)
+        return pd.DataFrame({
+            'rmse': np.sqrt((errors ** 2).mean(axis=0)),
+            'relative_rmse': relative,
+            'mae': np.abs(errors).mean(axis=0),
+            'max_abs_error': np.abs(errors).max(axis=0),
+            'r2': r2,
+        }, index=pd.Index(self.outputs, name='output'))
+
+    def _scale(self, unit):
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return low + unit * (high - low)
+
+    def _unit(self, values):
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return (values - low) / (high - low)
+
+    def _predict_unit(self, unit):
+        unit = np.atleast_2d(unit)
+        if self.method == "gbt":
+            return np.stack([model.predict(unit) for model in self.models], axis=1)
+        # k(x, X) = c * exp(-0.5 * sum_j (x_j - X_j)^2 / l_j^2), per output
+        diff = unit[:, np.newaxis, :] - self._x_train[np.newaxis] # (m, n, d)
+        distances = (diff * diff) @ self._inverse_scales # (m, n, outputs)
+        return np.einsum('mnk,nk->mk', np.exp(-0.5 * distances), self._weighted_alpha) + self._means
+
+    def contains(self, values):
+        """True for input rows inside the training envelope."""
+        values = np.atleast_2d(values)
+        return ((values >= self.bounds[:, 0]) & (values <= self.bounds[:, 1])).all(axis=1)
+
+    def predict(self, values):
+        """Surrogate predictions for input rows of shape (m, n_inputs), without any envelope check.
+
+        Returns:
+            np.ndarray: Shape (m, n_outputs).
+        """
+        if self.models is None:
+            raise RuntimeError("The emulator has not been fitted")
+        return self._predict_unit(self._unit(np.atleast_2d(np.asarray(values, dtype=float))))
+
+    def query(self, inputs=None):
+        """Answer a what-if query.
+
+        Args:
+            inputs (dict, optional): Input path -> value; inputs not given keep the simulation's
+                                     own value (see self.defaults).
+
+        Returns:
+            dict: Output metric -> value, plus 'source' ("surrogate", or "simulation" when the
+                  query lies outside the training envelope).
+        """
+        inputs = inputs or {}
+        unknown = sorted(set(inputs) - set(self.inputs))
+        if unknown:
+            raise ValueError(f"Unknown emulator input(s) {unknown}; expected some of {self.inputs}")
+        values = np.array([[inputs.get(path, self.defaults[path]) for path in self.inputs]], dtype=float)
+        if self.models is not None and self.contains(values)[0]:
+            predicted, source = self.predict(values)[0], "surrogate"
+        else:
+            self.fallbacks += 1
+            logger.debug("Query outside the emulator's training envelope; running the full simulation")
+            predicted, source = self.simulate(values)[0], "simulation"
+        return {**dict(zip(self.outputs, predicted.tolist())), 'source': source}
+
+    def save(self, path):
+        """Pickle the fitted emulator to path (load only trusted files)."""
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        """Load an emulator written by save."""
+        with open(path, 'rb') as f:
+            return pickle.load(f)
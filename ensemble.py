@@ -0,0 +1,138 @@
+import numpy as np
+
+from simulation import BangladeshDigitalTransformationSimulation, MODEL_SCHEDULE
+from model_state import iter_state_dicts
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+class EnsembleSimulation(BangladeshDigitalTransformationSimulation):
+    """Run a batch of N simulation replicas at once on NumPy state arrays of shape (N,).
+
+    Every numeric entry in the models' state dicts is broadcast to an array with one
+    element per replica, so each simulate_step call advances the whole batch. Replicas
+    differ through per-replica initial values (see `replica_overrides`).
+    """
+    def __init__(self, config, scenario_name="baseline", replicas=1000, replica_overrides=None, replica_offset=0):
+        """Initialize the ensemble.
+
+        Args:
+            config (dict): Configuration dictionary, as for BangladeshDigitalTransformationSimulation.
+            scenario_name (str): The name of the policy scenario to run.
+            replicas (int): Number of replicas N simulated in each batch step.
+            replica_overrides (dict, optional): Initial values keyed by
+                "model_attribute.state_dict.key", e.g.
+                "digital_society.adoption_patterns.internet_penetration_rate".
+                Values are scalars or arrays of shape (N,). Values in the config's
+                'initial_state' may be arrays of shape (N,) too.
+            replica_offset (int): Global index of the first replica. In stochastic mode (config
+                key 'stochastic') replica i draws the shocks of global replica replica_offset + i,
+                so a large run split into batches reproduces the unsplit run exactly.
+        """
+        super().__init__(config, scenario_name)
+        self.replicas = replicas
+        self.replica_offset = replica_offset
+        self.ensemble_results = {} # metric name -> array of shape (years, N)
+
+        for _, model_attr, _ in MODEL_SCHEDULE:
+            for _, state in iter_state_dicts(getattr(self, model_attr)):
+                for key, value in state.items():
+                    state[key] = np.full(replicas, value, dtype=float)
+
+        for path, values in (replica_overrides or {}).items():
+            self.set_replica_values(path, values)
+
+        logger.debug("Ensemble prepared with %s replicas.", replicas)
+
+    def set_replica_values(self, path, values):
+        """Set per-replica values for one state entry.
+
+        Args:
+            path (str): "model_attribute.state_dict.key" path of the entry.
+            values (float or np.ndarray): Scalar or array of shape (N,).
+        """
+        self.set_state_value(path, np.broadcast_to(np.asarray(values, dtype=float), (self.replicas,)).copy())
+
+    def _replica_range(self):
+        return self.replica_offset, self.replicas
+
+    def run_simulation(self, years=None):
+        """Execute the ensemble from start_year.
+
+        Years that were already simulated are not re-run, so an ensemble resumed from a
+        checkpoint continues with the year after it.
+
+        Args:
+            years (int, optional): Number of years to simulate, counted from start_year.
+                                   Defaults to end_year - start_year + 1.
+
+        Returns:
+            dict: Mapping of metric name to an array of shape (years, N).
+        """
+        if years is None:
+            simulation_years = self.end_year - self.start_year + 1
+        else:
+            simulation_years = years
+
+        first_year = self.next_year
+        final_year = self.start_year + simulation_years - 1
+
+        logger.info("\n--- Starting Ensemble Run: %s - %s (Scenario: %s, Replicas: %s) ---",
+                    first_year, final_year, self.scenario_name, self.replicas)
+
+        results = self.ensemble_results
+        n_rows = max(final_year, first_year - 1) - self.start_year + 1
+        results['year'] = np.arange(self.start_year, self.start_year + n_rows)
+        for metric, values in results.items():
+            if metric != 'year' and values.shape[0] < n_rows:
+                results[metric] = np.concatenate([values, np.full((n_rows - values.shape[0], self.replicas), np.nan)])
+
+        with self.run_session():
+            for year in range(first_year, final_year + 1):
+                self.current_year = year
+                row = year - self.start_year
+                self._checkpoint_year(year)
+                for prefix, state in self.advance_year(year).items():
+                    for k, v in state.items():
+                        metric = f"{prefix}_{k}"
+                        if metric not in results:
+                            results[metric] = np.full((n_rows, self.replicas), np.nan)
+                        # Assignment broadcasts scalar outputs and copies array outputs, which
+                        # models may keep mutating in place in later years.
+                        results[metric][row] = v
+                self.next_year = year + 1
+
+        logger.info("\n--- Ensemble Run Completed: %s - %s (Scenario: %s) ---", first_year, final_year, self.scenario_name)
+        return results
+
+    def _discard_results_from(self, year):
+        row = max(0, year - self.start_year)
+        for metric, values in self.ensemble_results.items():
+            if metric != 'year':
+                values[row:] = np.nan
+
+    def _checkpoint_payload(self):
+        payload = super()._checkpoint_payload()
+        payload['init_kwargs'] = {'replicas': self.replicas, 'replica_offset': self.replica_offset}
+        payload['ensemble_results'] = self.ensemble_results
+        return payload
+
+    def _restore_checkpoint(self, payload):
+        super()._restore_checkpoint(payload)
+        self.ensemble_results = payload['ensemble_results']
+
+    def replica_results(self, replica):
+        """Return one replica's trajectory in the results_history format.
+
+        Args:
+            replica (int): Index of the replica.
+
+        Returns:
+            list: One dict per year, suitable for DigitalAnalysisEngine.
+        """
+        years = self.ensemble_results.get('year', [])
+        metrics = [m for m in self.ensemble_results if m != 'year']
+        return [
+            {'year': int(year), **{m: self.ensemble_results[m][i, replica] for m in metrics}}
+            for i, year in enumerate(years)
+        ]
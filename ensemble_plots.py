@@ -0,0 +1,178 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from scenario_cube import ScenarioCube, replica_quantiles
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Defaults for ensemble and long-series plots; override any of them through
+# DigitalAnalysisEngine(plot_options=...) or the keyword arguments below.
+PLOT_DEFAULTS = {
+    'quantiles': (0.05, 0.25, 0.5, 0.75, 0.95), # Outer band, inner band, median
+    'sample_replicas': 20,       # Individual replica paths drawn behind the bands (0 disables)
+    'max_points': 2000,          # Series longer than this are decimated
+    'decimation': "lttb",        # "lttb" or "minmax"
+    'webgl_threshold': 5000,     # Series with more points than this (before decimation) use Scattergl
+}
+
+SCENARIO_COLOURS = ['#1a5276', '#b9770e', '#1e8449', '#943126', '#6c3483', '#117a65']
+
+def lttb(x, y, n_out):
+    """Downsample a series with Largest-Triangle-Three-Buckets, keeping its visual shape.
+
+    Args:
+        x (np.ndarray): Increasing x values.
+        y (np.ndarray): Values, same length as x.
+        n_out (int): Number of points to keep (at least 3).
+
+    Returns:
+        np.ndarray: Indices of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp) # n_out - 2 buckets between the end points
+    kept = np.empty(n_out, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        next_stop = edges[b + 2] if b + 2 < len(edges) else n
+        next_start = stop if b + 2 < len(edges) else n - 1
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+        # Twice the triangle area for every candidate in the bucket at once
+        area = np.abs((x[previous] - avg_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area)) if stop > start else start
+        kept[b + 1] = previous
+    return kept
+
+def minmax_decimate(x, y, n_out):
+    """Downsample by keeping the minimum and maximum of each of n_out // 2 buckets.
+
+    Preserves every extreme, which suits noisy series where spikes matter. At most n_out
+    points are kept; a bucket holding only NaN keeps its first point, so gaps stay visible.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = max(1, n_out // 2)
+    bucket_size = -(-n // n_buckets) # Ceiling, so the buckets cover every point
+    n_buckets = -(-n // bucket_size)
+    y = np.asarray(y, dtype=float)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    missing = np.isnan(buckets)
+    offsets = np.arange(n_buckets) * bucket_size
+    # argmin/argmax skip NaN via +/-inf; an all-NaN bucket yields its first point, which is real
+    kept = np.concatenate([offsets + np.argmin(np.where(missing, np.inf, buckets), axis=1),
+                           offsets + np.argmax(np.where(missing, -np.inf, buckets), axis=1)])
+    return np.unique(kept)
+
+def decimate(x, y, max_points=None, method=None):
+    """Return (x, y) reduced to at most max_points points (unchanged if already shorter)."""
+    max_points = PLOT_DEFAULTS['max_points'] if max_points is None else max_points
+    method = PLOT_DEFAULTS['decimation'] if method is None else method
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    if len(x) <= max_points:
+        return x, y
+    if method == "lttb":
+        kept = lttb(x.astype(float), y, max_points)
+    elif method == "minmax":
+        kept = minmax_decimate(x, y, max_points)
+    else:
+        raise ValueError(f"Unknown decimation method '{method}'; expected 'lttb' or 'minmax'")
+    return x[kept], y[kept]
+
+def scatter_trace(x, y, webgl_threshold=None, max_points=None, decimation=None, **kwargs):
+    """Build a line trace, decimating long series and switching to WebGL for large ones.
+
+    Args:
+        x, y: Series values.
+        webgl_threshold (int, optional): Series length above which go.Scattergl is used. It is
+                                         compared with the length before decimation.
+        max_points (int, optional): Decimate series longer than this.
+        decimation (str, optional): "lttb" or "minmax".
+        **kwargs: Passed to the trace constructor.
+    """
+    webgl_threshold = PLOT_DEFAULTS['webgl_threshold'] if webgl_threshold is None else webgl_threshold
+    trace_type = go.Scattergl if len(x) > webgl_threshold else go.Scatter
+    x, y = decimate(x, y, max_points, decimation)
+    return trace_type(x=x, y=y, **kwargs)
+
+def _hex_to_rgba(colour, alpha):
+    colour = colour.lstrip('#')
+    r, g, b = (int(colour[i:i + 2], 16) for i in (0, 2, 4))
+    return f"rgba({r},{g},{b},{alpha})"
+
+def ensemble_band_figure(cube, metric, scenarios=None, title=None, **options):
+    """Plot one metric of an ensemble cube as quantile bands per scenario.
+
+    Each scenario is drawn as an outer band (first/last quantile), an inner band (second/
+    second-to-last quantile) and a median line, plus optionally a few sampled replica
+    paths merged into a single trace. The figure size depends on years and scenarios, not
+    on the number of replicas.
+
+    Args:
+        cube (ScenarioCube or EnsembleSimulation): The ensemble results.
+        metric (str): Metric to plot.
+        scenarios (list, optional): Scenarios to include. Defaults to all.
+        title (str, optional): Figure title.
+        **options: Overrides of PLOT_DEFAULTS.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    options = {**PLOT_DEFAULTS, **options}
+    if not isinstance(cube, ScenarioCube):
+        cube = ScenarioCube.from_ensembles({cube.scenario_name: cube}, metrics=[metric])
+    scenarios = cube.scenarios if scenarios is None else scenarios
+    m = cube.metrics.index(metric)
+    quantiles = sorted(options['quantiles'])
+    trace_options = {k: options[k] for k in ('webgl_threshold', 'max_points', 'decimation')}
+
+    rows = [cube.scenarios.index(s) for s in scenarios]
+    bands = replica_quantiles(cube.data[rows][..., [m]], quantiles)[:, :, 0, :] # (s, y, q)
+    years = cube.years
+    fig = go.Figure()
+    for i, (scenario, row) in enumerate(zip(scenarios, rows)):
+        colour = SCENARIO_COLOURS[i % len(SCENARIO_COLOURS)]
+        if options['sample_replicas']:
+            picks = np.linspace(0, cube.replicas - 1, min(options['sample_replicas'], cube.replicas)).astype(np.intp)
+            paths = cube.data[row][picks][:, :, m] # (picks, years)
+            # One trace for all sampled paths, separated by gaps, instead of one trace per replica
+            xs = np.concatenate([np.append(years.astype(float), np.nan) for _ in picks])
+            ys = np.concatenate([np.append(path, np.nan) for path in paths])
+            trace_type = go.Scattergl if len(xs) > trace_options['webgl_threshold'] else go.Scatter
+            fig.add_trace(trace_type(x=xs, y=ys, mode='lines', line=dict(color=_hex_to_rgba(colour, 0.15), width=1),
+                                     name=f"{scenario} replicas", legendgroup=scenario, hoverinfo='skip',
+                                     connectgaps=False, showlegend=False))
+
+        n_bands = len(quantiles) // 2
+        for b in range(n_bands):
+            low, high = bands[i, :, b], bands[i, :, -1 - b]
+            label = f"{scenario} {quantiles[b]:.0%}-{quantiles[-1 - b]:.0%}"
+            fig.add_trace(scatter_trace(years, high, mode='lines', line=dict(width=0), legendgroup=scenario,
+                                        showlegend=False, hoverinfo='skip', **trace_options))
+            fig.add_trace(scatter_trace(years, low, mode='lines', line=dict(width=0), fill='tonexty',
+                                        fillcolor=_hex_to_rgba(colour, 0.15 + 0.15 * b), name=label,
+                                        legendgroup=scenario, **trace_options))
+        if len(quantiles) % 2:
+            fig.add_trace(scatter_trace(years, bands[i, :, n_bands], mode='lines', line=dict(color=colour, width=2.5),
+                                        name=f"{scenario} median", legendgroup=scenario, **trace_options))
+
+    fig.update_layout(
+        title=title or f"{metric} ({cube.replicas} replicas)",
+        xaxis_title='Simulation Year',
+        yaxis_title=metric,
+        template="plotly_white",
+        hovermode='x unified',
+        margin=dict(t=50, b=50, l=50, r=20),
+    )
+    return fig
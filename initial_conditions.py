@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Where each model's initial conditions come from: model_params key -> {parameter: (source, indicator)}.
+# Sources are either long panels with 'year', 'indicator' and 'value' columns, or wide panels
+# with a 'year' column and one column per indicator.
+INITIAL_CONDITION_FIELDS = {
+    'infra': {
+        'initial_broadband_penetration': ('btrc_stats', 'broadband_penetration'),
+        'initial_mobile_subscriptions': ('btrc_stats', 'mobile_subscriptions'),
+        'initial_internet_bandwidth_gbps': ('bdix_traffic', 'peak_traffic_gbps'),
+        'initial_isp_count': ('ispab_isp', 'licensed_isps'),
+    },
+    'gov': {
+        'initial_eservices': ('a2i_services', 'eservices_available'),
+        'initial_open_datasets': ('open_data_portal', 'datasets_published'),
+    },
+    'econ': {
+        'initial_mfs_accounts': ('bangladesh_bank_mfs', 'mfs_accounts'),
+        'initial_ecommerce_volume': ('dcab_commerce', 'transaction_volume'),
+        'initial_ict_exports': ('basis_industry', 'ict_exports_usd'),
+    },
+    'skills': {
+        'initial_digital_literacy': ('bbs_ict_survey', 'digital_literacy_rate'),
+        'initial_trained_workforce': ('bitac_training', 'trainees'),
+    },
+    'cyber': {
+        'initial_incidents': ('cert_incidents', 'incidents_reported'),
+    },
+    'inclusion': {
+        'initial_internet_use': ('bbs_ict_survey', 'internet_use_rate'),
+    },
+    'emerging': {
+        'initial_ai_projects': ('ict_division', 'ai_projects'),
+    },
+    'innovation': {
+        'initial_startups': ('startup_bangladesh', 'startups_funded'),
+        'initial_hitech_parks': ('hitech_park', 'parks_operational'),
+    },
+    'policy': {
+        'initial_ict_budget_share': ('ict_division', 'budget_share'),
+    },
+    'society': {
+        'initial_social_media_users': ('bbs_ict_survey', 'social_media_users'),
+    },
+    'integration': {
+        'initial_it_service_exports': ('basis_industry', 'it_service_exports_usd'),
+    },
+}
+
+def indicator_observations(historical_data, source, indicator):
+    """Return (years, values) sorted by year for one indicator, or None if unavailable.
+
+    Missing values are dropped, so as-of lookups return the latest actual observation;
+    repeated years keep the last row.
+
+    Args:
+        historical_data (Mapping): Source key -> DataFrame, long ('indicator'/'value') or wide.
+        source (str): Source key.
+        indicator (str): Indicator name.
+    """
+    frame = historical_data.get(source) # A lazy catalog opens the source here; failed sources are absent
+    if frame is None or 'year' not in frame.columns:
+        return None
+    if indicator in frame.columns:
+        years, values = frame['year'].to_numpy(), frame[indicator].to_numpy()
+    elif {'indicator', 'value'}.issubset(frame.columns):
+        mask = (frame['indicator'] == indicator).to_numpy()
+        years, values = frame['year'].to_numpy()[mask], frame['value'].to_numpy()[mask]
+    else:
+        return None
+
+    # Non-numeric cells (e.g. "n/a" in a scraped sheet) become NaN and are dropped below
+    values = np.asarray(pd.to_numeric(values, errors='coerce'), dtype=np.float64)
+    years = np.asarray(years, dtype=np.int64)
+    keep = ~np.isnan(values)
+    years, values = years[keep], values[keep]
+    if not len(years):
+        return None
+    order = np.argsort(years, kind='stable')
+    years, values = years[order], values[order]
+    last = np.append(years[1:] != years[:-1], True)
+    return years[last], values[last]
+
+# Year stride separating indicator segments in the flat as-of key space
+_YEAR_SPAN = 1_000_000
+
+class InitialConditionIndex:
+    """As-of index over (source, indicator, year) for building initial conditions.
+
+    All observations of every requested indicator are flattened once into a single sorted
+    key array (indicator position * _YEAR_SPAN + year) with a parallel value array. An
+    as-of lookup for any start year is then one np.searchsorted over all indicators at
+    once, so building the per-model initial-condition dicts costs microseconds regardless
+    of how many historical rows there are.
+    """
+    def __init__(self, historical_data, fields=None):
+        """Build the index.
+
+        Args:
+            historical_data (Mapping): Source key -> DataFrame (a dict or LazyDataCatalog).
+                                       Only sources referenced by fields are read.
+            fields (dict, optional): model_params key -> {parameter: (source, indicator)}.
+                                     Defaults to INITIAL_CONDITION_FIELDS.
+        """
+        self.fields = INITIAL_CONDITION_FIELDS if fields is None else fields
+        self.targets = []  # (model key, parameter) per indexed indicator
+        series = []
+        for model_key, params in self.fields.items():
+            for param, (source, indicator) in params.items():
+                observations = indicator_observations(historical_data, source, indicator)
+                if observations is None:
+                    logger.debug("No data for %s.%s (%s/%s)", model_key, param, source, indicator)
+                    continue
+                self.targets.append((model_key, param))
+                series.append(observations)
+
+        offsets = np.arange(len(series), dtype=np.int64) * _YEAR_SPAN
+        self._positions = offsets
+        if series:
+            self._keys = np.concatenate([offset + years for offset, (years, _) in zip(offsets, series)])
+            self._values = np.concatenate([values for _, values in series])
+        else:
+            self._keys = np.empty(0, dtype=np.int64)
+            self._values = np.empty(0, dtype=np.float64)
+        logger.debug("Indexed %s initial-condition indicators (%s observations)", len(self.targets), len(self._keys))
+
+    def lookup(self, year):
+        """Return the latest observation at or before year for every indexed indicator.
+
+        Args:
+            year (int): Simulation start year.
+
+        Returns:
+            dict: model_params key -> {parameter: value}. Indicators with no observation at
+                  or before year are omitted.
+        """
+        if not self.targets:
+            return {}
+        found = np.searchsorted(self._keys, self._positions + int(year), side='right') - 1
+        valid = (found >= 0) & (self._keys[np.maximum(found, 0)] >= self._positions)
+        values = self._values[found].tolist()
+        initial_conditions = {}
+        for (model_key, param), ok, value in zip(self.targets, valid.tolist(), values):
+            if ok:
+                initial_conditions.setdefault(model_key, {})[param] = value
+        return initial_conditions
@@ -1,9 +1,28 @@
+import numpy as np
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named coefficients of the yearly dynamics. Override them through config['model_params']['innovation'];
+# in an EnsembleSimulation a value may also be an array with one entry per replica.
+DEFAULT_PARAMS = {
+    'startup_growth': 1.05,             # Base yearly growth factor of active tech startups
+    'startup_skills_sensitivity': 0.1,  # Extra startup growth per unit of (ICT graduates / 50,000)
+    'startup_policy_sensitivity': 0.05, # Extra startup growth per unit of policy x economy factor
+    'vc_funding_growth': 1.1,           # Base yearly growth factor of VC funding
+    'vc_policy_sensitivity': 0.15,      # Extra VC funding growth per unit of policy x economy factor
+    'rd_growth': 1.02,                  # Base yearly growth factor of R&D spending
+    'rd_policy_sensitivity': 0.03,      # Extra R&D spending growth per unit of startup policy score
+}
+
 class InnovationEcosystemModel:
     """Model innovation support systems and knowledge networks in Bangladesh."""
     def __init__(self, config):
         """Initialize innovation ecosystem parameters using Bangladesh technology innovation data."""
-        print("Initializing InnovationEcosystemModel...")
+        logger.debug("Initializing InnovationEcosystemModel...")
         self.config = config
+        self.params = {name: config.get(name, default) for name, default in DEFAULT_PARAMS.items()}
         # Placeholder attributes - Initialized with illustrative synthetic data for 2025
         self.startup_ecosystem = {"active_tech_startups": 1200, "incubators_accelerators": 50}
         self.research_development = {"r&d_spending_gdp_pct": 0.3, "university_industry_collaboration_index": 0.4} # Scale 0-1
@@ -12,9 +31,9 @@ class InnovationEcosystemModel:
         self.innovation_infrastructure = {"tech_parks_count": 5}
         self.innovation_culture = {"entrepreneurial_intent_score": 0.6} # Scale 0-1
 
-        print("InnovationEcosystemModel Initialized.")
+        logger.debug("InnovationEcosystemModel Initialized.")
 
-    def simulate_innovation_dynamics(self, year, economy_state, skills_state, policy_state):
+    def simulate_innovation_dynamics(self, year, economy_state, skills_state, policy_state, dt=1.0):
         """Simulate one year of innovation ecosystem dynamics.
 
         Args:
@@ -22,24 +41,29 @@ class InnovationEcosystemModel:
             economy_state (dict): Current state from DigitalEconomyModel.
             skills_state (dict): Current state from DigitalSkillsModel.
             policy_state (dict): Current state from DigitalPolicyModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Innovation Ecosystem for year {year}...")
+        logger.debug("Simulating Innovation Ecosystem for year %s...", year)
+        params = self.params
         # Placeholder logic: Grow startups/funding based on skills, policy support, economic conditions
         skills_factor = skills_state.get("ict_graduates", 10000) / 50000 # Example scale
         policy_factor = policy_state.get("startup_policy_score", 0.5)
         economy_factor = economy_state.get("gdp_growth", 0.06) / 0.06 # Relative to baseline growth
 
-        self.startup_ecosystem["active_tech_startups"] = int(self.startup_ecosystem["active_tech_startups"] * (1.05 + 0.1 * skills_factor + 0.05 * policy_factor * economy_factor))
-        self.commercialization["vc_funding_usd_millions"] *= (1.1 + 0.15 * policy_factor * economy_factor)
-        self.research_development["r&d_spending_gdp_pct"] = min(2.0, self.research_development["r&d_spending_gdp_pct"] * (1.02 + 0.03 * policy_factor))
+        startups = self.startup_ecosystem["active_tech_startups"] * (params["startup_growth"] + params["startup_skills_sensitivity"] * skills_factor + params["startup_policy_sensitivity"] * policy_factor * economy_factor) ** dt
+        # Whole startups per yearly step; sub-annual steps keep the fraction (rounding down every
+        # short step would understate growth) and only the reported count is whole
+        self.startup_ecosystem["active_tech_startups"] = np.floor(startups) if dt == 1 else startups
+        self.commercialization["vc_funding_usd_millions"] *= (params["vc_funding_growth"] + params["vc_policy_sensitivity"] * policy_factor * economy_factor) ** dt
+        self.research_development["r&d_spending_gdp_pct"] = np.minimum(2.0, self.research_development["r&d_spending_gdp_pct"] * (params["rd_growth"] + params["rd_policy_sensitivity"] * policy_factor) ** dt)
 
-        print(f"Finished Simulating Innovation Ecosystem for year {year}.")
+        logger.debug("Finished Simulating Innovation Ecosystem for year %s.", year)
         return {
-            "startup_count": self.startup_ecosystem["active_tech_startups"],
+            "startup_count": np.floor(self.startup_ecosystem["active_tech_startups"]),
             "vc_funding": self.commercialization["vc_funding_usd_millions"],
             "rd_investment_norm": self.research_development["r&d_spending_gdp_pct"] # Used by emerging tech
         }
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, economy_state, skills_state, policy_state):
-        return self.simulate_innovation_dynamics(year, economy_state, skills_state, policy_state) 
\ No newline at end of file
+    def simulate_step(self, year, economy_state, skills_state, policy_state, dt=1.0):
+        return self.simulate_innovation_dynamics(year, economy_state, skills_state, policy_state, dt) 
\ No newline at end of file
@@ -0,0 +1,176 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+class ModelStepInstrumentation:
+    """Record wall time, call counts and allocation deltas per model per simulated year.
+
+    Attach an instance to a simulation (config key 'instrumentation', or assign
+    `sim.instrumentation`) and every simulate_step call made by simulate_year is measured.
+    When no instrumentation is attached the simulation skips measurement entirely.
+
+    Allocations are only recorded for steps run on the thread that opened the run session.
+    tracemalloc's peak is process-wide, so steps run concurrently by the model scheduler
+    (and steps run in worker processes) record wall time and calls only.
+    """
+    def __init__(self, track_allocations=False, profiler=None, profile_output=None):
+        """Initialize the instrumentation.
+
+        Args:
+            track_allocations (bool): Record tracemalloc allocation deltas per step. tracemalloc
+                                      slows Python allocations noticeably, so it is opt-in.
+            profiler (str, optional): Wrap each run in a profiling session: "cprofile" or
+                                      "pyinstrument" (requires the pyinstrument package).
+            profile_output (str, optional): File the profile is written to after each run
+                                            (pstats dump for cProfile, HTML for pyinstrument).
+        """
+        if profiler not in (None, "cprofile", "pyinstrument"):
+            raise ValueError(f"Unknown profiler '{profiler}'; expected 'cprofile' or 'pyinstrument'")
+        self.track_allocations = track_allocations
+        self.profiler = profiler
+        self.profile_output = profile_output
+        self.profile_result = None # pstats.Stats or pyinstrument Profiler from the last run
+        self._records = {} # (model, year) -> [calls, wall_time_s, alloc_delta_bytes, peak_alloc_bytes]
+        self._session_thread = None # Ident of the thread running the current session
+
+    @classmethod
+    def from_config(cls, instrumentation_config):
+        """Build instrumentation from the simulation config's 'instrumentation' entry.
+
+        Args:
+            instrumentation_config (bool or dict): True for defaults, or keyword arguments
+                                                   for the constructor. Falsy disables it.
+
+        Returns:
+            ModelStepInstrumentation or None.
+        """
+        if not instrumentation_config:
+            return None
+        if instrumentation_config is True:
+            return cls()
+        return cls(**instrumentation_config)
+
+    def measure(self, model, year, func, *args):
+        """Call func(*args) and record its cost against (model, year).
+
+        Returns:
+            tuple: (func's return value, wall time in seconds).
+        """
+        track_allocations = self.track_allocations and self._session_thread in (None, threading.get_ident())
+        if track_allocations:
+            tracemalloc.reset_peak()
+            allocated_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = func(*args)
+        duration = time.perf_counter() - started
+
+        record = self.record(model, year, duration)
+        if track_allocations:
+            allocated_after, peak = tracemalloc.get_traced_memory()
+            record[2] += allocated_after - allocated_before
+            record[3] = max(record[3], peak - allocated_before)
+        return result, duration
+
+    def record(self, model, year, duration):
+        """Record one call of `duration` seconds measured elsewhere (e.g. in a worker process).
+
+        Returns:
+            list: The [calls, wall_time_s, alloc_delta_bytes, peak_alloc_bytes] record.
+        """
+        record = self._records.get((model, year))
+        if record is None:
+            record = self._records[(model, year)] = [0, 0.0, 0, 0]
+        record[0] += 1
+        record[1] += duration
+        return record
+
+    @contextmanager
+    def run_session(self):
+        """Context manager wrapping a whole run: starts tracemalloc and the profiler if requested."""
+        started_tracing = False
+        self._session_thread = threading.get_ident()
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+        profiler = None
+        if self.profiler == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError as e:
+                raise ImportError("profiler='pyinstrument' requires the pyinstrument package") from e
+            profiler = Profiler()
+            profiler.start()
+        try:
+            yield self
+        finally:
+            if self.profiler == "cprofile":
+                profiler.disable()
+                self.profile_result = pstats.Stats(profiler, stream=io.StringIO())
+                if self.profile_output:
+                    profiler.dump_stats(self.profile_output)
+            elif self.profiler == "pyinstrument":
+                profiler.stop()
+                self.profile_result = profiler
+                if self.profile_output:
+                    with open(self.profile_output, 'w', encoding='utf-8') as f:
+                        f.write(profiler.output_html())
+            if self.profile_output:
+                logger.info("Profile written to %s", self.profile_output)
+            if started_tracing:
+                tracemalloc.stop()
+            self._session_thread = None
+
+    def to_dataframe(self):
+        """Return the recorded measurements as a DataFrame indexed by (model, year)."""
+        columns = ['calls', 'wall_time_s', 'alloc_delta_bytes', 'peak_alloc_bytes']
+        if not self._records:
+            index = pd.MultiIndex.from_tuples([], names=['model', 'year'])
+            return pd.DataFrame(columns=columns, index=index)
+        index = pd.MultiIndex.from_tuples(list(self._records), names=['model', 'year'])
+        return pd.DataFrame(list(self._records.values()), index=index, columns=columns)
+
+    def summary(self):
+        """Return per-model totals over all years, slowest model first."""
+        df = self.to_dataframe()
+        totals = df.groupby(level='model').agg(
+            calls=('calls', 'sum'),
+            wall_time_s=('wall_time_s', 'sum'),
+            alloc_delta_bytes=('alloc_delta_bytes', 'sum'),
+            peak_alloc_bytes=('peak_alloc_bytes', 'max'),
+        )
+        totals['wall_time_share'] = totals['wall_time_s'] / totals['wall_time_s'].sum()
+        return totals.sort_values('wall_time_s', ascending=False)
+
+    def profile_text(self, limit=25):
+        """Return a text rendering of the last run's profile, if one was taken.
+
+        Args:
+            limit (int): Number of cProfile rows to include.
+        """
+        if self.profile_result is None:
+            return ""
+        if isinstance(self.profile_result, pstats.Stats):
+            stream = io.StringIO()
+            self.profile_result.stream = stream
+            self.profile_result.sort_stats('cumulative').print_stats(limit)
+            return stream.getvalue()
+        return self.profile_result.output_text()
+
+    def reset(self):
+        """Discard all recorded measurements."""
+        self._records.clear()
+        self.profile_result = None
@@ -1,9 +1,25 @@
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named coefficients of the yearly dynamics. Override them through config['model_params']['integration'];
+# in an EnsembleSimulation a value may also be an array with one entry per replica.
+DEFAULT_PARAMS = {
+    'it_exports_growth': 1.08,             # Base yearly growth factor of IT/BPO exports
+    'it_exports_economy_sensitivity': 0.1, # Extra export growth per unit of economic competitiveness
+    'it_exports_policy_sensitivity': 0.05, # Extra export growth per unit of trade agreement focus
+    'cable_capacity_gain': 2,              # Submarine cable capacity (Tbps) added per unit of bandwidth factor
+    'ecommerce_growth': 1.1,               # Base yearly growth factor of cross-border e-commerce
+    'ecommerce_sensitivity': 0.1,          # Extra e-commerce growth per unit of economy x policy factor
+}
+
 class InternationalIntegrationModel:
     """Model global digital connectivity and position of Bangladesh in world digital economy."""
     def __init__(self, config):
         """Initialize international integration parameters using Bangladesh global digital data."""
-        print("Initializing InternationalIntegrationModel...")
+        logger.debug("Initializing InternationalIntegrationModel...")
         self.config = config
+        self.params = {name: config.get(name, default) for name, default in DEFAULT_PARAMS.items()}
         # Placeholder attributes - Initialized with illustrative synthetic data for 2025
         self.global_positioning = {"it_bpo_exports_usd_billions": 1.5, "global_connectivity_index_rank": 90}
         self.cross_border_data = {"submarine_cable_capacity_tbps": 10, "ixp_traffic_gbps": 500}
@@ -11,9 +27,9 @@ class InternationalIntegrationModel:
         self.technology_transfer = {"fdi_in_tech_usd_millions": 200, "mnc_tech_presence_score": 0.4} # Scale 0-1
         self.digital_diplomacy = {"participation_global_governance_forums": 0.6} # Scale 0-1
 
-        print("InternationalIntegrationModel Initialized.")
+        logger.debug("InternationalIntegrationModel Initialized.")
 
-    def simulate_integration_dynamics(self, year, infrastructure_state, economy_state, policy_state):
+    def simulate_integration_dynamics(self, year, infrastructure_state, economy_state, policy_state, dt=1.0):
         """Simulate one year of international digital integration dynamics.
 
         Args:
@@ -21,18 +37,20 @@ class InternationalIntegrationModel:
             infrastructure_state (dict): Current state from DigitalInfrastructureModel.
             economy_state (dict): Current state from DigitalEconomyModel.
             policy_state (dict): Current state from DigitalPolicyModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating International Integration for year {year}...")
+        logger.debug("Simulating International Integration for year %s...", year)
+        params = self.params
         # Placeholder logic: Exports grow with economy/skills, connectivity improves with infra investment, influenced by policy
         infra_factor = infrastructure_state.get("international_bandwidth", 10) / 50 # Example scale
         economy_factor = economy_state.get("overall_competitiveness", 0.5)
         policy_factor = policy_state.get("trade_agreement_focus", 0.4)
 
-        self.global_positioning["it_bpo_exports_usd_billions"] *= (1.08 + 0.1 * economy_factor + 0.05 * policy_factor)
-        self.cross_border_data["submarine_cable_capacity_tbps"] += 2 * infra_factor # Increase capacity based on investment
-        self.digital_trade["cross_border_ecommerce_volume_usd_millions"] *= (1.1 + 0.1 * economy_factor * policy_factor)
+        self.global_positioning["it_bpo_exports_usd_billions"] *= (params["it_exports_growth"] + params["it_exports_economy_sensitivity"] * economy_factor + params["it_exports_policy_sensitivity"] * policy_factor) ** dt
+        self.cross_border_data["submarine_cable_capacity_tbps"] += params["cable_capacity_gain"] * infra_factor * dt # Increase capacity based on investment
+        self.digital_trade["cross_border_ecommerce_volume_usd_millions"] *= (params["ecommerce_growth"] + params["ecommerce_sensitivity"] * economy_factor * policy_factor) ** dt
 
-        print(f"Finished Simulating International Integration for year {year}.")
+        logger.debug("Finished Simulating International Integration for year %s.", year)
         return {
             "it_exports": self.global_positioning["it_bpo_exports_usd_billions"],
             "int_connectivity": self.cross_border_data["submarine_cable_capacity_tbps"],
@@ -40,5 +58,5 @@ class InternationalIntegrationModel:
         }
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, infrastructure_state, economy_state, policy_state):
-        return self.simulate_integration_dynamics(year, infrastructure_state, economy_state, policy_state) 
\ No newline at end of file
+    def simulate_step(self, year, infrastructure_state, economy_state, policy_state, dt=1.0):
+        return self.simulate_integration_dynamics(year, infrastructure_state, economy_state, policy_state, dt) 
\ No newline at end of file
@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Metrics combined into the composite digital maturity index by default
+KEY_MATURITY_METRICS = [
+    'policy_policy_effectiveness', 'infra_infra_metric', 'skills_skills_metric',
+    'inclusion_overall_literacy', 'cyber_protection_level', 'society_adoption_rate',
+    'innovation_startup_count', 'emerging_ai_adoption', 'economy_econ_metric',
+    'sectoral_fin_digital_index', 'gov_gov_metric', 'integration_it_exports'
+]
+
+# minmax: (x - min) / (max - min), constant metrics map to 0.5
+# zscore: (x - mean) / std (population), constant metrics map to 0.0
+# reference_year: x / x[reference_year], so every metric is 1.0 in the reference year
+NORMALISATION_SCHEMES = ("minmax", "zscore", "reference_year")
+
+class MaturityIndex:
+    """Composite digital maturity index over a block of key metrics.
+
+    The metrics are held as one (years, metrics) NumPy block and normalised with a single
+    broadcast operation; the composite is a NaN-aware weighted mean computed as a
+    matrix-vector product. Normalisation statistics are kept as running values (min/max,
+    or count/mean/M2 merged batch-wise for z-scores), so append() only scans the new years.
+    Earlier years are renormalised only when the statistics actually change, and then
+    from the stored block without re-reading the results.
+
+    With min-max or z-score normalisation every year that sets a new extreme (or moves the
+    mean) renormalises the whole history, which a steadily growing metric does on every
+    append. Reference-year normalisation never changes once the reference year is in, so
+    it is the scheme to use for live dashboards that append a year at a time.
+    """
+    def __init__(self, metrics=None, weights=None, normalisation="minmax", reference_year=None):
+        """Initialize the index.
+
+        Args:
+            metrics (list, optional): Result columns to combine. Defaults to KEY_MATURITY_METRICS.
+            weights (dict, optional): Metric -> weight. Unlisted metrics get weight 0; None
+                                      weights all metrics equally.
+            normalisation (str): One of NORMALISATION_SCHEMES.
+            reference_year (int, optional): Base year for 'reference_year' normalisation.
+        """
+        if normalisation not in NORMALISATION_SCHEMES:
+            raise ValueError(f"Unknown normalisation '{normalisation}'; expected one of {NORMALISATION_SCHEMES}")
+        if normalisation == "reference_year" and reference_year is None:
+            raise ValueError("'reference_year' normalisation needs a reference_year")
+        self.metrics = list(KEY_MATURITY_METRICS if metrics is None else metrics)
+        self.normalisation = normalisation
+        self.reference_year = reference_year
+        if weights is None:
+            self.weights = np.ones(len(self.metrics))
+        else:
+            unknown = sorted(set(weights) - set(self.metrics))
+            if unknown:
+                raise ValueError(f"Weights given for metrics outside the index: {unknown}")
+            self.weights = np.array([float(weights.get(m, 0.0)) for m in self.metrics])
+        self.reset()
+
+    def reset(self):
+        """Drop all data and statistics."""
+        n_metrics = len(self.metrics)
+        self.n_rows = 0
+        # Buffers grow geometrically; only the first n_rows rows are valid
+        self._years = np.empty(0, dtype=np.int64)
+        self._raw = np.empty((0, n_metrics), order='F')
+        self._norm = np.empty((0, n_metrics), order='F')
+        self._composite = np.empty(0)
+        self.present = np.zeros(n_metrics, dtype=bool) # metrics found in the results
+        self._min = np.full(n_metrics, np.nan)
+        self._max = np.full(n_metrics, np.nan)
+        self._count = np.zeros(n_metrics)
+        self._mean = np.zeros(n_metrics)
+        self._m2 = np.zeros(n_metrics)
+        self._reference = np.full(n_metrics, np.nan)
+        self._params = None # (offset, scale, constant mask) used for the stored normalised block
+        self.changed_from = 0 # First row whose normalised values changed in the last append
+
+    def fit(self, results):
+        """Compute the index for a full results frame, discarding earlier data.
+
+        Args:
+            results (pd.DataFrame): Results indexed by year.
+
+        Returns:
+            MaturityIndex: self.
+        """
+        self.reset()
+        missing = [m for m in self.metrics if m not in results.columns]
+        for metric in missing:
+            logger.warning("Metric %s not found in results for composite index calculation.", metric)
+        return self.append(results)
+
+    def append(self, results):
+        """Add newly simulated years and update the index incrementally.
+
+        Only the new rows are scanned to update the statistics. If the statistics are
+        unchanged (always the case for reference-year normalisation once the reference
+        year is in), only the new rows are normalised; otherwise the stored block is
+        renormalised in one vectorised operation.
+
+        Args:
+            results (pd.DataFrame): New results rows indexed by year.
+
+        Returns:
+            MaturityIndex: self.
+        """
+        block = results.reindex(columns=self.metrics).to_numpy(dtype=float)
+        self.present |= np.isin(self.metrics, results.columns)
+        self._update_statistics(results.index.to_numpy(), block)
+
+        start, stop = self.n_rows, self.n_rows + len(block)
+        self._reserve(stop)
+        self._years[start:stop] = results.index.to_numpy(dtype=np.int64)
+        self._raw[start:stop] = block
+        self.n_rows = stop
+
+        params = self._normalisation_params()
+        if self._params is None or not all(np.array_equal(a, b, equal_nan=True) for a, b in zip(params, self._params)):
+            self._params = params
+            start = 0
+        else:
+            logger.debug("Appended %s years to the maturity index without renormalising", len(block))
+        self._norm[start:stop] = self._normalise(self._raw[start:stop], params)
+        self._composite[start:stop] = self._weighted_mean(self._norm[start:stop])
+        self.changed_from = start
+        return self
+
+    def _reserve(self, n_rows):
+        capacity = len(self._years)
+        if n_rows <= capacity:
+            return
+        capacity = max(n_rows, 2 * capacity)
+        n_metrics = len(self.metrics)
+        for name, shape, dtype in (('_years', (capacity,), np.int64), ('_raw', (capacity, n_metrics), float),
+                                   ('_norm', (capacity, n_metrics), float), ('_composite', (capacity,), float)):
+            grown = np.empty(shape, dtype=dtype, order='F')
+            grown[:self.n_rows] = getattr(self, name)[:self.n_rows]
+            setattr(self, name, grown)
+
+    def _update_statistics(self, years, block):
+        observed = ~np.isnan(block)
+        if not observed.any():
+            return
+        self._min = np.fmin(self._min, np.fmin.reduce(block, axis=0))
+        self._max = np.fmax(self._max, np.fmax.reduce(block, axis=0))
+
+        # Merge the batch's count/mean/M2 into the running values (Chan et al.)
+        count_b = observed.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(count_b > 0, np.nansum(block, axis=0) / count_b, 0.0)
+        m2_b = np.nansum((block - mean_b) ** 2, axis=0)
+        total = self._count + count_b
+        delta = mean_b - self._mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self._mean = np.where(total > 0, self._mean + delta * count_b / total, 0.0)
+            self._m2 = np.where(total > 0, self._m2 + m2_b + delta ** 2 * self._count * count_b / total, 0.0)
+        self._count = total
+
+        if self.reference_year is not None:
+            rows = np.flatnonzero(years == self.reference_year)
+            if len(rows):
+                self._reference = block[rows[-1]].copy()
+
+    def _normalisation_params(self):
+        """Return (offset, scale, constant) so that normalised = (x - offset) / scale."""
+        if self.normalisation == "minmax":
+            offset, scale = self._min, self._max - self._min
+            return offset, scale, scale == 0
+        if self.normalisation == "zscore":
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.sqrt(self._m2 / self._count)
+            return self._mean, std, std == 0
+        return np.zeros(len(self.metrics)), self._reference, np.zeros(len(self.metrics), dtype=bool)
+
+    def _normalise(self, block, params):
+        offset, scale, constant = params
+        with np.errstate(invalid='ignore', divide='ignore'):
+            norm = (block - offset) / np.where(constant, 1.0, scale)
+        if constant.any():
+            fill = 0.5 if self.normalisation == "minmax" else 0.0
+            norm[:, constant] = np.where(np.isnan(block[:, constant]), np.nan, fill)
+        if self.normalisation == "reference_year":
+            norm[:, scale == 0] = np.nan
+        return norm
+
+    def _weighted_mean(self, norm):
+        weights = np.where(self.present, self.weights, 0.0)
+        observed = ~np.isnan(norm)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (np.where(observed, norm, 0.0) @ weights) / (observed @ weights)
+
+    def replica_composite(self, ensemble_results):
+        """Composite index of every replica of an ensemble run, shape (years, N).
+
+        Each replica is normalised over its own years, as fit() would normalise that
+        replica's results on their own, but all replicas are handled in one broadcast over
+        a (years, replicas, metrics) block. The index's running state is left untouched.
+
+        Args:
+            ensemble_results (dict): Metric -> (years, N) array, plus 'year', as held in
+                                     EnsembleSimulation.ensemble_results.
+        """
+        years = np.asarray(ensemble_results['year'])
+        present = np.array([m in ensemble_results for m in self.metrics])
+        shape = next(values.shape for metric, values in ensemble_results.items() if metric != 'year')
+        block = np.stack([ensemble_results[m] if found else np.full(shape, np.nan)
+                          for m, found in zip(self.metrics, present)], axis=-1)
+        observed = ~np.isnan(block)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self.normalisation == "minmax":
+                offset = np.fmin.reduce(block, axis=0)
+                scale = np.fmax.reduce(block, axis=0) - offset
+                constant = scale == 0
+            elif self.normalisation == "zscore":
+                count = observed.sum(axis=0)
+                offset = np.nansum(block, axis=0) / count
+                scale = np.sqrt(np.nansum((block - offset) ** 2, axis=0) / count)
+                constant = scale == 0
+            else:
+                rows = np.flatnonzero(years == self.reference_year)
+                offset = np.zeros(block.shape[1:])
+                scale = block[rows[-1]] if len(rows) else np.full(block.shape[1:], np.nan)
+                constant = np.zeros(block.shape[1:], dtype=bool)
+            norm = (block - offset) / np.where(constant, 1.0, scale)
+            if self.normalisation == "reference_year":
+                norm[:, scale == 0] = np.nan
+            else:
+                norm = np.where(constant & observed, 0.5 if self.normalisation == "minmax" else 0.0, norm)
+            weights = np.where(present, self.weights, 0.0)
+            valid = ~np.isnan(norm)
+            return (np.where(valid, norm, 0.0) @ weights) / (valid @ weights)
+
+    def normalised(self, start=0):
+        """Normalised metrics found in the results, as '<metric>_norm' columns indexed by year.
+
+        Args:
+            start (int): First row to return, e.g. changed_from for the rows the last append changed.
+        """
+        columns = [f"{m}_norm" for m, found in zip(self.metrics, self.present) if found]
+        return pd.DataFrame(self._norm[start:self.n_rows, self.present], index=self._year_index(start), columns=columns)
+
+    def composite(self, start=0):
+        """The composite index per year (NaN for years without any weighted metric), from row `start`."""
+        return pd.Series(self._composite[start:self.n_rows].copy(), index=self._year_index(start),
+                         name='composite_digital_maturity')
+
+    def _year_index(self, start=0):
+        return pd.Index(self._years[start:self.n_rows].copy(), name='year')
@@ -0,0 +1,173 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import networkx as nx
+
+from sim_logging import get_logger, trace_enabled, trace_event
+
+logger = get_logger(__name__)
+
+def build_dependency_graph(schedule):
+    """Build the intra-year dependency DAG from a model schedule.
+
+    Args:
+        schedule (list): (prefix, model attribute, upstream inputs) entries, as in
+                         simulation.MODEL_SCHEDULE. None inputs are not dependencies.
+
+    Returns:
+        nx.DiGraph: One node per prefix (with 'model_attr', 'inputs' and 'order' attributes)
+                    and an edge from every declared input to its consumer.
+    """
+    graph = nx.DiGraph()
+    for order, (prefix, model_attr, inputs) in enumerate(schedule):
+        graph.add_node(prefix, model_attr=model_attr, inputs=inputs, order=order)
+    for prefix, _, inputs in schedule:
+        for name in inputs:
+            if name is None:
+                continue
+            if name not in graph:
+                raise ValueError(f"Model '{prefix}' declares unknown input '{name}'")
+            graph.add_edge(name, prefix)
+    if not nx.is_directed_acyclic_graph(graph):
+        cycle = nx.find_cycle(graph)
+        raise ValueError(f"Model schedule has a dependency cycle: {cycle}")
+    return graph
+
+def _step_detached(model, year, upstream, dt):
+    """Step a model in a worker process and return its updated copy. Executed in worker processes."""
+    started = time.perf_counter()
+    state = model.simulate_step(year, *upstream, dt)
+    return model, state, time.perf_counter() - started
+
+class ModelScheduler:
+    """Run one simulated year layer by layer, stepping independent models concurrently.
+
+    Models in the same topological layer of the dependency DAG only read states produced by
+    earlier layers, so they can run at the same time. With the "thread" executor models are
+    stepped in place; NumPy-heavy models release the GIL and run in parallel. With the
+    "process" executor each model is shipped to a worker and its updated copy replaces the
+    original, which pays pickling costs but sidesteps the GIL for pure-Python models. Step
+    cache lookups and stores happen in the parent process for both executors.
+
+    The worker pool is started on first use and shut down by close(); a simulation closes its
+    scheduler at the end of every run_simulation call, and the scheduler is also a context
+    manager.
+    """
+    def __init__(self, schedule, executor="thread", max_workers=None):
+        """Initialize the scheduler.
+
+        Args:
+            schedule (list): (prefix, model attribute, upstream inputs) entries, as in
+                             simulation.MODEL_SCHEDULE.
+            executor (str): "thread" or "process".
+            max_workers (int, optional): Pool size. Defaults to the widest layer.
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor '{executor}'; expected 'thread' or 'process'")
+        self.schedule = schedule
+        self.executor = executor
+        self.graph = build_dependency_graph(schedule)
+        # Keep schedule order inside each layer so results are written in a stable layout
+        self.layers = [
+            sorted(layer, key=lambda prefix: self.graph.nodes[prefix]['order'])
+            for layer in nx.topological_generations(self.graph)
+        ]
+        self.max_workers = max_workers or max(len(layer) for layer in self.layers)
+        self._pool = None
+        logger.debug("Model scheduler layers: %s", self.layers)
+
+    @classmethod
+    def from_config(cls, schedule, scheduler_config):
+        """Build a scheduler from the simulation config's 'scheduler' entry.
+
+        Args:
+            schedule (list): The model schedule.
+            scheduler_config (bool or dict): True for defaults, or keyword arguments for the
+                                             constructor. Falsy disables concurrent scheduling.
+
+        Returns:
+            ModelScheduler or None.
+        """
+        if not scheduler_config:
+            return None
+        if scheduler_config is True:
+            return cls(schedule)
+        return cls(schedule, **scheduler_config)
+
+    def _get_pool(self):
+        if self._pool is None:
+            pool_class = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+            self._pool = pool_class(max_workers=self.max_workers)
+        return self._pool
+
+    def run_year(self, sim, year, dt=1.0):
+        """Step every model of `sim` for one year, or a `dt`-year step of it.
+
+        Args:
+            sim (BangladeshDigitalTransformationSimulation): The simulation owning the models.
+            year (int): The year to simulate.
+            dt (float): Step length in years.
+
+        Returns:
+            dict: Mapping of result prefix to model state, in schedule order.
+        """
+        states = {}
+        for layer in self.layers:
+            if len(layer) == 1:
+                prefix = layer[0]
+                states[prefix] = sim.step_model(prefix, year, self._upstream(prefix, states), dt)
+            elif self.executor == "thread":
+                futures = {
+                    prefix: self._get_pool().submit(sim.step_model, prefix, year, self._upstream(prefix, states), dt)
+                    for prefix in layer
+                }
+                for prefix, future in futures.items():
+                    states[prefix] = future.result()
+            else:
+                self._run_layer_in_processes(sim, year, layer, states, dt)
+        return {prefix: states[prefix] for prefix, _, _ in self.schedule}
+
+    def _run_layer_in_processes(self, sim, year, layer, states, dt):
+        cache = sim.step_cache
+        futures, cache_keys = {}, {}
+        for prefix in layer:
+            model = getattr(sim, self.graph.nodes[prefix]['model_attr'])
+            upstream = self._upstream(prefix, states)
+            if cache is not None and cache.caches(prefix):
+                # Keyed on the pre-step model as in the simulation's step_model; hits never reach a worker
+                cache_keys[prefix] = cache.make_key(prefix, model, year, upstream, dt)
+                state = cache.lookup(cache_keys[prefix], model)
+                if state is not None:
+                    states[prefix] = state
+                    continue
+            futures[prefix] = self._get_pool().submit(_step_detached, model, year, upstream, dt)
+        for prefix, future in futures.items():
+            model, states[prefix], duration = future.result()
+            setattr(sim, self.graph.nodes[prefix]['model_attr'], model)
+            if prefix in cache_keys:
+                cache.store(cache_keys[prefix], model, states[prefix])
+            if sim.instrumentation is not None:
+                sim.instrumentation.record(prefix, year, duration)
+            if trace_enabled():
+                trace_event("model_step", model=prefix, year=year, scenario=sim.scenario_name, duration_s=duration)
+
+    def _upstream(self, prefix, states):
+        return [states[name] if name is not None else {} for name in self.graph.nodes[prefix]['inputs']]
+
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        # Worker pools cannot be pickled; a restored scheduler starts a fresh pool on demand
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
@@ -0,0 +1,41 @@
+# Helpers for inspecting, capturing and restoring the mutable state of the simulation models.
+# Model state lives in plain dict attributes on each model (e.g.
+# DigitalInclusionModel.capability_development). Configuration dicts are excluded.
+import numpy as np
+
+# Dict attributes that hold configuration or coefficients rather than evolving state
+NON_STATE_ATTRIBUTES = ("config", "params", "scenario_policy_levers")
+
+
+def iter_state_dicts(model):
+    """Yield (attribute name, dict) pairs for every state dict held by a model.
+
+    Args:
+        model: Any of the simulation model instances.
+    """
+    for name, value in vars(model).items():
+        if isinstance(value, dict) and name not in NON_STATE_ATTRIBUTES:
+            yield name, value
+
+
+def _copy_values(state):
+    # Array values are mutated in place by the models (e.g. `*=`), so they are copied too
+    return {key: value.copy() if isinstance(value, np.ndarray) else value for key, value in state.items()}
+
+
+def capture_state(model):
+    """Return a copy of a model's state dicts that later model updates cannot alter.
+
+    Args:
+        model: Any of the simulation model instances.
+    """
+    return {name: _copy_values(state) for name, state in iter_state_dicts(model)}
+
+
+def restore_state(model, snapshot):
+    """Reset a model's state dicts to a snapshot taken with capture_state.
+
+    The snapshot itself is left untouched, so it can be restored repeatedly.
+    """
+    for name, state in snapshot.items():
+        setattr(model, name, _copy_values(state))
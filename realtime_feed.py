@@ -0,0 +1,262 @@
+import asyncio
+import functools
+import json
+import time
+
+import aiohttp
+
+from sim_logging import get_logger, trace_event
+
+logger = get_logger(__name__)
+
+class RealtimeFeed:
+    """Asyncio feed polling or subscribing to real-time endpoints over one pooled HTTP client.
+
+    Every endpoint shares a single aiohttp session whose connector caps concurrent
+    connections, so keep-alive connections are reused across polls. Pollers send
+    conditional requests (ETag / Last-Modified) and skip unchanged payloads. Records from
+    all endpoints go through one queue and are delivered to `on_batch` in batches of at
+    most `batch_size` records, or whatever arrived within `batch_window` seconds of the
+    first one, grouped by source.
+    """
+    def __init__(self, endpoints, on_batch, batch_size=500, batch_window=1.0, max_connections=10,
+                 timeout=10.0, retry_delay=5.0):
+        """Initialize the feed.
+
+        Args:
+            endpoints (dict): Endpoint key -> spec from DigitalDataHandler.realtime_source_specs.
+            on_batch (callable): Called with {source: [record, ...]} for every batch. It runs in
+                                 a worker thread, so slow handlers (e.g. re-simulation) do not
+                                 stall polling; batches are still delivered one at a time.
+            batch_size (int): Maximum records per batch.
+            batch_window (float): Seconds to wait for more records after the first of a batch.
+            max_connections (int): Connection pool size shared by all endpoints.
+            timeout (float): Per-request timeout in seconds (poll mode only).
+            retry_delay (float): Seconds to wait before retrying a failed endpoint.
+        """
+        self.endpoints = endpoints
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.stats = {'requests': 0, 'not_modified': 0, 'errors': 0, 'records': 0, 'batches': 0}
+        self._validators = {} # endpoint key -> conditional request headers
+        self._stop = None
+
+    def _session(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        return aiohttp.ClientSession(connector=connector, raise_for_status=True)
+
+    async def run(self, duration=None):
+        """Poll and stream every endpoint until stop() is called or `duration` seconds pass.
+
+        Records still queued when the feed stops are delivered as a final batch.
+        """
+        self._stop = asyncio.Event()
+        queue = asyncio.Queue()
+        async with self._session() as session:
+            producers = []
+            for key, spec in self.endpoints.items():
+                task = asyncio.create_task(self._stream(session, key, spec, queue) if spec['mode'] == 'stream'
+                                           else self._poll(session, key, spec, queue))
+                task.add_done_callback(functools.partial(self._producer_done, key))
+                producers.append(task)
+            batcher = asyncio.create_task(self._batch(queue))
+            try:
+                if duration is None:
+                    await self._stop.wait()
+                else:
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), duration)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                for task in producers:
+                    task.cancel()
+                await asyncio.gather(*producers, return_exceptions=True) # Failures were logged by _producer_done
+                await queue.put(None) # Flush and stop the batcher
+                await batcher
+
+    def _producer_done(self, key, task):
+        # Producers only return when cancelled; anything else is a bug that would silently
+        # stop the endpoint, so report it as soon as it happens
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.stats['errors'] += 1
+            logger.error("Real-time endpoint %s stopped after an unexpected error: %r", key, error,
+                         exc_info=error)
+
+    def stop(self):
+        """Ask a running feed to stop; safe to call from the feed's event loop."""
+        if self._stop is not None:
+            self._stop.set()
+
+    async def poll_once(self):
+        """Fetch every poll-mode endpoint once, concurrently, and deliver the records.
+
+        Returns:
+            dict: The delivered batch, {source: [record, ...]}.
+        """
+        async with self._session() as session:
+            fetched = await asyncio.gather(*[
+                self._fetch(session, key, spec)
+                for key, spec in self.endpoints.items() if spec['mode'] == 'poll'
+            ])
+        batch = {}
+        for source, records in fetched:
+            if records:
+                batch.setdefault(source, []).extend(records)
+        if batch:
+            await self._deliver(batch)
+        return batch
+
+    async def _fetch(self, session, key, spec):
+        """GET one poll endpoint and return (source, records); records is empty when unchanged."""
+        headers = {**(spec['headers'] or {}), **self._validators.get(key, {})}
+        self.stats['requests'] += 1
+        async with session.get(spec['url'], params=spec['params'], headers=headers,
+                               timeout=aiohttp.ClientTimeout(total=self.timeout),
+                               raise_for_status=False) as response:
+            if response.status == 304:
+                self.stats['not_modified'] += 1
+                return spec['source'], []
+            response.raise_for_status()
+            payload = await response.json(content_type=None)
+            validators = {}
+            if 'ETag' in response.headers:
+                validators['If-None-Match'] = response.headers['ETag']
+            if 'Last-Modified' in response.headers:
+                validators['If-Modified-Since'] = response.headers['Last-Modified']
+            self._validators[key] = validators
+        records = payload.get('records', []) if isinstance(payload, dict) else payload
+        return spec['source'], records
+
+    async def _poll(self, session, key, spec, queue):
+        while True:
+            started = time.monotonic()
+            try:
+                source, records = await self._fetch(session, key, spec)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                self.stats['errors'] += 1
+                logger.warning("Polling %s failed: %s", spec['url'], e)
+                await asyncio.sleep(self.retry_delay)
+                continue
+            for record in records:
+                queue.put_nowait((source, record))
+            await asyncio.sleep(max(0.0, spec['interval'] - (time.monotonic() - started)))
+
+    async def _stream(self, session, key, spec, queue):
+        while True:
+            try:
+                self.stats['requests'] += 1
+                async with session.get(spec['url'], params=spec['params'], headers=spec['headers'],
+                                       timeout=aiohttp.ClientTimeout(total=None,
+                                                                     sock_connect=self.timeout)) as response:
+                    async for line in response.content:
+                        line = line.strip()
+                        if line:
+                            queue.put_nowait((spec['source'], json.loads(line)))
+                logger.debug("Stream %s closed by server; reconnecting", spec['url'])
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                self.stats['errors'] += 1
+                logger.warning("Stream %s failed: %s", spec['url'], e)
+            await asyncio.sleep(self.retry_delay)
+
+    async def _batch(self, queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            batch, count, done = {}, 0, False
+            deadline = loop.time() + self.batch_window
+            while item is not None:
+                source, record = item
+                batch.setdefault(source, []).append(record)
+                count += 1
+                if count >= self.batch_size:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+                done = item is None
+            await self._deliver(batch)
+            if done:
+                return
+
+    async def _deliver(self, batch):
+        count = sum(len(records) for records in batch.values())
+        self.stats['records'] += count
+        self.stats['batches'] += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.on_batch, batch)
+        except Exception as e:
+            logger.error("Handling a real-time batch of %s records failed: %s", count, e)
+            return
+        trace_event("realtime_batch", sources=sorted(batch), records=count,
+                    duration_s=time.perf_counter() - started)
+
+class IncrementalResimulator:
+    """Re-simulate a run from the earliest year touched by new data instead of from scratch.
+
+    Keeps the simulation's per-year checkpoints enabled. Updates to years after the start
+    rewind to that year and re-run only the remaining horizon; updates at or before the
+    start year change the initial conditions, so the simulation is rebuilt from them.
+    """
+    def __init__(self, sim, data_handler=None):
+        """Initialize the re-simulator.
+
+        Args:
+            sim (BangladeshDigitalTransformationSimulation): The simulation to keep current.
+                                                             Per-year checkpoints are enabled
+                                                             on it if needed.
+            data_handler (DigitalDataHandler, optional): Source of refreshed initial
+                                                         conditions for updates at or before
+                                                         the start year.
+        """
+        self.sim = sim
+        self.data_handler = data_handler
+        if sim.year_checkpoints is None:
+            sim.year_checkpoints = {}
+            if sim.next_year > sim.start_year:
+                logger.warning("Per-year checkpoints enabled after %s was simulated; earlier years "
+                               "re-run from the start year", sim.next_year - 1)
+        self.resimulated_years = 0
+
+    def update(self, earliest_year):
+        """Bring the simulation up to date after data for `earliest_year` onwards changed.
+
+        Returns:
+            BangladeshDigitalTransformationSimulation: The current simulation (a new object
+            when the initial conditions changed).
+        """
+        sim = self.sim
+        if earliest_year > sim.end_year:
+            return sim
+        if earliest_year <= sim.start_year:
+            self.sim = sim = self._rebuild(sim)
+        else:
+            resume_year = min(earliest_year, sim.next_year)
+            if resume_year in sim.year_checkpoints:
+                sim.rewind(resume_year)
+            elif resume_year < sim.next_year:
+                self.sim = sim = self._rebuild(sim)
+        first_year = sim.next_year
+        sim.run_simulation()
+        self.resimulated_years += sim.next_year - first_year
+        logger.info("Re-simulated %s from %s after a data update for %s",
+                    sim.scenario_name, first_year, earliest_year)
+        return sim
+
+    def _rebuild(self, sim):
+        config = {**sim.config, 'year_checkpoints': True}
+        if self.data_handler is not None:
+            config['initial_conditions'] = self.data_handler.get_initial_conditions(sim.start_year)
+        init_kwargs = sim._checkpoint_payload()['init_kwargs']
+        return type(sim)(config, sim.scenario_name, **init_kwargs)
@@ -0,0 +1,260 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html import escape
+
+from plotly.io.json import to_json_plotly
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Stylesheet shared by every simulation report
+REPORT_CSS = """
+<style>
+  @import url('https://fonts.googleapis.com/css2?family=Lato:wght@300;400;700&display=swap');
+
+  body {
+    font-family: 'Lato', sans-serif;
+    line-height: 1.75;
+    margin: 0;
+    padding: 0;
+    background-color: #f8f9fa; /* Lighter background */
+    color: #495057; /* Softer black */
+    font-weight: 300;
+  }
+  .container {
+    max-width: 1200px;
+    margin: 40px auto;
+    background: #ffffff;
+    padding: 30px 50px;
+    box-shadow: 0 6px 18px rgba(0,0,0,0.07);
+    border-radius: 8px;
+  }
+  h1, h2, h3 {
+    color: #1a5276; /* Darker shade of blue */
+    border-bottom: 2px solid #aed6f1; /* Lighter blue */
+    padding-bottom: 10px;
+    margin-top: 45px;
+    margin-bottom: 25px;
+    font-weight: 400;
+  }
+  h1 { font-size: 2.4em; font-weight: 700; border-bottom-width: 3px; }
+  h2 { font-size: 1.8em; }
+  h3 { font-size: 1.4em; border-bottom: none; color: #2e86c1; margin-top: 30px; margin-bottom: 15px;}
+  
+  /* Definition List for Summary */
+  dl.summary-list {
+      background-color: #fff;
+      padding: 20px;
+      border-radius: 5px;
+      border: 1px solid #e9ecef;
+      margin-bottom: 30px;
+      display: grid;
+      grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); /* Responsive grid */
+      gap: 15px 30px; /* Row and column gap */
+  }
+  dl.summary-list > div { /* Wrap dt/dd pairs for grid layout */
+      border-bottom: 1px dashed #e9ecef;
+      padding-bottom: 10px;
+  }
+  dl.summary-list dt {
+      font-weight: 700; /* Bolder terms */
+      color: #1a5276;
+      margin-bottom: 5px;
+      font-size: 0.95em;
+  }
+  dl.summary-list dd {
+      margin-left: 0; /* Reset default margin */
+      font-size: 1.1em;
+      color: #566573;
+  }
+
+  /* Plotly Div Styling */
+  .plotly-graph-div {
+    /* Removed specific styles, rely on wrapper */
+    max-width: 100%; /* Ensure plot div respects container */
+    height: auto; /* Allow height to adjust */
+    box-sizing: border-box; /* Include padding/border in width/height */
+  }
+  /* New Wrapper for Plots */
+  .plot-container {
+      margin: 25px auto 50px auto; /* Center and provide vertical spacing */
+      padding: 10px;
+      background-color: #fdfdfe;
+      border: 1px solid #e9ecef;
+      border-radius: 6px;
+      box-shadow: 0 3px 6px rgba(0,0,0,0.05);
+      max-width: 98%; /* Slightly less than 100% to avoid edge issues */
+      overflow: hidden; /* Prevent plot spilling out */
+  }
+
+  p {
+      margin-bottom: 20px;
+      color: #566573;
+      font-size: 1.05em;
+  }
+  a { color: #2e86c1; text-decoration: none; font-weight: 400;}
+  a:hover { text-decoration: underline; }
+</style>
+"""
+
+# How reports load plotly.js: 'inline' embeds the bundle once per report, 'shared' writes it
+# once next to the reports and references it by relative path, 'cdn' loads it from the
+# network. 'inline' and 'shared' work offline.
+PLOTLYJS_MODES = ("inline", "shared", "cdn")
+
+# Figure configuration passed to Plotly.newPlot
+FIGURE_CONFIG = '{"responsive": true}'
+
+@lru_cache(maxsize=1)
+def plotlyjs_bundle():
+    """Return the plotly.js source shipped with the plotly package, read once per process."""
+    return get_plotlyjs()
+
+@lru_cache(maxsize=1)
+def _inline_script():
+    # Encoded once, so inlining the ~5 MB bundle costs one memory copy per report
+    return f'<script type="text/javascript">{plotlyjs_bundle()}</script>'.encode('utf-8')
+
+def figure_json(fig):
+    """Serialise a figure (data, layout and any frames) to JSON, skipping plotly.io's validation pass."""
+    return to_json_plotly(fig.to_plotly_json())
+
+class ReportBuilder:
+    """Build static HTML simulation reports quickly and without network access.
+
+    plotly.js is loaded from the plotly package once per process and either inlined once
+    per report or written once per output directory and shared by every report in it.
+    Figures are serialised once each, in the calling process by default or across a process
+    pool for reports with many large figures (JSON encoding holds the GIL, so threads would
+    not help), and each report is assembled in memory and written with a single buffered
+    write.
+    """
+    def __init__(self, output_dir="reports", plotlyjs="shared", executor="serial", max_workers=None):
+        """Initialize the builder.
+
+        Args:
+            output_dir (str): Directory the reports (and the shared bundle) are written to.
+            plotlyjs (str): One of PLOTLYJS_MODES.
+            executor (str): "serial" to serialise figures in the calling process, or "process"
+                            to spread them over a process pool (worth it only when figures are
+                            large enough to outweigh pickling them to the workers).
+            max_workers (int, optional): Process pool size. Defaults to os.cpu_count(); 1
+                                         serialises in the calling process.
+        """
+        if plotlyjs not in PLOTLYJS_MODES:
+            raise ValueError(f"Unknown plotlyjs mode '{plotlyjs}'; expected one of {PLOTLYJS_MODES}")
+        if executor not in ("serial", "process"):
+            raise ValueError(f"Unknown executor '{executor}'; expected 'serial' or 'process'")
+        self.output_dir = output_dir
+        self.plotlyjs = plotlyjs
+        self.executor = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def write_report(self, analyzer, filename=None):
+        """Write one analyzer's report and return its path."""
+        return self.write_reports([analyzer], [filename])[0]
+
+    def write_reports(self, analyzers, filenames=None):
+        """Write a report per analyzer, sharing one plotly.js bundle and one serialisation pass.
+
+        Args:
+            analyzers (list): DigitalAnalysisEngine instances with figures already created.
+            filenames (list, optional): Report file names; None entries default to
+                                        "simulation_report_<scenario_name>.html".
+
+        Returns:
+            list: Paths of the written reports.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        filenames = filenames or [None] * len(analyzers)
+        script_tag = self._script_tag()
+
+        figures = [(i, name, fig) for i, analyzer in enumerate(analyzers) for name, fig in analyzer.figures.items()]
+        serialised = self._serialise([fig for _, _, fig in figures])
+        per_report = [[] for _ in analyzers]
+        for (i, name, _), fig_json in zip(figures, serialised):
+            per_report[i].append((name, fig_json))
+
+        paths = []
+        for i, (analyzer, filename) in enumerate(zip(analyzers, filenames)):
+            filename = filename or f"simulation_report_{analyzer.scenario_name}.html"
+            path = os.path.join(self.output_dir, filename)
+            parts = self._render(analyzer, per_report[i], script_tag, prefix=f"fig{i}")
+            with open(path, 'wb', buffering=1 << 20) as f:
+                f.writelines(part if isinstance(part, bytes) else part.encode('utf-8') for part in parts)
+            logger.info("HTML report saved to %s", path)
+            paths.append(path)
+        return paths
+
+    def _serialise(self, figures):
+        if self.executor == "serial" or self.max_workers == 1 or len(figures) < 2:
+            return [figure_json(fig) for fig in figures]
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(figures))) as executor:
+            return list(executor.map(figure_json, figures))
+
+    def _script_tag(self):
+        if self.plotlyjs == "inline":
+            return _inline_script()
+        version = get_plotlyjs_version()
+        if self.plotlyjs == "cdn":
+            return f'<script src="https://cdn.plot.ly/plotly-{version}.min.js" charset="utf-8"></script>'
+        bundle_name = f"plotly-{version}.min.js"
+        bundle_path = os.path.join(self.output_dir, bundle_name)
+        bundle = plotlyjs_bundle()
+        if not os.path.exists(bundle_path) or os.path.getsize(bundle_path) != len(bundle.encode('utf-8')):
+            tmp_path = f"{bundle_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(bundle)
+            os.replace(tmp_path, bundle_path)
+            logger.debug("Wrote shared plotly.js bundle to %s", bundle_path)
+        return f'<script src="{bundle_name}" charset="utf-8"></script>'
+
+    @staticmethod
+    def _render(analyzer, figures, script_tag, prefix):
+        """Return the report HTML as a list of parts (str, or bytes for the inlined bundle)."""
+        results = analyzer.results
+        scenario_name = escape(str(analyzer.scenario_name))
+        parts = [
+            "<!DOCTYPE html><html><head>",
+            f'<meta charset="UTF-8"><title>Simulation Report: {scenario_name}</title>',
+            REPORT_CSS,
+            script_tag,
+            "</head><body>",
+            '<div class="container">',
+            "<h1>Digital Transformation Simulation Report</h1>",
+            f"<h2>Scenario: {scenario_name}</h2>",
+        ]
+        if results.empty:
+            parts.append("<p>No results data available.</p>")
+        else:
+            parts.append(f"<p>Simulation Period: <strong>{results.index.min()} - {results.index.max()}</strong></p>")
+            parts.append(f"<h2>Final Year State Summary ({results.index[-1]})</h2>")
+            final_state = results.iloc[-1]
+            cols_to_show = [col for col in final_state.index if not col.endswith('_norm')]
+            parts.append('<dl class="summary-list">')
+            for col in cols_to_show[:30]: # Limit items shown
+                value = final_state[col]
+                try:
+                    value_str = f"{float(value):,.3f}" if isinstance(value, (int, float)) else str(value)
+                except (ValueError, TypeError):
+                    value_str = str(value)
+                parts.append(f"<div><dt>{col.replace('_', ' ').title()}</dt><dd>{value_str}</dd></div>")
+            parts.append("</dl>")
+
+        parts.append("<h2>Visualizations</h2>")
+        if not figures:
+            parts.append("<p>No figures were generated.</p>")
+        for n, (name, fig_json) in enumerate(figures):
+            div_id = f"{prefix}-{n}"
+            parts.append(f"<h3>{name.replace('_', ' ').title()}</h3>")
+            parts.append(
+                f'<div class="plot-container"><div id="{div_id}" class="plotly-graph-div" '
+                f'style="height:100%; width:100%;"></div>'
+                f'<script type="text/javascript">(function() {{ var figure = {fig_json}; '
+                f'Plotly.newPlot("{div_id}", figure.data, figure.layout, {FIGURE_CONFIG}); }})();</script></div>'
+            )
+        parts.append("</div></body></html>")
+        return parts
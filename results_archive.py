@@ -0,0 +1,126 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from scenario_cube import DEFAULT_QUANTILES, replica_quantiles
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_VERSION = 1
+
+class ResultsArchive:
+    """Read-only, memory-mapped store of many simulation runs with precomputed summaries.
+
+    An archive directory holds:
+        meta.json   years, metrics, scenario groups, quantile levels and run metadata
+        values.npy  (metric, run, year) float64, so one metric across runs is contiguous
+        bands.npy   (metric, group, year, quantile): per-scenario quantiles across runs
+    Both arrays are opened with mmap_mode='r', so opening is instant regardless of size,
+    pages are shared between server processes, and readers never compute anything:
+    every query is a slice.
+    """
+    def __init__(self, path):
+        """Open an archive written by ResultsArchive.write.
+
+        Args:
+            path (str): Archive directory.
+        """
+        self.path = path
+        with open(os.path.join(path, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported results archive version {meta.get('version')} in {path}")
+        self.years = np.asarray(meta['years'])
+        self.metrics = meta['metrics']
+        self.groups = meta['groups']
+        self.quantiles = meta['quantiles']
+        self.runs = pd.DataFrame(meta['runs'])
+        self.values = np.load(os.path.join(path, "values.npy"), mmap_mode='r')
+        self.bands = np.load(os.path.join(path, "bands.npy"), mmap_mode='r')
+        self._metric_pos = {m: i for i, m in enumerate(self.metrics)}
+        self._group_pos = {g: i for i, g in enumerate(self.groups)}
+        self.group_sizes = self.runs.groupby('group', sort=False).size().reindex(self.groups).to_numpy()
+
+    @staticmethod
+    def write(path, runs, quantiles=DEFAULT_QUANTILES):
+        """Write runs to an archive directory, precomputing per-group quantile bands.
+
+        Args:
+            path (str): Archive directory (created if needed; existing files are replaced).
+            runs (list): (run_id, group, results) tuples. results is a year-indexed DataFrame
+                         such as BangladeshDigitalTransformationSimulation.results_dataframe();
+                         group is the scenario label runs are summarised under.
+            quantiles (sequence): Quantile levels stored for each group.
+
+        Returns:
+            ResultsArchive: The opened archive.
+        """
+        years = np.unique(np.concatenate([frame.index.to_numpy() for _, _, frame in runs]))
+        metrics = list(dict.fromkeys(m for _, _, frame in runs for m in frame.columns))
+        values = np.full((len(metrics), len(runs), len(years)), np.nan)
+        for r, (_, _, frame) in enumerate(runs):
+            block = frame.reindex(index=years, columns=metrics).to_numpy(dtype=float)
+            values[:, r, :] = block.T
+        groups = list(dict.fromkeys(group for _, group, _ in runs))
+        run_groups = np.array([groups.index(group) for _, group, _ in runs])
+        return ResultsArchive._write_arrays(path, values, years, metrics, groups, run_groups,
+                                            [str(run_id) for run_id, _, _ in runs], quantiles)
+
+    @staticmethod
+    def write_cube(path, cube, quantiles=DEFAULT_QUANTILES):
+        """Write every replica of a ScenarioCube as a run, grouped by scenario."""
+        n_scenarios, n_replicas = cube.data.shape[:2]
+        values = np.ascontiguousarray(cube.data.transpose(3, 0, 1, 2)).reshape(
+            len(cube.metrics), n_scenarios * n_replicas, len(cube.years))
+        run_groups = np.repeat(np.arange(n_scenarios), n_replicas)
+        run_ids = [f"{scenario}/{replica}" for scenario in cube.scenarios for replica in range(n_replicas)]
+        return ResultsArchive._write_arrays(path, values, cube.years, cube.metrics, list(cube.scenarios),
+                                            run_groups, run_ids, quantiles)
+
+    @staticmethod
+    def _write_arrays(path, values, years, metrics, groups, run_groups, run_ids, quantiles):
+        os.makedirs(path, exist_ok=True)
+        quantiles = sorted(quantiles)
+        bands = np.full((len(metrics), len(groups), len(years), len(quantiles)), np.nan)
+        for g in range(len(groups)):
+            # Runs are axis 1 of the (metric, run, year) block, as replica_quantiles expects
+            bands[:, g] = replica_quantiles(values[:, run_groups == g, :], quantiles)
+        for name, array in (("values.npy", values), ("bands.npy", bands)):
+            tmp_path = os.path.join(path, f"{name}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_path, os.path.join(path, name))
+        meta = {
+            'version': ARCHIVE_VERSION,
+            'years': [int(y) for y in years],
+            'metrics': list(metrics),
+            'groups': list(groups),
+            'quantiles': list(quantiles),
+            'runs': {'run_id': list(run_ids), 'group': [groups[g] for g in run_groups]},
+        }
+        tmp_path = os.path.join(path, "meta.json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(path, "meta.json"))
+        logger.info("Wrote results archive with %s runs x %s metrics x %s years to %s",
+                    len(run_ids), len(metrics), len(years), path)
+        return ResultsArchive(path)
+
+    def year_slice(self, first=None, last=None):
+        """Slice of the year axis covering [first, last]."""
+        start = 0 if first is None else int(np.searchsorted(self.years, first, side='left'))
+        stop = len(self.years) if last is None else int(np.searchsorted(self.years, last, side='right'))
+        return slice(start, stop)
+
+    def group_bands(self, metric, groups, first=None, last=None):
+        """Precomputed quantile bands of a metric for some groups: array (groups, years, quantiles)."""
+        years = self.year_slice(first, last)
+        rows = [self._group_pos[g] for g in groups]
+        return self.bands[self._metric_pos[metric], rows, years]
+
+    def run_values(self, metric, run_positions, first=None, last=None):
+        """Trajectories of a metric for runs given by position in self.runs: array (runs, years)."""
+        return self.values[self._metric_pos[metric], run_positions, self.year_slice(first, last)]
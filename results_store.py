@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+class ResultsSchema:
+    """Map metric names ("<prefix>_<key>") to column indices of a results buffer.
+
+    Column indices for a model's state are resolved once per (prefix, state keys) layout
+    and cached, so writing a year of results needs no string formatting.
+    """
+    def __init__(self):
+        self.columns = {} # metric name -> column index
+        self._layouts = {} # (prefix, state keys) -> column index array
+
+    def __len__(self):
+        return len(self.columns)
+
+    @property
+    def names(self):
+        """Metric names in column order."""
+        return list(self.columns)
+
+    def indices_for(self, prefix, keys):
+        """Return the column indices for a model's state keys, registering new metrics.
+
+        Args:
+            prefix (str): Result prefix of the model (e.g. "infra").
+            keys (tuple): State keys in the order the model returns them.
+        """
+        layout = self._layouts.get((prefix, keys))
+        if layout is None:
+            layout = np.array(
+                [self.columns.setdefault(f"{prefix}_{k}", len(self.columns)) for k in keys],
+                dtype=np.intp,
+            )
+            self._layouts[(prefix, keys)] = layout
+        return layout
+
+    def indices_for_layout(self, layout):
+        """Return the column indices for several models' states written together.
+
+        Args:
+            layout (tuple): (prefix, state keys) pairs in write order.
+        """
+        indices = self._layouts.get(layout)
+        if indices is None:
+            indices = np.concatenate([self.indices_for(prefix, keys) for prefix, keys in layout])
+            self._layouts[layout] = indices
+        return indices
+
+class ColumnarResults:
+    """Preallocated, column-major NumPy buffer holding one row of metrics per simulated year.
+
+    The buffer is Fortran-ordered so each metric is a contiguous column, and to_dataframe()
+    wraps it as a DataFrame view without copying.
+    """
+    def __init__(self, expected_years=0, expected_metrics=64):
+        """Initialize an empty results buffer.
+
+        Args:
+            expected_years (int): Rows to preallocate; the buffer grows if more are added.
+            expected_metrics (int): Columns to preallocate; the buffer grows if more are registered.
+        """
+        self.schema = ResultsSchema()
+        self.n_rows = 0
+        self._years = np.empty(max(expected_years, 1), dtype=np.int64)
+        self._data = np.full((max(expected_years, 1), expected_metrics), np.nan, order='F')
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def years(self):
+        """Years of the rows written so far."""
+        return self._years[:self.n_rows]
+
+    @property
+    def data(self):
+        """View of the written block, shape (rows, metrics)."""
+        return self._data[:self.n_rows, :len(self.schema)]
+
+    def reserve(self, n_rows):
+        """Make room for at least n_rows more rows without further reallocation."""
+        self._grow(self.n_rows + n_rows, self._data.shape[1])
+
+    def add_row(self, year):
+        """Append an empty row for `year` and return its row index."""
+        if self.n_rows == self._data.shape[0]:
+            self._grow(2 * self.n_rows, self._data.shape[1])
+        row = self.n_rows
+        self._years[row] = year
+        self.n_rows += 1
+        return row
+
+    def write_states(self, row, states):
+        """Write every model's state for one year into a row with a single buffer assignment.
+
+        Args:
+            row (int): Row index returned by add_row.
+            states (dict): Mapping of result prefix to the model's state dict, as returned
+                           by BangladeshDigitalTransformationSimulation.simulate_year.
+        """
+        layout = tuple((prefix, tuple(state)) for prefix, state in states.items())
+        columns = self.schema.indices_for_layout(layout)
+        if len(self.schema) > self._data.shape[1]:
+            self._grow(self._data.shape[0], 2 * len(self.schema))
+        self._data[row, columns] = [v for state in states.values() for v in state.values()]
+
+    def truncate(self, n_rows):
+        """Discard every row from index n_rows on, so later add_row calls overwrite them."""
+        n_rows = min(n_rows, self.n_rows)
+        self._data[n_rows:self.n_rows] = np.nan
+        self.n_rows = n_rows
+
+    def _grow(self, rows, cols):
+        rows = max(rows, self._data.shape[0])
+        cols = max(cols, self._data.shape[1])
+        if (rows, cols) == self._data.shape:
+            return
+        data = np.full((rows, cols), np.nan, order='F')
+        data[:self.n_rows, :self._data.shape[1]] = self._data[:self.n_rows]
+        years = np.empty(rows, dtype=np.int64)
+        years[:self.n_rows] = self._years[:self.n_rows]
+        self._data, self._years = data, years
+
+    def __getstate__(self):
+        # Only the written block is pickled, keeping checkpoints compact
+        state = self.__dict__.copy()
+        state['_data'] = np.asfortranarray(self.data)
+        state['_years'] = self.years.copy()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._data.shape[0] == 0:
+            self._grow(1, max(self._data.shape[1], 1))
+
+    def to_dataframe(self):
+        """Return the results as a DataFrame indexed by year that shares the buffer's memory."""
+        return pd.DataFrame(
+            self.data,
+            index=pd.Index(self.years, name='year'),
+            columns=self.schema.names,
+            copy=False,
+        )
+
+    def to_records(self):
+        """Return the results as a list of per-year dicts (the results_history format)."""
+        names = self.schema.names
+        return [
+            {'year': int(year), **dict(zip(names, row))}
+            for year, row in zip(self.years.tolist(), self.data.tolist())
+        ]
@@ -0,0 +1,151 @@
+import copy
+
+import pandas as pd
+
+from simulation import MODEL_ATTRIBUTES
+from ensemble import EnsembleSimulation
+from model_state import capture_state, restore_state
+from results_store import ColumnarResults
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+class SimulationBranch:
+    """One node of a copy-on-write scenario branching tree.
+
+    A branch owns a simulation whose results store only holds the years simulated on this
+    branch. Earlier years are read from the parent chain, so forked children share the
+    common history instead of copying it. Forking copies only the models' current state
+    (a few dozen values per model). The last child takes over the parent's model objects
+    without copying them, because a forked parent is frozen. Every child starts with its own
+    year checkpoints (rewinding is limited to years simulated on the branch), solver and
+    time-stepper logs and instrumentation records.
+    """
+    def __init__(self, sim, label="root", parent=None, fork_year=None):
+        """Initialize a branch around a simulation.
+
+        Args:
+            sim (BangladeshDigitalTransformationSimulation): The simulation driven by this branch.
+            label (str): Name of the branch, unique among its siblings.
+            parent (SimulationBranch, optional): Branch this one was forked from.
+            fork_year (int, optional): First year simulated on this branch.
+        """
+        if isinstance(sim, EnsembleSimulation):
+            raise TypeError("SimulationBranch drives scalar simulations; fork ensembles via checkpoints instead")
+        self.sim = sim
+        self.label = label
+        self.parent = parent
+        self.fork_year = fork_year if fork_year is not None else sim.start_year
+        self.children = []
+
+    @property
+    def path(self):
+        """Slash-separated labels from the root to this branch, e.g. "root/invest/strict"."""
+        return self.label if self.parent is None else f"{self.parent.path}/{self.label}"
+
+    @property
+    def is_frozen(self):
+        """True once the branch has been forked; its history then ends at the fork year."""
+        return bool(self.children)
+
+    def run_until(self, year):
+        """Simulate this branch up to and including `year`."""
+        if self.is_frozen:
+            raise RuntimeError(f"Branch '{self.path}' has been forked and can no longer advance")
+        if year >= self.sim.next_year:
+            self.sim.run_simulation(year - self.sim.start_year + 1)
+
+    def fork(self, year, lever_sets):
+        """Fork this branch at `year` into one child per lever set.
+
+        The branch is first simulated up to year - 1 if needed. Each child then simulates
+        `year` onwards with its own policy levers.
+
+        Args:
+            year (int): First year simulated by the children.
+            lever_sets (dict): Mapping of child label to either a scenario name from
+                               DigitalPolicyModel.scenario_policy_levers or a dict of lever
+                               values overriding the current ones.
+
+        Returns:
+            list: The child SimulationBranch objects, in lever_sets order.
+        """
+        if self.is_frozen:
+            raise RuntimeError(f"Branch '{self.path}' has already been forked")
+        if year < self.sim.next_year:
+            raise ValueError(f"Cannot fork '{self.path}' at {year}: it has already simulated up to {self.sim.next_year - 1}")
+        self.run_until(year - 1)
+
+        labels = list(lever_sets)
+        for i, label in enumerate(labels):
+            # The last child moves into the parent's models; the others get copies of the current state
+            child_sim = self._spawn_simulation(take_over=(i == len(labels) - 1))
+            levers = lever_sets[label]
+            if isinstance(levers, str):
+                child_sim.digital_policy.set_scenario(levers)
+                child_sim.scenario_name = levers
+            else:
+                child_sim.digital_policy.set_policy_levers(f"{self.path}/{label}", levers)
+                child_sim.scenario_name = f"{self.path}/{label}"
+            self.children.append(SimulationBranch(child_sim, label=label, parent=self, fork_year=year))
+        logger.debug("Forked '%s' at %s into %s", self.path, year, labels)
+        return self.children
+
+    def _spawn_simulation(self, take_over):
+        child = copy.copy(self.sim)
+        child.results_store = ColumnarResults(expected_years=child.end_year - child.next_year + 1)
+        # Per-run bookkeeping must not be shared with the parent or siblings: a shared
+        # checkpoint dict would let one branch rewind into another's states. The scheduler
+        # and step cache stay shared on purpose.
+        if child.year_checkpoints is not None:
+            child.year_checkpoints = {}
+        if child.coupled_solver is not None:
+            child.coupled_solver = copy.copy(child.coupled_solver)
+            child.coupled_solver.convergence_log = []
+        if child.time_stepper is not None:
+            child.time_stepper = copy.copy(child.time_stepper)
+            child.time_stepper.step_log = {}
+            child.time_stepper._scratch_buffers = None
+        if child.instrumentation is not None:
+            child.instrumentation = copy.copy(child.instrumentation)
+            child.instrumentation._records = {}
+            child.instrumentation.profile_result = None
+        child.base_params = {key: dict(params) for key, params in child.base_params.items()}
+        if take_over:
+            return child
+        for model_attr in MODEL_ATTRIBUTES.values():
+            parent_model = getattr(self.sim, model_attr)
+            model = copy.copy(parent_model)
+            restore_state(model, capture_state(parent_model))
+            setattr(child, model_attr, model)
+        return child
+
+    def segment(self):
+        """Results simulated on this branch only, as a DataFrame indexed by year."""
+        return self.sim.results_dataframe()
+
+    def history(self):
+        """Full results from the root's start year to this branch's latest year."""
+        segments = []
+        branch = self
+        while branch is not None:
+            segments.append(branch.segment())
+            branch = branch.parent
+        return pd.concat(reversed(segments))
+
+    def leaves(self):
+        """All branches below (or equal to) this one that have not been forked."""
+        if not self.children:
+            return [self]
+        return [leaf for child in self.children for leaf in child.leaves()]
+
+    def run_leaves(self, year=None):
+        """Simulate every leaf up to `year` (default: the simulation's end_year)."""
+        for leaf in self.leaves():
+            leaf.run_until(year if year is not None else leaf.sim.end_year)
+
+    def leaf_results(self):
+        """Full histories of all leaves, indexed by a (branch, year) MultiIndex."""
+        leaves = self.leaves()
+        return pd.concat([leaf.history() for leaf in leaves], keys=[leaf.path for leaf in leaves],
+                         names=['branch', 'year'])
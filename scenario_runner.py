@@ -0,0 +1,91 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from simulation import BangladeshDigitalTransformationSimulation
+from digital_policy import DigitalPolicyModel
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+def merge_config(base_config, overrides):
+    """Return a copy of base_config with overrides merged in recursively.
+
+    Args:
+        base_config (dict): The shared simulation configuration.
+        overrides (dict): Nested values replacing those in base_config.
+    """
+    merged = copy.deepcopy(base_config)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def build_scenario_grid(base_config, scenario_names, config_overrides=None):
+    """Expand scenario names and config overrides into a list of runnable jobs.
+
+    Args:
+        base_config (dict): The shared simulation configuration.
+        scenario_names (list): Scenario names from DigitalPolicyModel.scenario_policy_levers.
+        config_overrides (dict, optional): Mapping of override label to a nested dict
+            merged into base_config. Every scenario is run once per override set.
+
+    Returns:
+        list: (label, scenario_name, config) tuples. The label is the scenario name, or
+              "scenario/override_label" when overrides are given.
+    """
+    known_scenarios = DigitalPolicyModel({}).scenario_policy_levers
+    unknown = [name for name in scenario_names if name not in known_scenarios]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s) {unknown}; expected one of {list(known_scenarios)}")
+
+    if not config_overrides:
+        return [(name, name, base_config) for name in scenario_names]
+    return [
+        (f"{name}/{override_label}", name, merge_config(base_config, overrides))
+        for name in scenario_names
+        for override_label, overrides in config_overrides.items()
+    ]
+
+def _run_scenario_job(job):
+    """Run one (label, scenario_name, config, years) job. Executed in worker processes."""
+    label, scenario_name, config, years = job
+    sim = BangladeshDigitalTransformationSimulation(config, scenario_name=scenario_name)
+    sim.run_simulation(years)
+    return label, sim.results_dataframe()
+
+def run_scenario_batch(base_config, scenario_names, config_overrides=None, max_workers=None, years=None):
+    """Run a grid of scenarios across a process pool and gather the results.
+
+    Args:
+        base_config (dict): The shared simulation configuration.
+        scenario_names (list): Scenario names from DigitalPolicyModel.scenario_policy_levers.
+        config_overrides (dict, optional): Mapping of override label to a nested dict merged
+            into base_config (see build_scenario_grid).
+        max_workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+            With max_workers=1 the runs execute in the calling process.
+        years (int, optional): Number of years to simulate per run.
+
+    Returns:
+        pd.DataFrame: Results indexed by a (scenario, year) MultiIndex.
+    """
+    grid = build_scenario_grid(base_config, scenario_names, config_overrides)
+    jobs = [(label, name, config, years) for label, name, config in grid]
+    max_workers = max_workers or os.cpu_count() or 1
+
+    logger.info("Running %s scenario job(s) on %s worker(s)...", len(jobs), max_workers)
+    if max_workers == 1 or len(jobs) == 1:
+        outputs = [_run_scenario_job(job) for job in jobs]
+    else:
+        # Hand each worker a few jobs per round trip so IPC overhead stays small on big grids
+        chunksize = max(1, len(jobs) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            outputs = list(executor.map(_run_scenario_job, jobs, chunksize=chunksize))
+
+    labels = [label for label, _ in outputs]
+    frames = [frame for _, frame in outputs]
+    return pd.concat(frames, keys=labels, names=['scenario', 'year'])
@@ -1,9 +1,31 @@
+import numpy as np
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named coefficients of the yearly dynamics. Override them through config['model_params']['sectoral'];
+# in an EnsembleSimulation a value may also be an array with one entry per replica.
+DEFAULT_PARAMS = {
+    'agri_growth': 1.05,       # Base yearly growth factor of precision farming adoption
+    'agri_sensitivity': 0.1,   # Extra growth per unit of broadband x tech adoption
+    'mfg_growth': 1.1,         # Base yearly growth factor of industrial IoT adoption
+    'mfg_sensitivity': 0.15,   # Extra growth per unit of broadband x skills x tech adoption
+    'health_growth': 1.12,     # Base yearly growth factor of telemedicine penetration
+    'health_sensitivity': 0.1, # Extra growth per unit of broadband x skills
+    'edu_growth': 1.08,        # Base yearly growth factor of school LMS adoption
+    'edu_sensitivity': 0.08,   # Extra growth per unit of broadband
+    'fin_growth': 1.06,        # Base yearly growth factor of digital banking users
+    'fin_sensitivity': 0.05,   # Extra growth per unit of broadband
+}
+
 class SectoralTransformationModel:
     """Model sector-specific digitalization in key areas of Bangladesh economy."""
     def __init__(self, config):
         """Initialize sectoral transformation parameters using Bangladesh vertical digitalization data."""
-        print("Initializing SectoralTransformationModel...")
+        logger.debug("Initializing SectoralTransformationModel...")
         self.config = config
+        self.params = {name: config.get(name, default) for name, default in DEFAULT_PARAMS.items()}
         # Placeholder attributes - Initialized with illustrative synthetic data for 2025
         self.agriculture = {"precision_farming_adoption": 0.05, "farmer_advisory_access": 0.3}
         self.manufacturing = {"factory_automation_index": 0.2, "industrial_iot_adoption": 0.1, "rmg_digitalization_score": 0.25} # RMG = Ready-Made Garments
@@ -11,9 +33,9 @@ class SectoralTransformationModel:
         self.education = {"lms_adoption_schools": 0.25, "smart_classroom_ratio": 0.05}
         self.finance = {"digital_banking_users_pct": 0.4, "mfs_transaction_volume_bn_usd": 50}
 
-        print("SectoralTransformationModel Initialized.")
+        logger.debug("SectoralTransformationModel Initialized.")
 
-    def simulate_sectoral_dynamics(self, year, infrastructure_state, skills_state, economy_state, emerging_tech_state):
+    def simulate_sectoral_dynamics(self, year, infrastructure_state, skills_state, economy_state, emerging_tech_state, dt=1.0):
         """Simulate one year of sectoral digitalization dynamics.
 
         Args:
@@ -22,20 +44,22 @@ class SectoralTransformationModel:
             skills_state (dict): Current state from DigitalSkillsModel.
             economy_state (dict): Current state from DigitalEconomyModel.
             emerging_tech_state (dict): Current state from EmergingTechnologyModel.
+            dt (float): Step length in years; 1.0 for a whole year, less for sub-annual steps.
         """
-        print(f"Simulating Sectoral Transformation for year {year}...")
+        logger.debug("Simulating Sectoral Transformation for year %s...", year)
+        params = self.params
         # Placeholder logic: Increase adoption based on infra, skills, tech availability, and overall economy
         infra_factor = infrastructure_state.get("broadband_penetration", 0.3)
         skills_factor = skills_state.get("relevant_sector_skill", 0.2)
         tech_factor = emerging_tech_state.get("relevant_tech_adoption", 0.1)
 
-        self.agriculture["precision_farming_adoption"] = min(1.0, self.agriculture["precision_farming_adoption"] * (1.05 + 0.1 * infra_factor * tech_factor))
-        self.manufacturing["industrial_iot_adoption"] = min(1.0, self.manufacturing["industrial_iot_adoption"] * (1.1 + 0.15 * infra_factor * skills_factor * tech_factor))
-        self.healthcare["telemedicine_penetration"] = min(1.0, self.healthcare["telemedicine_penetration"] * (1.12 + 0.1 * infra_factor * skills_factor))
-        self.education["lms_adoption_schools"] = min(1.0, self.education["lms_adoption_schools"] * (1.08 + 0.08 * infra_factor))
-        self.finance["digital_banking_users_pct"] = min(1.0, self.finance["digital_banking_users_pct"] * (1.06 + 0.05 * infra_factor))
+        self.agriculture["precision_farming_adoption"] = np.minimum(1.0, self.agriculture["precision_farming_adoption"] * (params["agri_growth"] + params["agri_sensitivity"] * infra_factor * tech_factor) ** dt)
+        self.manufacturing["industrial_iot_adoption"] = np.minimum(1.0, self.manufacturing["industrial_iot_adoption"] * (params["mfg_growth"] + params["mfg_sensitivity"] * infra_factor * skills_factor * tech_factor) ** dt)
+        self.healthcare["telemedicine_penetration"] = np.minimum(1.0, self.healthcare["telemedicine_penetration"] * (params["health_growth"] + params["health_sensitivity"] * infra_factor * skills_factor) ** dt)
+        self.education["lms_adoption_schools"] = np.minimum(1.0, self.education["lms_adoption_schools"] * (params["edu_growth"] + params["edu_sensitivity"] * infra_factor) ** dt)
+        self.finance["digital_banking_users_pct"] = np.minimum(1.0, self.finance["digital_banking_users_pct"] * (params["fin_growth"] + params["fin_sensitivity"] * infra_factor) ** dt)
 
-        print(f"Finished Simulating Sectoral Transformation for year {year}.")
+        logger.debug("Finished Simulating Sectoral Transformation for year %s.", year)
         return {
             "agri_digital_index": self.agriculture["precision_farming_adoption"],
             "mfg_digital_index": self.manufacturing["industrial_iot_adoption"],
@@ -45,5 +69,5 @@ class SectoralTransformationModel:
         }
 
     # Placeholder for the method name mentioned in the prompt
-    def simulate_step(self, year, infrastructure_state, skills_state, economy_state, emerging_tech_state):
-        return self.simulate_sectoral_dynamics(year, infrastructure_state, skills_state, economy_state, emerging_tech_state) 
\ No newline at end of file
+    def simulate_step(self, year, infrastructure_state, skills_state, economy_state, emerging_tech_state, dt=1.0):
+        return self.simulate_sectoral_dynamics(year, infrastructure_state, skills_state, economy_state, emerging_tech_state, dt) 
\ No newline at end of file
@@ -0,0 +1,318 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from ensemble import EnsembleSimulation
+from maturity_index import MaturityIndex
+from scenario_runner import merge_config
+from simulation import MODEL_PARAMETERS
+from sim_logging import get_logger
+
+try:
+    from scipy.stats import qmc # Scrambled Sobol' sequences for the Saltelli base samples
+except ImportError:
+    qmc = None
+
+logger = get_logger(__name__)
+
+# Output name of the composite digital maturity index, computed per replica from the results.
+# Metrics are normalised to the run's start year: per-run min-max scaling would put every
+# run's final year at the top of its own range, so values would not compare across runs.
+COMPOSITE_OUTPUT = 'composite_digital_maturity'
+
+def parameter_defaults(parameters=None):
+    """Return {"<key>.<name>": default} for the given parameter paths (all parameters if None).
+
+    Args:
+        parameters (list, optional): Paths such as "sectoral.health_growth".
+    """
+    defaults = {f"{key}.{name}": value for key, params in MODEL_PARAMETERS.items() for name, value in params.items()}
+    if parameters is None:
+        return defaults
+    unknown = [path for path in parameters if path not in defaults]
+    if unknown:
+        raise ValueError(f"Unknown model parameter(s) {unknown}; expected '<model key>.<name>' from MODEL_PARAMETERS")
+    return {path: defaults[path] for path in parameters}
+
+def parameter_overrides(parameters, values):
+    """Nest parameter values into config overrides.
+
+    Model parameter paths "<key>.<name>" go to {'model_params': {key: {name: value}}};
+    initial state paths "model_attribute.state_dict.key" go to {'initial_state': {path: value}};
+    policy lever paths "levers.<lever>" go to {'policy_levers': {lever: value}}.
+
+    Args:
+        parameters (list): Parameter paths.
+        values (sequence): One value (scalar or per-replica array) per path.
+    """
+    overrides = {}
+    for path, value in zip(parameters, values):
+        if path.count(".") == 2:
+            overrides.setdefault('initial_state', {})[path] = value
+        elif path.startswith("levers."):
+            overrides.setdefault('policy_levers', {})[path.split(".", 1)[1]] = value
+        else:
+            key, name = path.split(".", 1)
+            overrides.setdefault('model_params', {}).setdefault(key, {})[name] = value
+    return overrides
+
+def _evaluate_batch(job):
+    """Run one batch of parameter sets as an ensemble. Executed in worker processes."""
+    config, scenario_name, parameters, values, start, years, outputs = job
+    config = merge_config(config, parameter_overrides(parameters, values.T))
+    sim = EnsembleSimulation(config, scenario_name=scenario_name, replicas=len(values), replica_offset=start)
+    results = sim.run_simulation(years)
+    if COMPOSITE_OUTPUT in outputs:
+        index = MaturityIndex(normalisation="reference_year", reference_year=sim.start_year)
+        results = {**results, COMPOSITE_OUTPUT: index.replica_composite(results)}
+    missing = [metric for metric in outputs if metric not in results]
+    if missing:
+        raise KeyError(f"Output metric(s) {missing} not produced by the simulation")
+    return np.stack([results[metric][years - 1] for metric in outputs], axis=1)
+
+def evaluate_parameter_sets(config, scenario_name, parameters, values, outputs, years, batch_size=20000, max_workers=None):
+    """Simulate many parameter sets in batches and return their outputs in the final year.
+
+    Each batch is one EnsembleSimulation whose parameters are arrays with one value per
+    replica; batches run on a process pool when there are several.
+
+    Args:
+        config (dict): Base simulation configuration.
+        scenario_name (str): Policy scenario to run.
+        parameters (list): Parameter paths (see parameter_overrides).
+        values (np.ndarray): Parameter values of shape (n, len(parameters)).
+        outputs (list): Result metrics, optionally including 'composite_digital_maturity'
+                        (see COMPOSITE_OUTPUT).
+        years (int): Number of years simulated from start_year; outputs are read in the last.
+        batch_size (int): Maximum parameter sets per ensemble.
+        max_workers (int, optional): Worker processes. Defaults to os.cpu_count().
+
+    Returns:
+        np.ndarray: Outputs of shape (n, len(outputs)).
+    """
+    values = np.asarray(values, dtype=float)
+    jobs = [
+        (config, scenario_name, list(parameters), values[start:start + batch_size], start, years, list(outputs))
+        for start in range(0, len(values), batch_size)
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    logger.info("Evaluating %s parameter sets in %s batch(es) on %s worker(s)...", len(values), len(jobs), workers)
+    if workers <= 1:
+        blocks = [_evaluate_batch(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            blocks = list(executor.map(_evaluate_batch, jobs))
+    return np.concatenate(blocks)
+
+class SensitivityAnalysis:
+    """Global sensitivity analysis of simulation outputs to the models' named parameters.
+
+    Parameter sets are drawn in the unit hypercube (Saltelli designs for Sobol' indices,
+    Morris trajectories for elementary effects), scaled to the parameter bounds and
+    evaluated in batches: each batch is one EnsembleSimulation whose model_params are
+    arrays with one value per replica, so a whole batch advances in a single vectorised
+    pass per model step. Batches run on a process pool. Every output metric is analysed
+    from the same evaluations.
+    """
+    def __init__(self, config, parameters=None, bounds=None, outputs=None, scenario_name="baseline",
+                 year=None, relative_range=0.1, batch_size=20000, max_workers=None):
+        """Set up the analysis.
+
+        Args:
+            config (dict): Base simulation configuration.
+            parameters (list, optional): Parameter paths "<key>.<name>" (see MODEL_PARAMETERS).
+                                         Defaults to every named parameter.
+            bounds (dict, optional): Path -> (low, high). Parameters without bounds vary by
+                                     +/- relative_range around their default.
+            outputs (list, optional): Result metrics to analyse (e.g. "sectoral_health_digital_index",
+                                      or 'composite_digital_maturity'). Defaults to every metric
+                                      of the simulation.
+            scenario_name (str): Policy scenario to run.
+            year (int, optional): Year whose outputs are analysed. Defaults to config end_year.
+            relative_range (float): Default half-width of the bounds relative to the default value.
+            batch_size (int): Maximum parameter sets (ensemble replicas) per batch.
+            max_workers (int, optional): Worker processes. Defaults to os.cpu_count(); with 1 the
+                                         batches run in the calling process.
+        """
+        defaults = parameter_defaults(parameters)
+        bounds = bounds or {}
+        unknown = sorted(set(bounds) - set(defaults))
+        if unknown:
+            raise ValueError(f"Bounds given for parameters outside the analysis: {unknown}")
+        self.config = config
+        self.parameters = list(defaults)
+        self.bounds = np.array([
+            bounds[path] if path in bounds else sorted((value * (1 - relative_range), value * (1 + relative_range)))
+            for path, value in defaults.items()
+        ], dtype=float)
+        if (self.bounds[:, 1] <= self.bounds[:, 0]).any():
+            raise ValueError("Every parameter needs bounds with low < high")
+        self.scenario_name = scenario_name
+        start_year = config.get('start_year', 2025)
+        self.year = config.get('end_year', 2035) if year is None else year
+        self.years = self.year - start_year + 1
+        self.outputs = outputs
+        self.batch_size = batch_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @property
+    def n_parameters(self):
+        return len(self.parameters)
+
+    def scale(self, unit_samples):
+        """Map samples from the unit hypercube to parameter values, shape (n, n_parameters)."""
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return low + unit_samples * (high - low)
+
+    def evaluate(self, values):
+        """Run the simulation for every parameter set.
+
+        Args:
+            values (np.ndarray): Parameter values of shape (n, n_parameters).
+
+        Returns:
+            pd.DataFrame: One row per parameter set, one column per output metric.
+        """
+        if self.outputs is None:
+            self.outputs = self._default_outputs()
+        outputs = evaluate_parameter_sets(self.config, self.scenario_name, self.parameters, values, self.outputs,
+                                          self.years, self.batch_size, self.max_workers)
+        return pd.DataFrame(outputs, columns=self.outputs)
+
+    def _default_outputs(self):
+        sim = EnsembleSimulation(self.config, scenario_name=self.scenario_name, replicas=1)
+        return [metric for metric in sim.run_simulation(1) if metric != 'year']
+
+    def saltelli_sample(self, n, seed=None):
+        """Saltelli design for first-order and total Sobol' indices.
+
+        Args:
+            n (int): Base sample size; the design has n * (n_parameters + 2) rows. Powers of
+                     two keep the Sobol' sequence balanced.
+            seed (int, optional): Seed for the scrambled sequence (or the random fallback).
+
+        Returns:
+            np.ndarray: Unit-hypercube rows stacked as [A, B, AB_1, ..., AB_d], where AB_i is A
+                        with column i taken from B.
+        """
+        d = self.n_parameters
+        if qmc is not None:
+            base = qmc.Sobol(d=2 * d, scramble=True, seed=seed).random(n)
+        else:
+            logger.debug("scipy is not installed; drawing Saltelli base samples at random")
+            base = np.random.default_rng(seed).random((n, 2 * d))
+        a, b = base[:, :d], base[:, d:]
+        ab = np.repeat(a[np.newaxis], d, axis=0)
+        ab[np.arange(d), :, np.arange(d)] = b.T
+        return np.concatenate([a, b, ab.reshape(d * n, d)])
+
+    def sobol(self, n=1024, seed=None, confidence=0.95, resamples=100):
+        """First-order and total Sobol' indices of every output.
+
+        Uses the Saltelli (2010) estimator for first-order and the Jansen estimator for total
+        indices, with bootstrap confidence half-widths. Costs n * (n_parameters + 2) runs.
+
+        Args:
+            n (int): Base sample size.
+            seed (int, optional): Seed for sampling and bootstrap.
+            confidence (float): Level of the reported confidence intervals.
+            resamples (int): Bootstrap resamples (0 disables the intervals).
+
+        Returns:
+            pd.DataFrame: Indexed by (output, parameter) with columns S1, S1_conf, ST, ST_conf.
+        """
+        d = self.n_parameters
+        y = self.evaluate(self.scale(self.saltelli_sample(n, seed))).to_numpy()
+        f_a, f_b, f_ab = y[:n], y[n:2 * n], y[2 * n:].reshape(d, n, -1)
+
+        s1, st = _sobol_estimates(f_a, f_b, f_ab)
+        s1_conf = st_conf = np.full_like(s1, np.nan)
+        if resamples:
+            rng = np.random.default_rng(seed)
+            draws = [_sobol_estimates(f_a[idx], f_b[idx], f_ab[:, idx]) for idx in rng.integers(0, n, (resamples, n))]
+            z = NormalDist().inv_cdf(0.5 + confidence / 2)
+            s1_conf = z * np.std([draw[0] for draw in draws], axis=0, ddof=1)
+            st_conf = z * np.std([draw[1] for draw in draws], axis=0, ddof=1)
+        return self._frame({'S1': s1, 'S1_conf': s1_conf, 'ST': st, 'ST_conf': st_conf})
+
+    def morris_sample(self, trajectories, levels=4, seed=None):
+        """Morris one-at-a-time trajectories on a grid with the given number of levels.
+
+        Args:
+            trajectories (int): Number of trajectories r; the design has r * (n_parameters + 1) rows.
+            levels (int): Even number of grid levels p; every step moves one parameter by
+                          p / (2 (p - 1)) in unit space.
+            seed (int, optional): Random seed.
+
+        Returns:
+            tuple: (samples of shape (r, n_parameters + 1, n_parameters) in the unit hypercube,
+                    order (r, n_parameters) giving the step at which each parameter moves,
+                    signs (r, n_parameters) of each move).
+        """
+        if levels < 2 or levels % 2:
+            raise ValueError("Morris sampling needs an even number of levels")
+        d = self.n_parameters
+        rng = np.random.default_rng(seed)
+        delta = levels / (2 * (levels - 1))
+        base = rng.integers(0, levels // 2, (trajectories, d)) / (levels - 1)
+        signs = rng.choice([-1.0, 1.0], (trajectories, d))
+        start = base + (signs < 0) * delta # Moving down starts delta higher, so every point stays in [0, 1]
+        order = np.argsort(rng.random((trajectories, d)), axis=1).argsort(axis=1)
+        moved = order[:, np.newaxis, :] < np.arange(d + 1)[np.newaxis, :, np.newaxis]
+        samples = start[:, np.newaxis, :] + delta * signs[:, np.newaxis, :] * moved
+        return samples, order, signs
+
+    def morris(self, trajectories=100, levels=4, seed=None, confidence=0.95, resamples=100):
+        """Morris elementary-effects screening of every output.
+
+        Elementary effects are measured in unit (normalised) parameter space, so they compare
+        across parameters with different ranges. Costs trajectories * (n_parameters + 1) runs.
+
+        Args:
+            trajectories (int): Number of trajectories.
+            levels (int): Even number of grid levels.
+            seed (int, optional): Seed for sampling and bootstrap.
+            confidence (float): Level of the mu_star confidence interval.
+            resamples (int): Bootstrap resamples (0 disables the interval).
+
+        Returns:
+            pd.DataFrame: Indexed by (output, parameter) with columns mu, mu_star, sigma, mu_star_conf.
+        """
+        d = self.n_parameters
+        samples, order, signs = self.morris_sample(trajectories, levels, seed)
+        delta = levels / (2 * (levels - 1))
+        y = self.evaluate(self.scale(samples.reshape(-1, d))).to_numpy().reshape(trajectories, d + 1, -1)
+        steps = np.take_along_axis(y, order[..., np.newaxis] + 1, axis=1) - np.take_along_axis(y, order[..., np.newaxis], axis=1)
+        effects = steps / (signs * delta)[..., np.newaxis] # (r, d, outputs)
+
+        mu_star_conf = np.full(effects.shape[1:], np.nan)
+        if resamples:
+            rng = np.random.default_rng(seed)
+            draws = [np.abs(effects[idx]).mean(axis=0) for idx in rng.integers(0, trajectories, (resamples, trajectories))]
+            mu_star_conf = NormalDist().inv_cdf(0.5 + confidence / 2) * np.std(draws, axis=0, ddof=1)
+        return self._frame({
+            'mu': effects.mean(axis=0),
+            'mu_star': np.abs(effects).mean(axis=0),
+            'sigma': effects.std(axis=0, ddof=1),
+            'mu_star_conf': mu_star_conf,
+        })
+
+    def _frame(self, columns):
+        # Each column is an array of shape (parameters, outputs)
+        index = pd.MultiIndex.from_product([self.outputs, self.parameters], names=['output', 'parameter'])
+        return pd.DataFrame({name: values.T.reshape(-1) for name, values in columns.items()}, index=index)
+
+def _sobol_estimates(f_a, f_b, f_ab):
+    """First-order (Saltelli 2010) and total (Jansen) indices, each of shape (parameters, outputs)."""
+    pooled = np.concatenate([f_a, f_b])
+    variance = pooled.var(axis=0)
+    # Centring f_b leaves the estimator unbiased (E[f_ab - f_a] = 0) but cuts its variance
+    # for outputs whose mean is large relative to their spread
+    centred = f_b - pooled.mean(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s1 = (centred * (f_ab - f_a)).mean(axis=1) / variance
+        st = 0.5 * ((f_a - f_ab) ** 2).mean(axis=1) / variance
+    return s1, st
@@ -0,0 +1,79 @@
+# Project-wide logging and structured tracing for the simulation.
+#
+# All modules log through children of the "bd_digital_sim" logger. Nothing is emitted
+# until configure_logging() is called (a NullHandler is installed), and per-step messages
+# are logged at DEBUG with lazy %-style arguments, so a quiet run costs one level check
+# per message. Trace events are JSON lines on the "bd_digital_sim.trace" logger and are
+# only built when tracing has been switched on.
+import json
+import logging
+import sys
+import time
+
+LOGGER_NAME = "bd_digital_sim"
+TRACE_LOGGER_NAME = f"{LOGGER_NAME}.trace"
+
+_root_logger = logging.getLogger(LOGGER_NAME)
+_root_logger.addHandler(logging.NullHandler())
+_trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+_trace_logger.propagate = False # Trace events go to their own sink, never to the console
+_trace_enabled = False
+
+def get_logger(name):
+    """Return the project logger for a module.
+
+    Args:
+        name (str): Usually the module's __name__.
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+def configure_logging(level="INFO", quiet=False, stream=None, trace=False, trace_stream=None, trace_file=None):
+    """Configure console logging and optional structured tracing.
+
+    Args:
+        level (str or int): Console log level, e.g. "DEBUG" to see every model step.
+        quiet (bool): Only report warnings and errors, regardless of `level`.
+        stream (file-like, optional): Console stream. Defaults to sys.stdout.
+        trace (bool): Emit structured trace events (model, year, duration) as JSON lines.
+        trace_stream (file-like, optional): Stream receiving trace events. Defaults to sys.stderr.
+        trace_file (str, optional): Path of a file receiving trace events (overrides trace_stream).
+    """
+    global _trace_enabled
+
+    for handler in list(_root_logger.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            _root_logger.removeHandler(handler)
+    console = logging.StreamHandler(stream or sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    _root_logger.addHandler(console)
+    _root_logger.setLevel(logging.WARNING if quiet else level)
+
+    for handler in list(_trace_logger.handlers):
+        _trace_logger.removeHandler(handler)
+        handler.close()
+    _trace_enabled = bool(trace)
+    if _trace_enabled:
+        if trace_file:
+            sink = logging.FileHandler(trace_file, encoding='utf-8')
+        else:
+            sink = logging.StreamHandler(trace_stream or sys.stderr)
+        sink.setFormatter(logging.Formatter("%(message)s"))
+        _trace_logger.addHandler(sink)
+    _trace_logger.setLevel(logging.INFO if _trace_enabled else logging.CRITICAL + 1)
+
+def trace_enabled():
+    """Return True when structured trace events are being recorded."""
+    return _trace_enabled
+
+def trace_event(event, **fields):
+    """Emit one structured trace event as a JSON line.
+
+    Args:
+        event (str): Event type, e.g. "model_step".
+        **fields: JSON-serialisable payload, e.g. model="infra", year=2025, duration_s=0.001.
+    """
+    if not _trace_enabled:
+        return
+    record = {"event": event, "ts": time.time()}
+    record.update(fields)
+    _trace_logger.info(json.dumps(record, default=str))
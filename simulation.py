@@ -1,20 +1,83 @@
+import argparse
+import time
+from contextlib import ExitStack, contextmanager
+
 # Import model classes
 from digital_infrastructure import DigitalInfrastructureModel
 from digital_government import DigitalGovernmentModel
 from digital_economy import DigitalEconomyModel
 from digital_skills import DigitalSkillsModel
-from cybersecurity import CybersecurityModel
-from digital_inclusion import DigitalInclusionModel
-from emerging_technology import EmergingTechnologyModel
-from innovation_ecosystem import InnovationEcosystemModel
-from sectoral_transformation import SectoralTransformationModel
-from digital_policy import DigitalPolicyModel
-from digital_society import DigitalSocietyModel
-from international_integration import InternationalIntegrationModel
+from cybersecurity import CybersecurityModel, DEFAULT_PARAMS as CYBER_PARAMS
+from digital_inclusion import DigitalInclusionModel, DEFAULT_PARAMS as INCLUSION_PARAMS
+from emerging_technology import EmergingTechnologyModel, DEFAULT_PARAMS as EMERGING_PARAMS
+from innovation_ecosystem import InnovationEcosystemModel, DEFAULT_PARAMS as INNOVATION_PARAMS
+from sectoral_transformation import SectoralTransformationModel, DEFAULT_PARAMS as SECTORAL_PARAMS
+from digital_policy import DigitalPolicyModel, DEFAULT_PARAMS as POLICY_PARAMS
+from digital_society import DigitalSocietyModel, DEFAULT_PARAMS as SOCIETY_PARAMS
+from international_integration import InternationalIntegrationModel, DEFAULT_PARAMS as INTEGRATION_PARAMS
 
 # Import support classes
 from data_handler import DigitalDataHandler # Assuming this handles data loading
 from analysis_engine import DigitalAnalysisEngine # Assuming this handles results analysis
+from instrumentation import ModelStepInstrumentation
+from model_scheduler import ModelScheduler
+from coupled_solver import CoupledYearSolver
+from results_store import ColumnarResults
+from step_cache import StepCache
+from time_stepping import AdaptiveTimeStepper
+from stochastic import StochasticShocks
+from model_state import capture_state, restore_state
+from checkpoint import decode_checkpoint, encode_checkpoint, read_checkpoint, write_checkpoint
+from sim_logging import configure_logging, get_logger, trace_enabled, trace_event
+
+logger = get_logger(__name__)
+
+# --- Model execution schedule ---
+# Each entry is (result prefix, model attribute, upstream inputs). Upstream inputs are the
+# result prefixes whose state is passed to the model's simulate_step after `year`, in
+# argument order. None marks a dependency on a model that runs later in the year and is
+# therefore passed as an empty dict (circular dependencies would require iteration).
+# Example Order: Policy -> Infra -> Skills -> Society/Inclusion -> Innovation ->
+#                Emerging Tech -> Economy -> Sectoral -> Gov -> Cybersecurity -> Integration
+MODEL_SCHEDULE = [
+    ("policy", "digital_policy", ()),
+    ("infra", "digital_infrastructure", ()),
+    # Skills depend on economy(demand), inclusion(access), society(adoption)
+    ("skills", "digital_skills", (None, None, None)),
+    ("inclusion", "digital_inclusion", ("infra", "skills", "policy")),
+    ("cyber", "cybersecurity", ("infra", "policy", None)), # society comes later
+    ("society", "digital_society", ("infra", "inclusion", "cyber")),
+    ("innovation", "innovation_ecosystem", (None, "skills", "policy")), # economy comes later
+    ("emerging", "emerging_technology", ("infra", "skills", "innovation")),
+    ("economy", "digital_economy", ("infra", "skills", "policy")),
+    ("sectoral", "sectoral_transformation", ("infra", "skills", "economy", "emerging")),
+    ("gov", "digital_government", ("infra", "policy")),
+    ("integration", "international_integration", ("infra", "economy", "policy")),
+]
+MODEL_ATTRIBUTES = {prefix: model_attr for prefix, model_attr, _ in MODEL_SCHEDULE}
+
+# Full upstream inputs of the models whose schedule entry has None placeholders. The
+# coupled solver (config key 'coupled_solver') iterates these feedback loops to a fixed
+# point within each year instead of passing empty dicts.
+MODEL_FEEDBACK_INPUTS = {
+    "skills": ("economy", "inclusion", "society"),
+    "cyber": ("infra", "policy", "society"),
+    "innovation": ("economy", "skills", "policy"),
+}
+
+# Named coefficients of each model's yearly dynamics with their defaults, keyed like
+# config['model_params']. "<key>.<name>" (e.g. "sectoral.health_growth") identifies a
+# parameter in the sensitivity and calibration tools.
+MODEL_PARAMETERS = {
+    "policy": POLICY_PARAMS,
+    "cyber": CYBER_PARAMS,
+    "inclusion": INCLUSION_PARAMS,
+    "society": SOCIETY_PARAMS,
+    "innovation": INNOVATION_PARAMS,
+    "emerging": EMERGING_PARAMS,
+    "sectoral": SECTORAL_PARAMS,
+    "integration": INTEGRATION_PARAMS,
+}
 
 class BangladeshDigitalTransformationSimulation:
     """Main simulation environment integrating all components for Bangladesh Digital Transformation."""
@@ -23,28 +86,65 @@ class BangladeshDigitalTransformationSimulation:
 
         Args:
             config (dict): Configuration dictionary. Should potentially include paths for
-                           data handler, model parameters, etc.
+                           data handler, model parameters, etc. 'start_year' and 'end_year'
+                           set the horizon (default 2025-2035). 'initial_conditions' supplies
+                           precomputed DigitalDataHandler.get_initial_conditions output;
+                           otherwise they are extracted from 'data_sources' when configured.
+                           'initial_state' maps "model_attribute.state_dict.key" paths (e.g.
+                           "digital_society.adoption_patterns.internet_penetration_rate") to
+                           starting values that replace the models' built-in ones.
+                           'policy_levers' overrides individual lever values of the scenario.
+                           'stochastic' enables yearly random shocks to model coefficients
+                           (see StochasticShocks.from_config). 'time_grid' steps each year
+                           in adaptive sub-annual steps (see AdaptiveTimeStepper.from_config).
             scenario_name (str): The name of the policy scenario to run.
         """
-        print("Initializing Bangladesh Digital Transformation Simulation...")
+        logger.debug("Initializing Bangladesh Digital Transformation Simulation...")
         self.config = config
-        self.start_year = 2025
-        self.end_year = 2035
+        self.start_year = self.config.get('start_year', 2025)
+        self.end_year = self.config.get('end_year', 2035)
+        if self.end_year < self.start_year:
+            raise ValueError(f"end_year ({self.end_year}) precedes start_year ({self.start_year})")
         self.current_year = self.start_year
-        self.results_history = [] # To store results from each year
+        self.next_year = self.start_year # First year not yet simulated
+        # Columnar buffer holding one row of metrics per simulated year
+        self.results_store = ColumnarResults(expected_years=self.end_year - self.start_year + 1)
+        # Optional per-model timing/allocation instrumentation (None disables it)
+        self.instrumentation = ModelStepInstrumentation.from_config(self.config.get('instrumentation'))
+        # Optional DAG scheduler running independent models of a year concurrently (None runs serially)
+        self.scheduler = ModelScheduler.from_config(MODEL_SCHEDULE, self.config.get('scheduler'))
+        # Optional fixed-point solver for circular intra-year dependencies (None keeps the one-pass schedule)
+        self.coupled_solver = CoupledYearSolver.from_config(MODEL_SCHEDULE, MODEL_FEEDBACK_INPUTS,
+                                                            self.config.get('coupled_solver'))
+        # Optional memoization of deterministic model steps (None disables it)
+        self.step_cache = StepCache.from_config(self.config.get('step_cache'))
+        # Optional yearly random shocks to the models' named coefficients (None keeps the run deterministic)
+        self.stochastic = StochasticShocks.from_config(self.config.get('stochastic'))
+        # Optional adaptive sub-annual stepping within each year (None takes whole-year steps)
+        self.time_stepper = AdaptiveTimeStepper.from_config(MODEL_SCHEDULE, self.config.get('time_grid'))
+        # Optional per-year model state, captured before each year so the run can be rewound
+        # and re-simulated from any year (None disables it)
+        self.year_checkpoints = {} if self.config.get('year_checkpoints') else None
+        if self.scheduler is not None and self.coupled_solver is not None:
+            raise ValueError("'scheduler' and 'coupled_solver' cannot be combined: coupled models run sequentially")
 
         # --- Data Handling --- 
-        # You would typically load data first using DigitalDataHandler
-        # data_handler = DigitalDataHandler(config.get('data_sources', {}))
-        # historical_data = data_handler.load_historical_data()
-        # initial_conditions = data_handler.get_initial_conditions(self.start_year)
-        # model_configs = {model_name: data_handler.get_config_for_model(model_name) ...}
-        # For now, using placeholder config for each model
-        print("Note: Using placeholder configurations for models.")
+        # Initial conditions come from the config when precomputed (cheap for calibration runs
+        # varying start_year), else from the configured historical data sources
+        initial_conditions = self.config.get('initial_conditions')
+        if initial_conditions is None and self.config.get('data_sources'):
+            data_handler = DigitalDataHandler(self.config['data_sources'])
+            data_handler.load_historical_data()
+            initial_conditions = data_handler.get_initial_conditions(self.start_year)
+        initial_conditions = initial_conditions or {}
 
         # --- Initialize Models ---
-        # Pass relevant parts of the config/initial_conditions to each model
-        model_config = self.config.get('model_params', {}) # Simplified placeholder
+        # Explicit model_params override values derived from historical data
+        model_params = self.config.get('model_params', {})
+        model_config = {
+            key: {**initial_conditions.get(key, {}), **model_params.get(key, {})}
+            for key in set(initial_conditions) | set(model_params)
+        }
 
         self.digital_infrastructure = DigitalInfrastructureModel(model_config.get('infra', {}))
         self.digital_government = DigitalGovernmentModel(model_config.get('gov', {}))
@@ -62,83 +162,291 @@ class BangladeshDigitalTransformationSimulation:
         # Set the policy scenario
         self.scenario_name = scenario_name
         self.digital_policy.set_scenario(self.scenario_name)
+        if self.config.get('policy_levers'):
+            self.digital_policy.set_policy_levers(self.scenario_name, self.config['policy_levers'])
+
+        for path, value in self.config.get('initial_state', {}).items():
+            self.set_state_value(path, value)
+
+        # Unshocked coefficients of the models with stochastic shocks; every year's shocks
+        # are applied to these rather than compounding on the previous year's draws
+        self.base_params = {}
+        if self.stochastic is not None:
+            for key, names in self.stochastic.parameters().items():
+                unknown = [name for name in names if name not in MODEL_PARAMETERS.get(key, {})]
+                if unknown:
+                    raise ValueError(f"Stochastic shocks on unknown model parameter(s) "
+                                     f"{[f'{key}.{name}' for name in unknown]}")
+                self.base_params[key] = dict(getattr(self, MODEL_ATTRIBUTES[key]).params)
+
+        logger.debug("Simulation Initialized.")
+
+    def set_state_value(self, path, value):
+        """Replace one entry of a model's state.
+
+        Args:
+            path (str): "model_attribute.state_dict.key" path of the entry.
+            value: The new value.
+        """
+        model_attr, dict_name, key = path.split(".", 2)
+        state = getattr(getattr(self, model_attr), dict_name)
+        if key not in state:
+            raise KeyError(f"Unknown state entry '{path}'")
+        state[key] = value
+
+    @contextmanager
+    def run_session(self):
+        """Context wrapping a run: the instrumentation session (allocation tracking, profiler)
+        when instrumentation is attached, and the scheduler, whose worker pool is shut down
+        when the run ends."""
+        with ExitStack() as stack:
+            if self.instrumentation is not None:
+                stack.enter_context(self.instrumentation.run_session())
+            if self.scheduler is not None:
+                stack.enter_context(self.scheduler)
+            yield
+
+    def advance_year(self, year):
+        """Simulate the given year, in adaptive sub-annual steps when a time grid is configured.
 
-        print("Simulation Initialized.")
+        Returns:
+            dict: Mapping of result prefix to each model's state at the end of the year.
+        """
+        if self.time_stepper is not None:
+            return self.time_stepper.run_year(self, year)
+        return self.simulate_year(year)
+
+    def simulate_year(self, year, dt=1.0):
+        """Step every model once for the given year following MODEL_SCHEDULE.
+
+        Args:
+            year (int): The year to simulate.
+            dt (float): Step length in years; sub-annual steps (dt < 1) advance part of the year.
+
+        Returns:
+            dict: Mapping of result prefix to the state dict returned by each model.
+        """
+        if self.stochastic is not None:
+            self._apply_shocks(year)
+        if self.coupled_solver is not None:
+            return self.coupled_solver.run_year(self, year, dt)
+        if self.scheduler is not None:
+            return self.scheduler.run_year(self, year, dt)
+        states = {}
+        for prefix, _, inputs in MODEL_SCHEDULE:
+            states[prefix] = self.step_model(prefix, year, [states[name] if name is not None else {} for name in inputs], dt)
+        return states
+
+    def _apply_shocks(self, year):
+        # Shocked values live in the models' params, so step cache keys include the draws
+        start, count = self._replica_range()
+        for key, params in self.base_params.items():
+            model = getattr(self, MODEL_ATTRIBUTES[key])
+            model.params = self.stochastic.shocked_params(key, params, year, start, count)
+
+    def _replica_range(self):
+        """(global index of the first replica, replica count) for stochastic draws; a single run
+        draws the shocks of replica 0 as scalars (count None)."""
+        return 0, None
+
+    def step_model(self, prefix, year, upstream, dt=1.0):
+        """Step one model, reusing cached steps and recording instrumentation and trace events when enabled.
+
+        Args:
+            prefix (str): Result prefix of the model in MODEL_SCHEDULE.
+            year (int): The year to simulate.
+            upstream (list): Upstream state dicts passed to simulate_step after `year`.
+            dt (float): Step length in years.
+
+        Returns:
+            dict: The model's state for this year.
+        """
+        model = getattr(self, MODEL_ATTRIBUTES[prefix])
+        cache = self.step_cache
+        if cache is not None and cache.caches(prefix):
+            key = cache.make_key(prefix, model, year, upstream, dt)
+            state = cache.lookup(key, model)
+            if state is None:
+                state = self._call_step(prefix, model, year, upstream, dt)
+                cache.store(key, model, state)
+            return state
+        return self._call_step(prefix, model, year, upstream, dt)
+
+    def _call_step(self, prefix, model, year, upstream, dt):
+        step = model.simulate_step
+        instrumentation = self.instrumentation
+        if instrumentation is None and not trace_enabled():
+            return step(year, *upstream, dt)
+
+        if instrumentation is not None:
+            state, duration = instrumentation.measure(prefix, year, step, year, *upstream, dt)
+        else:
+            started = time.perf_counter()
+            state = step(year, *upstream, dt)
+            duration = time.perf_counter() - started
+        trace_event("model_step", model=prefix, year=year, scenario=self.scenario_name, duration_s=duration)
+        return state
 
     def run_simulation(self, years=None):
         """Execute simulation from start_year to end_year.
 
+        Years that were already simulated are not re-run, so a simulation resumed from a
+        checkpoint continues with the year after it.
+
         Args:
-            years (int, optional): Number of years to simulate. Defaults to end_year - start_year + 1.
+            years (int, optional): Number of years to simulate, counted from start_year.
+                                   Defaults to end_year - start_year + 1.
         """
         if years is None:
             simulation_years = self.end_year - self.start_year + 1
         else:
             simulation_years = years
         
+        first_year = self.next_year
         final_year = self.start_year + simulation_years - 1
 
-        print(f"\n--- Starting Simulation Run: {self.start_year} - {final_year} (Scenario: {self.scenario_name}) ---")
-
-        for year in range(self.start_year, final_year + 1):
-            self.current_year = year
-            print(f"\n--- Simulating Year: {self.current_year} ---")
-
-            # --- Execute models in a logical order (dependencies matter!) ---
-            # Example Order: Policy -> Infra -> Skills -> Society/Inclusion -> Innovation -> 
-            #                Emerging Tech -> Economy -> Sectoral -> Gov -> Cybersecurity -> Integration
-            # Note: This is a simplified linear flow; real dependencies might require iterations within a year.
-            
-            policy_state = self.digital_policy.simulate_step(year)
-            infra_state = self.digital_infrastructure.simulate_step(year)
-            # Skills depend on economy(demand), inclusion(access), society(adoption)
-            # Need results from later models? --> Requires iteration or passing previous year's state
-            # Using placeholder empty dicts for now where dependencies are complex/circular
-            skills_state = self.digital_skills.simulate_step(year, {}, {}, {})
-            inclusion_state = self.digital_inclusion.simulate_step(year, infra_state, skills_state, policy_state)
-            cybersecurity_state = self.cybersecurity.simulate_step(year, infra_state, policy_state, {})
-            society_state = self.digital_society.simulate_step(year, infra_state, inclusion_state, cybersecurity_state)
-            innovation_state = self.innovation_ecosystem.simulate_step(year, {}, skills_state, policy_state)
-            emerging_tech_state = self.emerging_technology.simulate_step(year, infra_state, skills_state, innovation_state)
-            economy_state = self.digital_economy.simulate_step(year, infra_state, skills_state, policy_state)
-            sectoral_state = self.sectoral_transformation.simulate_step(year, infra_state, skills_state, economy_state, emerging_tech_state)
-            gov_state = self.digital_government.simulate_step(year, infra_state, policy_state)
-            integration_state = self.international_integration.simulate_step(year, infra_state, economy_state, policy_state)
-
-            # --- Collect results for this year --- 
-            yearly_results = {'year': year}
-            yearly_results.update({f"policy_{k}": v for k, v in policy_state.items()})
-            yearly_results.update({f"infra_{k}": v for k, v in infra_state.items()})
-            yearly_results.update({f"skills_{k}": v for k, v in skills_state.items()})
-            yearly_results.update({f"inclusion_{k}": v for k, v in inclusion_state.items()})
-            yearly_results.update({f"cyber_{k}": v for k, v in cybersecurity_state.items()})
-            yearly_results.update({f"society_{k}": v for k, v in society_state.items()})
-            yearly_results.update({f"innovation_{k}": v for k, v in innovation_state.items()})
-            yearly_results.update({f"emerging_{k}": v for k, v in emerging_tech_state.items()})
-            yearly_results.update({f"economy_{k}": v for k, v in economy_state.items()})
-            yearly_results.update({f"sectoral_{k}": v for k, v in sectoral_state.items()})
-            yearly_results.update({f"gov_{k}": v for k, v in gov_state.items()})
-            yearly_results.update({f"integration_{k}": v for k, v in integration_state.items()})
-            
-            self.results_history.append(yearly_results)
-
-        print(f"\n--- Simulation Run Completed: {self.start_year} - {final_year} (Scenario: {self.scenario_name}) ---")
+        logger.info("\n--- Starting Simulation Run: %s - %s (Scenario: %s) ---", first_year, final_year, self.scenario_name)
+        run_started = time.perf_counter()
+
+        store = self.results_store
+        store.reserve(max(0, final_year - first_year + 1))
+        with self.run_session():
+            for year in range(first_year, final_year + 1):
+                self.current_year = year
+                logger.debug("\n--- Simulating Year: %s ---", self.current_year)
+                self._checkpoint_year(year)
+
+                store.write_states(store.add_row(year), self.advance_year(year))
+                self.next_year = year + 1
+
+        logger.info("\n--- Simulation Run Completed: %s - %s (Scenario: %s) ---", first_year, final_year, self.scenario_name)
+        trace_event("simulation_run", scenario=self.scenario_name, start_year=first_year,
+                    end_year=final_year, duration_s=time.perf_counter() - run_started)
         return self.results_history
 
+    def _checkpoint_year(self, year):
+        if self.year_checkpoints is not None:
+            self.year_checkpoints[year] = {
+                model_attr: capture_state(getattr(self, model_attr)) for model_attr in MODEL_ATTRIBUTES.values()
+            }
+
+    def rewind(self, year):
+        """Reset the simulation to the start of `year`, discarding that year's results and later ones.
+
+        A following run_simulation() call re-simulates from `year` only. Requires the
+        'year_checkpoints' config option and a run that has reached `year`.
+
+        Args:
+            year (int): First year to re-simulate.
+        """
+        if self.year_checkpoints is None:
+            raise ValueError("rewind() requires the 'year_checkpoints' config option")
+        if year not in self.year_checkpoints:
+            raise ValueError(f"No checkpoint for year {year}; simulated years start at "
+                             f"{min(self.year_checkpoints, default=self.next_year)}")
+        for model_attr, model_state in self.year_checkpoints[year].items():
+            restore_state(getattr(self, model_attr), model_state)
+        for later in [y for y in self.year_checkpoints if y > year]:
+            del self.year_checkpoints[later]
+        self._discard_results_from(year)
+        self.current_year = year
+        self.next_year = year
+        logger.debug("Rewound %s to the start of %s", self.scenario_name, year)
+
+    def _discard_results_from(self, year):
+        self.results_store.truncate(int((self.results_store.years < year).sum()))
+
+    def snapshot(self):
+        """Serialise the full simulation state into a compact binary checkpoint.
+
+        The checkpoint holds every model's attributes, the years simulated so far and the
+        results store. Use resume_from() to continue the run from it.
+
+        Returns:
+            bytes: The checkpoint.
+        """
+        return encode_checkpoint(self._checkpoint_payload())
+
+    def save_checkpoint(self, path):
+        """Write a checkpoint of the current state to `path`."""
+        write_checkpoint(path, self.snapshot())
+        logger.info("Checkpoint for %s (next year %s) saved to %s", self.scenario_name, self.next_year, path)
+
+    @classmethod
+    def resume_from(cls, checkpoint):
+        """Rebuild a simulation from a checkpoint so that run_simulation() continues from it.
+
+        Args:
+            checkpoint (bytes or str): Checkpoint bytes from snapshot(), or a path written by
+                                       save_checkpoint(). Only load checkpoints you trust.
+
+        Returns:
+            BangladeshDigitalTransformationSimulation: The restored simulation.
+        """
+        payload = decode_checkpoint(read_checkpoint(checkpoint))
+        if payload['kind'] != cls.__name__:
+            raise ValueError(f"Checkpoint was taken from a {payload['kind']}, not a {cls.__name__}")
+        sim = cls(payload['config'], payload['scenario_name'], **payload['init_kwargs'])
+        sim._restore_checkpoint(payload)
+        logger.info("Resumed %s from checkpoint at year %s", sim.scenario_name, sim.next_year)
+        return sim
+
+    def _checkpoint_payload(self):
+        return {
+            'kind': type(self).__name__,
+            'config': self.config,
+            'scenario_name': self.scenario_name,
+            'init_kwargs': {},
+            'start_year': self.start_year,
+            'end_year': self.end_year,
+            'current_year': self.current_year,
+            'next_year': self.next_year,
+            'models': {model_attr: vars(getattr(self, model_attr)) for model_attr in MODEL_ATTRIBUTES.values()},
+            'results_store': self.results_store,
+        }
+
+    def _restore_checkpoint(self, payload):
+        self.start_year = payload['start_year']
+        self.end_year = payload['end_year']
+        self.current_year = payload['current_year']
+        self.next_year = payload['next_year']
+        for model_attr, model_state in payload['models'].items():
+            model = getattr(self, model_attr)
+            model.__dict__.clear()
+            model.__dict__.update(model_state)
+        self.results_store = payload['results_store']
+
+    @property
+    def results_history(self):
+        """Results as a list of per-year dicts, built from the columnar results store."""
+        return self.results_store.to_records()
+
+    def results_dataframe(self):
+        """Results as a DataFrame indexed by year, sharing memory with the results store."""
+        return self.results_store.to_dataframe()
+
     def analyze_results(self):
         """Analyze the results using the Analysis Engine."""
-        if not self.results_history:
-            print("No simulation results to analyze. Run simulation first.")
+        if not len(self.results_store):
+            logger.warning("No simulation results to analyze. Run simulation first.")
             return None
         
-        print("\n--- Analyzing Simulation Results ---")
-        analyzer = DigitalAnalysisEngine(self.results_history, scenario_name=self.scenario_name)
+        logger.info("\n--- Analyzing Simulation Results ---")
+        analyzer = DigitalAnalysisEngine(self.results_dataframe(), scenario_name=self.scenario_name)
         analyzer.run_full_analysis()
-        print("--- Analysis Complete ---")
+        logger.info("--- Analysis Complete ---")
         return analyzer # Return the analyzer object for further interaction
 
 # --- Example Usage --- (Can be run as a script)
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Bangladesh Digital Transformation Simulation.")
+    parser.add_argument("--log-level", default="INFO", help="Console log level (DEBUG shows every model step).")
+    parser.add_argument("--quiet", action="store_true", help="Only report warnings and errors.")
+    parser.add_argument("--trace-file", help="Write structured JSON trace events to this file.")
+    args = parser.parse_args()
+    configure_logging(level=args.log_level.upper(), quiet=args.quiet,
+                      trace=args.trace_file is not None, trace_file=args.trace_file)
+
     # Basic configuration (replace with actual data loading)
     sim_config = {
         'data_sources': {
@@ -150,21 +458,16 @@ if __name__ == "__main__":
     }
 
     # --- Run Baseline Scenario ---
-    print("\n=== RUNNING BASELINE SCENARIO ===")
+    logger.info("\n=== RUNNING BASELINE SCENARIO ===")
     baseline_sim = BangladeshDigitalTransformationSimulation(sim_config, scenario_name="baseline")
     baseline_results = baseline_sim.run_simulation()
     baseline_analyzer = baseline_sim.analyze_results()
 
-    # --- Run Pro-Investment Scenario ---
-    # print("\n=== RUNNING PRO-INVESTMENT SCENARIO ===")
-    # investment_sim = BangladeshDigitalTransformationSimulation(sim_config, scenario_name="pro_investment")
-    # investment_results = investment_sim.run_simulation()
-    # investment_analyzer = investment_sim.analyze_results()
-
-    # --- Add comparison logic between baseline_analyzer.results and investment_analyzer.results ---
-    # Example: 
-    # if baseline_analyzer and investment_analyzer:
-    #     comparison_df = pd.concat([baseline_analyzer.results.add_suffix('_base'), 
-    #                                investment_analyzer.results.add_suffix('_invest')], axis=1)
-    #     print("\n--- Scenario Comparison (Final Year) ---")
-    #     print(comparison_df.iloc[-1]) 
\ No newline at end of file
+    # --- Compare policy scenarios (runs fan out across worker processes) ---
+    from scenario_runner import run_scenario_batch
+
+    logger.info("\n=== RUNNING SCENARIO COMPARISON ===")
+    comparison_df = run_scenario_batch(sim_config, ["baseline", "pro_investment", "pro_regulation"])
+    final_year = comparison_df.index.get_level_values('year').max()
+    logger.info("\n--- Scenario Comparison (Final Year) ---")
+    logger.info("%s", comparison_df.xs(final_year, level='year').T.to_string())
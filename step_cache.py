@@ -0,0 +1,202 @@
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from model_state import capture_state, restore_state
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+class StepCache:
+    """Bounded LRU cache of deterministic model steps.
+
+    Entries are keyed by a stable hash of (model prefix, year, step length, the model's
+    attributes, the upstream input states). A hit restores the model's post-step state dicts
+    (see model_state.capture_state; config, params and levers do not change during a step,
+    so they are part of the key only) and returns the cached output without calling
+    simulate_step. This is only valid for models that are pure functions of those inputs,
+    which holds for every model in the deterministic simulation. In stochastic mode a model's
+    shocked coefficients for the year are part of its attributes, so keys cover the draws and
+    a hit only reuses a step with identical shocks. Attach one instance to several
+    simulations (config key 'step_cache') to share repeated sub-computations across runs.
+
+    Every lookup hashes the model's attributes and inputs, which costs about 40-70 us per
+    step for a scalar run and about 1 ns per byte of state and inputs for an ensemble. The
+    cache therefore only pays off for models whose steps cost more than that: repeated
+    scalar runs break even at roughly 60 us per step, while the bundled models step in about
+    10 us and run several times slower with a cache. Ensemble steps are a few array
+    operations over the same bytes the key has to hash, so caching them does not pay off.
+    """
+    def __init__(self, maxsize=10000, models=None):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of cached steps; least recently used entries are evicted.
+            models (iterable, optional): Result prefixes to cache (e.g. ("policy", "infra")).
+                                         Defaults to every model.
+        """
+        self.maxsize = maxsize
+        self.models = frozenset(models) if models is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock() # The thread scheduler may step models concurrently
+
+    @classmethod
+    def from_config(cls, cache_config):
+        """Build a cache from the simulation config's 'step_cache' entry.
+
+        Args:
+            cache_config (bool, dict or StepCache): True for the process-wide shared cache, a
+                dict of constructor arguments, or an existing StepCache. Falsy disables caching.
+
+        Returns:
+            StepCache or None.
+        """
+        if isinstance(cache_config, StepCache):
+            return cache_config
+        if not cache_config:
+            return None
+        if cache_config is True:
+            return shared_step_cache()
+        return cls(**cache_config)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def caches(self, prefix):
+        """Return True if steps of the model with this result prefix are cached."""
+        return self.models is None or prefix in self.models
+
+    def make_key(self, prefix, model, year, upstream, dt=1.0):
+        """Return the cache key for a `dt`-year step of `model` in `year` with the given upstream states."""
+        h = hashlib.sha256()
+        _feed(h, (prefix, type(model).__name__, year, dt))
+        _feed(h, vars(model))
+        _feed(h, upstream)
+        return h.digest()
+
+    def lookup(self, key, model):
+        """Apply a cached step to `model` and return its output state, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        model_state, output = entry
+        restore_state(model, model_state)
+        return _copy_output(output)
+
+    def store(self, key, model, output):
+        """Record the model's post-step state dicts and output state under `key`."""
+        entry = (capture_state(model), _copy_output(output))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        """Return hit/miss statistics as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __getstate__(self):
+        # Cached entries are process-local: checkpoints and worker processes get an empty cache
+        state = self.__dict__.copy()
+        state['_entries'] = OrderedDict()
+        state['hits'] = state['misses'] = state['evictions'] = 0
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+_shared_cache = None
+
+def shared_step_cache():
+    """Return the process-wide StepCache used when the config sets 'step_cache': True."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = StepCache()
+    return _shared_cache
+
+def _copy_output(output):
+    # Output values may alias arrays of the model's state, which later steps update in place
+    return {key: value.copy() if isinstance(value, np.ndarray) else value for key, value in output.items()}
+
+_pack_double = struct.Struct("<d").pack
+_pack_length = struct.Struct("<Q").pack
+
+def _feed(h, value):
+    """Feed a stable, type-tagged encoding of `value` into hash object `h`."""
+    # Exact-type checks first: floats, dicts and strings make up nearly all of a model's state
+    kind = type(value)
+    if kind is float or kind is np.float64:
+        h.update(b"f" + _pack_double(value))
+    elif kind is dict:
+        h.update(b"d" + _pack_length(len(value)))
+        try:
+            keys = sorted(value)
+        except TypeError: # Mixed key types
+            keys = sorted(value, key=repr)
+        for key in keys:
+            _feed(h, key)
+            _feed(h, value[key])
+    elif kind is str:
+        encoded = value.encode()
+        h.update(b"s" + _pack_length(len(encoded)) + encoded)
+    elif value is None:
+        h.update(b"N")
+    elif isinstance(value, bool):
+        h.update(b"T" if value else b"F")
+    elif isinstance(value, (int, np.integer)):
+        h.update(b"i" + str(int(value)).encode())
+    elif isinstance(value, (float, np.floating)):
+        h.update(b"f" + _pack_double(float(value)))
+    elif isinstance(value, np.ndarray):
+        h.update(b"a" + str(value.dtype).encode() + str(value.shape).encode())
+        h.update(np.ascontiguousarray(value).data) # Hashed through the buffer, without a bytes copy
+    elif isinstance(value, dict):
+        _feed(h, dict(value))
+    elif isinstance(value, (list, tuple)):
+        h.update(b"l" + _pack_length(len(value)))
+        for item in value:
+            _feed(h, item)
+    elif isinstance(value, (set, frozenset)):
+        # Sets have no stable iteration order: feed the items' own digests in sorted order
+        digests = []
+        for item in value:
+            item_hash = hashlib.sha256()
+            _feed(item_hash, item)
+            digests.append(item_hash.digest())
+        h.update(b"S" + _pack_length(len(digests)) + b"".join(sorted(digests)))
+    elif hasattr(value, "__dict__"):
+        # Unknown objects are hashed by their attributes so equal states share entries
+        h.update(b"o" + kind.__qualname__.encode())
+        _feed(h, vars(value))
+    else:
+        raise TypeError(f"Cannot build a step cache key from a {kind.__qualname__!r} value; "
+                        f"model attributes and inputs must be scalars, strings, arrays, containers "
+                        f"or objects with a __dict__ (or exclude the model with StepCache(models=...))")
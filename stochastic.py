@@ -0,0 +1,181 @@
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Shocks of the default stochastic mode: "<key>.<name>" model parameter path (see
+# simulation.MODEL_PARAMETERS) -> distribution of the yearly shock applied to it.
+DEFAULT_SHOCKS = {
+    'emerging.iot_growth': {'distribution': 'lognormal', 'scale': 0.05},
+    'emerging.ai_adoption_growth': {'distribution': 'lognormal', 'scale': 0.03},
+    'cyber.phishing_growth': {'distribution': 'lognormal', 'scale': 0.02},
+    'innovation.startup_growth': {'distribution': 'lognormal', 'scale': 0.02},
+}
+
+# How a standard draw z becomes the shocked value of a parameter with base value v
+SHOCK_DISTRIBUTIONS = {
+    'normal': lambda v, z, scale: v + scale * z,                             # Additive Gaussian
+    'lognormal': lambda v, z, scale: v * np.exp(scale * z - 0.5 * scale ** 2), # Multiplicative, mean-preserving
+    'uniform': lambda v, z, scale: v + scale * (2 * z - 1),                  # Additive, uniform on +/- scale
+}
+
+# Replicas sharing one random stream. Streams are keyed by replica block, not by batch or
+# worker, so every replica sees the same draws however a run is split up.
+DEFAULT_BLOCK_SIZE = 4096
+
+class StochasticShocks:
+    """Yearly random shocks to the models' named coefficients, reproducible under any batching.
+
+    Every (parameter, year, block of replicas) has its own generator, built from a
+    SeedSequence with the run seed as entropy and (parameter id, year, block) as spawn key.
+    The draws of a replica therefore depend only on the seed and its global replica index,
+    never on which batch or worker process simulates it, the number of replicas per batch
+    or the order in which batches run. Streams need no state, so checkpoints, rewinds and
+    coupled-solver sweeps replay the same shocks. Draws are vectorised per block.
+    """
+    def __init__(self, seed=0, shocks=None, block_size=DEFAULT_BLOCK_SIZE):
+        """Initialize the shocks.
+
+        Args:
+            seed (int): Root seed of every stream.
+            shocks (dict, optional): "<key>.<name>" parameter path -> {'distribution': one of
+                                     SHOCK_DISTRIBUTIONS, 'scale': float}. Defaults to DEFAULT_SHOCKS.
+            block_size (int): Replicas per random stream.
+        """
+        shocks = DEFAULT_SHOCKS if shocks is None else shocks
+        for path, spec in shocks.items():
+            if spec.get('distribution') not in SHOCK_DISTRIBUTIONS:
+                raise ValueError(f"Unknown shock distribution {spec.get('distribution')!r} for '{path}'; "
+                                 f"expected one of {list(SHOCK_DISTRIBUTIONS)}")
+        self.seed = seed
+        self.shocks = shocks
+        self.block_size = block_size
+        # Stable per-parameter stream ids: adding or removing a shock leaves the others' draws unchanged
+        self._stream_ids = {path: zlib.crc32(path.encode()) for path in shocks}
+
+    @classmethod
+    def from_config(cls, stochastic_config):
+        """Build shocks from the simulation config's 'stochastic' entry.
+
+        Args:
+            stochastic_config (bool, int, dict or StochasticShocks): True for the default shocks
+                with seed 0, an int seed, a dict of constructor arguments, or an existing
+                instance. Falsy (the default) keeps the simulation deterministic.
+
+        Returns:
+            StochasticShocks or None.
+        """
+        if isinstance(stochastic_config, StochasticShocks):
+            return stochastic_config
+        if stochastic_config is None or stochastic_config is False:
+            return None
+        if stochastic_config is True:
+            return cls()
+        if isinstance(stochastic_config, (int, np.integer)):
+            return cls(seed=int(stochastic_config))
+        return cls(**stochastic_config)
+
+    def parameters(self):
+        """Shocked parameter paths grouped by model key: {key: [name, ...]}."""
+        grouped = {}
+        for path in self.shocks:
+            key, name = path.split(".", 1)
+            grouped.setdefault(key, []).append(name)
+        return grouped
+
+    def standard_draws(self, path, year, start, count):
+        """Standard draws of one parameter's stream for replicas start .. start + count - 1.
+
+        Normal draws for the 'normal' and 'lognormal' distributions, U(0, 1) for 'uniform'.
+
+        Returns:
+            np.ndarray: Shape (count,).
+        """
+        uniform = self.shocks[path]['distribution'] == 'uniform'
+        out = np.empty(count)
+        position, stop = start, start + count
+        while position < stop:
+            block = position // self.block_size
+            block_start = block * self.block_size
+            end = min(stop, block_start + self.block_size)
+            seed_seq = np.random.SeedSequence(self.seed, spawn_key=(self._stream_ids[path], year, block))
+            rng = np.random.Generator(np.random.PCG64(seed_seq))
+            # Draws fill sequentially, so the first k of a block are the same however many are drawn
+            draws = rng.random(end - block_start) if uniform else rng.standard_normal(end - block_start)
+            out[position - start:end - start] = draws[position - block_start:]
+            position = end
+        return out
+
+    def shocked_params(self, key, params, year, start=0, count=None):
+        """Return a model's params with this year's shocks applied.
+
+        Args:
+            key (str): Model key, as in config['model_params'] (e.g. "emerging").
+            params (dict): The model's unshocked params; values may be per-replica arrays.
+            year (int): The simulated year.
+            start (int): Global index of the first replica.
+            count (int, optional): Number of replicas; None for a single scalar run (replica `start`).
+
+        Returns:
+            dict: A new params dict.
+        """
+        shocked = dict(params)
+        for name in self.parameters().get(key, ()):
+            path = f"{key}.{name}"
+            spec = self.shocks[path]
+            z = self.standard_draws(path, year, start, 1 if count is None else count)
+            value = SHOCK_DISTRIBUTIONS[spec['distribution']](params[name], z, spec['scale'])
+            shocked[name] = float(value[0]) if count is None and np.ndim(params[name]) == 0 else value
+        return shocked
+
+def _run_paths(job):
+    """Simulate one batch of Monte Carlo paths. Executed in worker processes."""
+    from ensemble import EnsembleSimulation
+
+    config, scenario_name, start, count, years = job
+    sim = EnsembleSimulation(config, scenario_name=scenario_name, replicas=count, replica_offset=start)
+    return sim.run_simulation(years)
+
+def run_monte_carlo(config, scenario_name="baseline", paths=100000, seed=0, shocks=None, years=None,
+                    batch_size=20000, max_workers=None):
+    """Simulate stochastic Monte Carlo paths in ensemble batches across a process pool.
+
+    Path i always gets the shocks of global replica i, so the results are identical for any
+    batch_size and max_workers.
+
+    Args:
+        config (dict): Base simulation configuration; its 'stochastic' entry is replaced.
+        scenario_name (str): Policy scenario to run.
+        paths (int): Number of Monte Carlo paths.
+        seed (int): Root seed.
+        shocks (dict, optional): Shock specification (see StochasticShocks). Defaults to DEFAULT_SHOCKS.
+        years (int, optional): Number of years simulated from start_year.
+        batch_size (int): Maximum paths per ensemble.
+        max_workers (int, optional): Worker processes. Defaults to os.cpu_count(); with 1 the
+                                     batches run in the calling process.
+
+    Returns:
+        dict: Metric name -> array of shape (years, paths), plus 'year'.
+    """
+    config = {**config, 'stochastic': {'seed': seed, 'shocks': shocks}}
+    jobs = [
+        (config, scenario_name, start, min(batch_size, paths - start), years)
+        for start in range(0, paths, batch_size)
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    logger.info("Simulating %s Monte Carlo paths in %s batch(es) on %s worker(s)...", paths, len(jobs), workers)
+    if workers <= 1:
+        batches = [_run_paths(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(_run_paths, jobs))
+    results = {'year': batches[0]['year']}
+    for metric in batches[0]:
+        if metric != 'year':
+            results[metric] = np.concatenate([batch[metric] for batch in batches], axis=1)
+    return results
@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+import pandas as pd
+from aiohttp import web
+
+from data_handler import DigitalDataHandler
+from realtime_feed import IncrementalResimulator, RealtimeFeed
+from simulation import BangladeshDigitalTransformationSimulation
+
+class StubServer:
+    """Local aiohttp server standing in for the real-time endpoints."""
+    def __init__(self):
+        self.app = web.Application()
+        self.requests = []
+        self.runner = None
+        self.base_url = None
+        self.closing = None
+
+    def add_records(self, path, records, etag=None):
+        async def handler(request):
+            self.requests.append((path, dict(request.headers)))
+            if etag is not None and request.headers.get('If-None-Match') == etag:
+                return web.Response(status=304)
+            headers = {'ETag': etag} if etag is not None else {}
+            return web.json_response({'records': records}, headers=headers)
+        self.app.router.add_get(path, handler)
+
+    def add_stream(self, path, records):
+        async def handler(request):
+            response = web.StreamResponse()
+            await response.prepare(request)
+            for record in records:
+                await response.write((json.dumps(record) + "\n").encode())
+            await self.closing.wait() # Keep the stream open until the server shuts down
+            return response
+        self.app.router.add_get(path, handler)
+
+    async def __aenter__(self):
+        self.closing = asyncio.Event()
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closing.set()
+        await self.runner.cleanup()
+
+def test_stream_records_are_delivered_in_bounded_batches():
+    records = [{'year': 2020 + i, 'value': i} for i in range(7)]
+    batches = []
+
+    async def scenario():
+        server = StubServer()
+        server.add_stream('/stream', records)
+        async with server:
+            endpoints = {'btrc': {'url': f"{server.base_url}/stream", 'source': 'btrc_stats', 'mode': 'stream',
+                                  'interval': 60.0, 'params': None, 'headers': None}}
+            loop = asyncio.get_running_loop()
+
+            def on_batch(batch):
+                batches.append(batch)
+                if sum(len(b['btrc_stats']) for b in batches) >= len(records):
+                    loop.call_soon_threadsafe(feed.stop) # on_batch runs in a worker thread
+
+            feed = RealtimeFeed(endpoints, on_batch, batch_size=3, batch_window=0.3, retry_delay=60.0)
+            await feed.run(duration=30.0) # Safety net only; the callback stops the feed
+            return feed
+
+    feed = asyncio.run(scenario())
+    assert [len(batch['btrc_stats']) for batch in batches] == [3, 3, 1]
+    assert [record for batch in batches for record in batch['btrc_stats']] == records
+    assert feed.stats['records'] == 7 and feed.stats['batches'] == 3
+
+def test_unexpected_producer_errors_are_logged(caplog):
+    async def scenario():
+        server = StubServer()
+        server.add_records('/bad', 5) # 'records' is not a list, which the poller does not expect
+        async with server:
+            endpoints = {'bad': {'url': f"{server.base_url}/bad", 'source': 'btrc_stats', 'mode': 'poll',
+                                 'interval': 60.0, 'params': None, 'headers': None}}
+            feed = RealtimeFeed(endpoints, lambda batch: None)
+            await feed.run(duration=0.5)
+            return feed
+
+    with caplog.at_level('ERROR'):
+        feed = asyncio.run(scenario())
+    assert feed.stats['errors'] == 1
+    assert any("Real-time endpoint bad stopped" in record.getMessage() for record in caplog.records)
+
+def test_poll_once_merges_endpoints_and_skips_unchanged_payloads():
+    batches = []
+
+    async def scenario():
+        server = StubServer()
+        server.add_records('/a', [{'year': 2024, 'x': 1}], etag='"a1"')
+        server.add_records('/b', [{'year': 2023, 'y': 2}, {'year': 2024, 'y': 3}])
+        async with server:
+            endpoints = {
+                key: {'url': f"{server.base_url}/{key}", 'source': source, 'mode': 'poll', 'interval': 60.0,
+                      'params': None, 'headers': None}
+                for key, source in (('a', 'btrc_stats'), ('b', 'bbs_ict_survey'))
+            }
+            feed = RealtimeFeed(endpoints, batches.append)
+            first = await feed.poll_once()
+            second = await feed.poll_once()
+            return feed, first, second, server.requests
+
+    feed, first, second, requests = asyncio.run(scenario())
+    assert first == {'btrc_stats': [{'year': 2024, 'x': 1}],
+                     'bbs_ict_survey': [{'year': 2023, 'y': 2}, {'year': 2024, 'y': 3}]}
+    assert len(batches) == 2 # One delivery per poll_once, covering both endpoints
+    # The second poll of /a is conditional and answered with 304, so only /b's records come back
+    assert second == {'bbs_ict_survey': [{'year': 2023, 'y': 2}, {'year': 2024, 'y': 3}]}
+    assert [headers.get('If-None-Match') for path, headers in requests if path == '/a'] == [None, '"a1"']
+    assert feed.stats['not_modified'] == 1
+
+def test_realtime_updates_are_pushed_into_the_data_store():
+    updates = []
+
+    async def scenario():
+        server = StubServer()
+        server.add_records('/btrc', [{'year': 2023, 'broadband': 9.5}, {'year': 2024, 'broadband': 11.0}])
+        async with server:
+            handler = DigitalDataHandler({'btrc_stats': {'url': f"{server.base_url}/btrc"}}, cache_dir=None)
+            handler.historical_data['btrc_stats'] = pd.DataFrame({
+                'year': [2022, 2023, 2024], 'broadband': [8.0, 9.5, 10.0], 'mobile': [1.0, 2.0, 3.0]})
+            feed = handler.integrate_realtime_data(on_update=updates.append)
+            await feed.poll_once()
+            return handler
+
+    handler = asyncio.run(scenario())
+    stored = handler.historical_data['btrc_stats']
+    assert stored['year'].tolist() == [2022, 2023, 2024]
+    assert stored['broadband'].tolist() == [8.0, 9.5, 11.0]
+    assert stored['mobile'].tolist() == [1.0, 2.0, 3.0] # Columns absent from the update are kept
+    assert updates == [2024] # 2023 matched the stored value, so only 2024 changed
+
+def test_resimulation_starts_from_the_earliest_affected_year():
+    sim = BangladeshDigitalTransformationSimulation({'year_checkpoints': True})
+    sim.run_simulation()
+    resimulator = IncrementalResimulator(sim)
+    before = sim.results_dataframe().copy()
+    simulated_years = []
+    simulate_year = sim.simulate_year
+    sim.simulate_year = lambda year, dt=1.0: simulated_years.append(year) or simulate_year(year, dt)
+
+    async def scenario():
+        server = StubServer()
+        server.add_records('/btrc', [{'year': 2031, 'broadband': 40.0}, {'year': 2033, 'broadband': 45.0}])
+        async with server:
+            handler = DigitalDataHandler({'btrc_stats': {'url': f"{server.base_url}/btrc"}}, cache_dir=None)
+            handler.historical_data['btrc_stats'] = pd.DataFrame({'year': [2030], 'broadband': [35.0]})
+            feed = handler.integrate_realtime_data(on_update=resimulator.update)
+            await feed.poll_once()
+
+    asyncio.run(scenario())
+    assert simulated_years == list(range(2031, sim.end_year + 1))
+    assert resimulator.resimulated_years == sim.end_year - 2031 + 1
+    pd.testing.assert_frame_equal(resimulator.sim.results_dataframe(), before)
@@ -0,0 +1,171 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from model_state import capture_state, restore_state
+from sim_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Named time grids: the step sizes the adaptive stepper may use, as steps per year from the
+# coarsest to the finest. Every level divides the year into a multiple of the previous one.
+TIME_GRIDS = {
+    'annual': (1,),
+    'quarterly': (1, 2, 4),
+    'monthly': (1, 2, 4, 12),
+    'weekly': (1, 2, 4, 52),
+}
+
+class AdaptiveTimeStepper:
+    """Advance a simulation through each year in sub-annual steps of adaptive length.
+
+    Steps are taken on a time grid of nested levels (e.g. whole year, half year, quarter,
+    month). Each step is checked by step doubling: the interval is simulated once with the
+    current step and again with the next finer level's sub-steps, and the difference between
+    the two end states estimates the local error. If it is within tolerance the finer result
+    is kept and the next step may be coarser; otherwise the step is retried one level finer.
+    Where the state changes slowly the whole year is covered by a couple of coarse steps, so
+    fine grids cost far less than stepping at their resolution throughout. The state at the
+    end of the year is the year's row, like in an annual run.
+
+    In an ensemble all replicas share the step sizes; the error is the worst replica's.
+    """
+    def __init__(self, schedule, grid="monthly", rtol=1e-3, atol=1e-6):
+        """Initialize the stepper.
+
+        Args:
+            schedule (list): (prefix, model attribute, upstream inputs) entries, as in
+                             simulation.MODEL_SCHEDULE; their models' state is rolled back
+                             when a step is retried.
+            grid (str or sequence): A TIME_GRIDS name, or steps per year for each level from
+                                    coarsest to finest, e.g. (1, 4, 12).
+            rtol (float): Relative tolerance of the local error of a step.
+            atol (float): Absolute tolerance of the local error of a step.
+        """
+        levels = TIME_GRIDS[grid] if isinstance(grid, str) else tuple(int(n) for n in grid)
+        if not levels or any(finer % coarser for coarser, finer in zip(levels, levels[1:])) \
+                or any(finer <= coarser for coarser, finer in zip(levels, levels[1:])):
+            raise ValueError(f"Time grid levels {levels} must increase, each dividing the year into a "
+                             f"multiple of the previous level's steps")
+        self.model_attrs = [model_attr for _, model_attr, _ in schedule]
+        self.levels = levels
+        self.rtol = rtol
+        self.atol = atol
+        self.step_log = {} # Year -> step statistics; a re-simulated (rewound) year replaces its entry
+        self._level = 0 # Level of the last accepted step, the starting guess for the next one
+        self._scratch_buffers = None # Work arrays of the error norm, reused between steps
+
+    @classmethod
+    def from_config(cls, schedule, time_grid_config):
+        """Build a stepper from the simulation config's 'time_grid' entry.
+
+        Args:
+            schedule (list): The model schedule.
+            time_grid_config (bool, str or dict): True for the monthly grid, a TIME_GRIDS name,
+                or keyword arguments for the constructor. Falsy keeps whole-year steps.
+
+        Returns:
+            AdaptiveTimeStepper or None.
+        """
+        if not time_grid_config:
+            return None
+        if time_grid_config is True:
+            return cls(schedule)
+        if isinstance(time_grid_config, str):
+            return cls(schedule, grid=time_grid_config)
+        return cls(schedule, **time_grid_config)
+
+    def run_year(self, sim, year):
+        """Simulate `year` of `sim` in adaptive sub-annual steps.
+
+        Args:
+            sim (BangladeshDigitalTransformationSimulation): The simulation owning the models.
+            year (int): The year to simulate.
+
+        Returns:
+            dict: Mapping of result prefix to model state at the end of the year.
+        """
+        finest = self.levels[-1]
+        position, level = 0, self._level # Position in the year, in finest-level steps
+        steps = rejected = 0
+        smallest = finest
+        states = None
+        while position < finest:
+            span = finest // self.levels[level]
+            # A step starts on its own level's grid; refine until it does
+            while position % span:
+                level += 1
+                span = finest // self.levels[level]
+            if level == len(self.levels) - 1:
+                states = sim.simulate_year(year, span / finest)
+                steps += 1
+                position += span
+                smallest = min(smallest, span)
+                continue
+
+            snapshot = self._capture(sim)
+            coarse = sim.simulate_year(year, span / finest)
+            self._restore(sim, snapshot)
+            fine_span = finest // self.levels[level + 1]
+            for _ in range(span // fine_span):
+                fine = sim.simulate_year(year, fine_span / finest)
+            steps += 1 + span // fine_span
+            error = self._error(coarse, fine)
+            if error <= 1.0:
+                states = fine
+                position += span
+                smallest = min(smallest, fine_span)
+                if error <= 0.1 and level > 0: # Well within tolerance: try a coarser step next
+                    level -= 1
+            else:
+                self._restore(sim, snapshot)
+                rejected += 1
+                level += 1
+
+        self._level = level
+        self.step_log[year] = {'steps': steps, 'rejected': rejected, 'min_dt': smallest / finest}
+        logger.debug("Year %s simulated in %s sub-annual steps (%s rejected, smallest dt %.4g)",
+                     year, steps, rejected, smallest / finest)
+        return states
+
+    def _capture(self, sim):
+        return {model_attr: capture_state(getattr(sim, model_attr)) for model_attr in self.model_attrs}
+
+    def _restore(self, sim, snapshot):
+        # Restoring rebinds the state dicts to copies, so the coarse step's outputs stay intact
+        for model_attr, model_state in snapshot.items():
+            restore_state(getattr(sim, model_attr), model_state)
+
+    def _error(self, coarse, fine):
+        """Scaled local error between two end states: at most 1 when within tolerance."""
+        error = 0.0
+        for prefix, state in fine.items():
+            for key, value in state.items():
+                other = coarse[prefix][key]
+                if np.ndim(value) == 0:
+                    scaled = abs(float(other) - float(value)) / (self.atol + self.rtol * abs(float(value)))
+                    if not math.isnan(scaled):
+                        error = max(error, scaled)
+                    continue
+                value = np.asarray(value, dtype=float)
+                difference, scale = self._scratch(value.shape)
+                np.subtract(other, value, out=difference)
+                np.abs(difference, out=difference)
+                np.abs(value, out=scale)
+                scale *= self.rtol
+                scale += self.atol
+                difference /= scale
+                error = max(error, float(np.nanmax(difference, initial=0.0)))
+        return error
+
+    def _scratch(self, shape):
+        if self._scratch_buffers is None or self._scratch_buffers[0].shape != shape:
+            self._scratch_buffers = (np.empty(shape), np.empty(shape))
+        return self._scratch_buffers
+
+    def steps_dataframe(self):
+        """Return per-year step counts, rejected steps and the smallest step, indexed by year."""
+        df = pd.DataFrame.from_dict(self.step_log, orient='index', columns=['steps', 'rejected', 'min_dt'])
+        df.index.name = 'year'
+        return df.sort_index()